@@ -4,8 +4,13 @@ Main service that coordinates data generation and LLM-based study plan generatio
 """
 
 import os
+import sys
 import json
-from typing import Dict, Any, Optional
+import time
+import asyncio
+import argparse
+from datetime import date
+from typing import Dict, Any, List, Optional, AsyncIterator, Iterator
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -14,8 +19,22 @@ load_dotenv()
 
 # Import our modules
 from data.data_generator import StudentDataGenerator
-from planner_llm.llm_client import DeepSeekLLMClient, OpenAICompatibleClient, GroqClient
-from planner_llm.prompt import StudyPlanPrompts
+from data.cohort_shards import MANIFEST_NAME, iter_cohort_records
+from data.student_index import IndexedStudentFile
+from planner_llm.llm_client import create_llm_client
+from planner_llm.router import create_routing_client
+from planner_llm.prompt import PROMPT_FORMATS, StudyPlanPrompts, days_left_reference
+from planner_llm.formatter import (
+    JSON_RESPONSE_FORMAT,
+    StudyPlanStreamParser,
+    attach_structured_plan,
+    json_output_instructions,
+    task_titles
+)
+from plan_cache import PlanCache, plan_cache_for, plan_fingerprint
+from plan_store import StoredPlan, plan_store_for
+
+OUTPUT_FORMATS = ("markdown", "json")
 
 
 class UpGradeAIService:
@@ -26,7 +45,9 @@ class UpGradeAIService:
         api_key: Optional[str] = None,
         api_base_url: Optional[str] = None,
         model: Optional[str] = None,
-        provider: Optional[str] = None
+        provider: Optional[str] = None,
+        prompt_format: Optional[str] = None,
+        output_format: Optional[str] = None
     ):
         """
         Initialize UpGrade AI Service
@@ -35,33 +56,38 @@ class UpGradeAIService:
             api_key: API key for LLM service
             api_base_url: Base URL for API
             model: Model name to use
-            provider: LLM provider ('groq', 'deepseek', 'openai') - defaults to env var LLM_PROVIDER
+            provider: LLM provider ('groq', 'deepseek', 'openai') or a comma-separated
+                      failover list (e.g. 'groq,deepseek') - defaults to env var LLM_PROVIDER
+            prompt_format: Student data encoding, 'markdown' or the token-efficient
+                           'compact' tables - defaults to env var PLANNER_PROMPT_FORMAT
+            output_format: Plan output, 'markdown' or 'json' (a validated days -> slots ->
+                           task IDs plan under result["plan"]) - defaults to env var PLANNER_OUTPUT_FORMAT
         """
         # Determine provider from env or parameter
         provider = provider or os.getenv("LLM_PROVIDER", "groq")
         
         print(f"🤖 Initializing with provider: {provider}")
         
-        if provider.lower() == "groq":
-            self.llm_client = GroqClient(
-                api_key=api_key or os.getenv("GROQ_API_KEY"),
-                model=model or os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile")
-            )
-        elif provider.lower() == "openai":
-            self.llm_client = OpenAICompatibleClient(
-                api_key=api_key or os.getenv("OPENAI_API_KEY"),
-                api_base_url=api_base_url or os.getenv("OPENAI_API_BASE", "https://api.openai.com/v1"),
-                model=model or os.getenv("OPENAI_MODEL", "gpt-4")
-            )
-        else:  # deepseek
-            self.llm_client = DeepSeekLLMClient(
-                api_key=api_key or os.getenv("DEEPSEEK_API_KEY"),
-                api_base_url=api_base_url or os.getenv("DEEPSEEK_API_BASE"),
-                model=model or os.getenv("DEEPSEEK_MODEL", "deepseek-reasoner")
+        if "," in provider:
+            # e.g. LLM_PROVIDER=groq,deepseek -> failover/hedging across both
+            self.llm_client = create_routing_client(provider.split(","))
+        else:
+            self.llm_client = create_llm_client(
+                provider,
+                api_key=api_key,
+                api_base_url=api_base_url,
+                model=model
             )
         
         self.data_generator = StudentDataGenerator()
+        self._indexed_files: Dict[str, IndexedStudentFile] = {}
         self.prompt_builder = StudyPlanPrompts()
+        self.prompt_format = (prompt_format or os.getenv("PLANNER_PROMPT_FORMAT", "markdown")).lower()
+        if self.prompt_format not in PROMPT_FORMATS:
+            raise ValueError(f"Unknown prompt format '{self.prompt_format}' (expected one of {', '.join(PROMPT_FORMATS)})")
+        self.output_format = (output_format or os.getenv("PLANNER_OUTPUT_FORMAT", "markdown")).lower()
+        if self.output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format '{self.output_format}' (expected one of {', '.join(OUTPUT_FORMATS)})")
     
     def generate_fake_student_data(self) -> Dict[str, Any]:
         """
@@ -73,16 +99,34 @@ class UpGradeAIService:
         print("📊 Generating fake student data...")
         return self.data_generator.generate_complete_student_data()
     
-    def load_student_data(self, file_path: str) -> Dict[str, Any]:
+    def load_student_data(self, file_path: str, student_id: Optional[str] = None) -> Dict[str, Any]:
         """
         Load student data from JSON file
         
+        With a student_id, file_path is an indexed JSONL file (see
+        data/student_index.py) and only that student's line is read. The
+        file stays mapped between calls until it or its index changes on disk.
+        
         Args:
-            file_path: Path to JSON file
+            file_path: Path to JSON file, or to an indexed JSONL file
+            student_id: Student to fetch from an indexed file
             
         Returns:
             Student data dictionary
+            
+        Raises:
+            KeyError: If the indexed file has no such student
         """
+        if student_id is not None:
+            students = self._indexed_files.get(file_path)
+            if students is None or not students.is_current():
+                # The file was regenerated or re-indexed: drop the old mapping
+                if students is not None:
+                    students.close()
+                    del self._indexed_files[file_path]
+                students = self._indexed_files[file_path] = IndexedStudentFile(file_path)
+            return students[student_id]
+        
         print(f"📂 Loading student data from {file_path}...")
         
         with open(file_path, 'r', encoding='utf-8') as f:
@@ -108,64 +152,328 @@ class UpGradeAIService:
         self,
         student_data: Dict[str, Any],
         save_output: bool = True,
-        output_dir: str = "output"
+        output_dir: str = "output",
+        force_refresh: bool = False
     ) -> Dict[str, Any]:
         """
         Generate personalized study plan using LLM
         
+        A plan stored for identical student data (same day, model and
+        formats) is reused instead of calling the LLM again.
+        
         Args:
             student_data: Complete student data dictionary
             save_output: Whether to save the output
             output_dir: Directory to save output files
+            force_refresh: Call the LLM even if a stored plan matches
             
         Returns:
-            Study plan response
+            Study plan response ("cached": True when served from the plan cache)
         """
         print("\n" + "="*60)
         print("🎓 UpGrade AI Study Plan Generator")
         print("="*60)
         
-        # Build prompts
-        system_prompt = self.prompt_builder.get_system_prompt()
-        user_prompt = self.prompt_builder.format_student_data_prompt(student_data)
+        plan_cache = plan_cache_for(output_dir)
+        fingerprint = self.plan_fingerprint(student_data)
+        if plan_cache and not force_refresh:
+            result = plan_cache.get(fingerprint)
+            if result is not None:
+                print("♻️  Student data unchanged, reusing the stored study plan")
+                if save_output:
+                    self._save_outputs(result, student_data, output_dir)
+                return result
+        
+        structured = self.output_format == "json"
+        messages = self._plan_messages(student_data, structured)
         
         # Generate study plan using LLM
         result = self.llm_client.generate_study_plan(
             student_data=student_data,
-            system_prompt=system_prompt,
-            user_prompt=user_prompt
+            system_prompt=messages[0]["content"],
+            user_prompt=messages[1]["content"],
+            response_format=JSON_RESPONSE_FORMAT if structured else None
         )
+        if structured:
+            result = attach_structured_plan(result, student_data)
+        self._store_plan(plan_cache, fingerprint, result)
         
         if result.get("success"):
             print("✅ Study plan generated successfully!")
             
             if save_output:
-                # Save output
-                Path(output_dir).mkdir(parents=True, exist_ok=True)
-                
-                student_name = student_data['student_profile']['name'].replace(' ', '_')
-                student_id = student_data['student_profile']['student_id']
-                
-                # Save study plan as markdown
-                plan_file = f"{output_dir}/study_plan_{student_id}.md"
-                with open(plan_file, 'w', encoding='utf-8') as f:
-                    f.write(f"# Study Plan for {student_data['student_profile']['name']}\n\n")
-                    f.write(f"**Generated**: {Path(plan_file).stat().st_mtime}\n\n")
-                    f.write(result['study_plan'])
-                
-                print(f"📄 Study plan saved to: {plan_file}")
-                
-                # Save full response as JSON
-                response_file = f"{output_dir}/response_{student_id}.json"
-                with open(response_file, 'w', encoding='utf-8') as f:
-                    json.dump(result, f, indent=2, ensure_ascii=False)
-                
-                print(f"📋 Full response saved to: {response_file}")
+                self._save_outputs(result, student_data, output_dir)
         else:
             print(f"❌ Failed to generate study plan: {result.get('error', 'Unknown error')}")
         
         return result
     
+    async def agenerate_study_plan(
+        self,
+        student_data: Dict[str, Any],
+        save_output: bool = True,
+        output_dir: str = "output",
+        force_refresh: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Async version of generate_study_plan
+        
+        Shares the client's connection pool, so many students can be
+        generated concurrently on one event loop. Outputs are written the
+        same way, from a worker thread.
+        """
+        plan_cache = plan_cache_for(output_dir)
+        fingerprint = self.plan_fingerprint(student_data)
+        if plan_cache and not force_refresh:
+            result = await asyncio.to_thread(plan_cache.get, fingerprint)
+            if result is not None:
+                if save_output:
+                    await asyncio.to_thread(self._save_outputs, result, student_data, output_dir, False)
+                return result
+        
+        structured = self.output_format == "json"
+        messages = self._plan_messages(student_data, structured)
+        
+        result = await self.llm_client.agenerate_study_plan(
+            student_data=student_data,
+            system_prompt=messages[0]["content"],
+            user_prompt=messages[1]["content"],
+            response_format=JSON_RESPONSE_FORMAT if structured else None
+        )
+        if structured:
+            result = attach_structured_plan(result, student_data)
+        await asyncio.to_thread(self._store_plan, plan_cache, fingerprint, result)
+        
+        if result.get("success") and save_output:
+            await asyncio.to_thread(self._save_outputs, result, student_data, output_dir, False)
+        return result
+    
+    def plan_fingerprint(self, student_data: Dict[str, Any]) -> str:
+        """Plan cache key: student data, the "days left" the prompt shows today and generation settings"""
+        return plan_fingerprint(
+            student_data,
+            days_left_reference(),
+            model=self.llm_client.model,
+            prompt_format=self.prompt_format,
+            output_format=self.output_format
+        )
+    
+    def _store_plan(self, plan_cache: Optional[PlanCache], fingerprint: str, result: Dict[str, Any]) -> None:
+        """Keep a freshly generated plan for identical future requests"""
+        # Mock-mode plans must not be served once a real API key is configured
+        if plan_cache is None or not result.get("success") or not self.llm_client.api_key:
+            return
+        if self.output_format == "json" and result.get("plan") is None:
+            return
+        plan_cache.set(fingerprint, {**result, "cached": True, "fingerprint": fingerprint})
+    
+    def _save_outputs(
+        self,
+        result: Dict[str, Any],
+        student_data: Dict[str, Any],
+        output_dir: str,
+        verbose: bool = True
+    ) -> None:
+        """Add a generated plan to output_dir's plan store"""
+        profile = student_data['student_profile']
+        store = plan_store_for(output_dir)
+        store.put(StoredPlan(profile['student_id'], profile['name'], time.time(), result))
+        
+        if verbose:
+            # Single plans are committed right away; cohort runs batch their commits
+            store.flush()
+            print(f"💾 Study plan for {profile['student_id']} stored in: {store.location}")
+    
+    @staticmethod
+    def iter_student_records(source: str) -> Iterator[Dict[str, Any]]:
+        """
+        Read student records lazily
+        
+        Args:
+            source: Directory of per-student JSON files, a shard directory
+                written by data/data_generator.py --students (manifest.json),
+                or a JSONL / Parquet file
+            
+        Yields:
+            Student data dictionaries
+        """
+        path = Path(source)
+        if path.is_dir() and not (path / MANIFEST_NAME).exists():
+            for file in sorted(path.glob("*.json")):
+                with open(file, 'r', encoding='utf-8') as f:
+                    yield json.load(f)
+            return
+        
+        yield from iter_cohort_records(source)
+    
+    async def agenerate_cohort(
+        self,
+        source: str,
+        output_dir: str = "output",
+        concurrency: Optional[int] = None,
+        force: bool = False,
+        progress_interval: float = 5.0,
+        force_refresh: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Generate study plans for a whole cohort with bounded concurrency
+        
+        Students that already have a plan in output_dir's plan store are
+        skipped, so an interrupted run resumes where it stopped. Failed
+        students are not saved and are retried by the next run.
+        
+        Args:
+            source: Directory of student JSON files or a JSONL file
+            output_dir: Directory holding the plan store
+            concurrency: Plans generated at once (env PLANNER_COHORT_CONCURRENCY, default 8)
+            force: Regenerate students that already have a stored plan
+            progress_interval: Seconds between progress lines
+            force_refresh: Call the LLM even for students with an unchanged stored plan
+            
+        Returns:
+            Run summary: counts, elapsed seconds and throughput
+        """
+        concurrency = concurrency or int(os.getenv("PLANNER_COHORT_CONCURRENCY", "8"))
+        stats = {"queued": 0, "generated": 0, "reused": 0, "failed": 0, "skipped": 0}
+        failed_ids: List[str] = []
+        started = time.monotonic()
+        
+        # Bounded queue: records are read only as fast as workers consume them
+        queue: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+        
+        async def worker() -> None:
+            while True:
+                student_data = await queue.get()
+                if student_data is None:
+                    return
+                student_id = student_data['student_profile']['student_id']
+                try:
+                    result = await self.agenerate_study_plan(
+                        student_data, output_dir=output_dir, force_refresh=force_refresh
+                    )
+                    ok = bool(result.get("success"))
+                    if not ok:
+                        print(f"❌ {student_id}: {result.get('error', 'Unknown error')}")
+                except Exception as e:
+                    print(f"❌ {student_id}: {e}")
+                    ok = False
+                if ok:
+                    stats["reused" if result.get("cached") else "generated"] += 1
+                else:
+                    stats["failed"] += 1
+                    failed_ids.append(student_id)
+        
+        def report() -> None:
+            elapsed = time.monotonic() - started
+            done = stats["generated"] + stats["reused"] + stats["failed"]
+            rate = done / elapsed if elapsed > 0 else 0.0
+            print(
+                f"📈 {done}/{stats['queued']} processed ({stats['generated']} generated, {stats['reused']} unchanged, "
+                f"{stats['failed']} failed, "
+                f"{stats['skipped']} skipped) - {rate:.2f} plans/s, {elapsed:.0f}s elapsed"
+            )
+        
+        async def reporter() -> None:
+            while True:
+                await asyncio.sleep(progress_interval)
+                report()
+        
+        print(f"🏫 Generating cohort plans from {source} (concurrency {concurrency})")
+        store = plan_store_for(output_dir)
+        # One indexed query instead of a file check per student
+        done_ids = set() if force else await asyncio.to_thread(store.student_ids)
+        workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+        progress = asyncio.create_task(reporter())
+        try:
+            for student_data in self.iter_student_records(source):
+                student_id = student_data['student_profile']['student_id']
+                if student_id in done_ids:
+                    stats["skipped"] += 1
+                    continue
+                stats["queued"] += 1
+                await queue.put(student_data)
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+        finally:
+            progress.cancel()
+            for task in workers:
+                task.cancel()
+            await asyncio.to_thread(store.flush)
+        
+        report()
+        elapsed = time.monotonic() - started
+        return {
+            **stats,
+            "failed_ids": failed_ids,
+            "elapsed_seconds": round(elapsed, 2),
+            "plans_per_second": round((stats["generated"] + stats["reused"]) / elapsed, 3) if elapsed > 0 else 0.0
+        }
+    
+    def astream_study_plan(self, student_data: Dict[str, Any]) -> AsyncIterator[str]:
+        """
+        Stream a study plan as the LLM generates it
+        
+        The prompt is built eagerly, so malformed student data raises here
+        rather than after a streaming response has started.
+        
+        Args:
+            student_data: Complete student data dictionary
+            
+        Returns:
+            Async iterator of Markdown fragments (raises LLMClientError
+            while iterating if the provider request fails)
+        """
+        messages = self._plan_messages(student_data, structured=False)
+        
+        print(f"🤖 Streaming study plan for {student_data['student_profile']['name']}...")
+        
+        return self.llm_client.astream_chat_completion(messages, temperature=0.7, max_tokens=4000)
+    
+    def astream_study_plan_days(self, student_data: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream a structured (JSON) study plan one day at a time
+        
+        The prompt is built eagerly, like astream_study_plan.
+        
+        Args:
+            student_data: Complete student data dictionary
+            
+        Returns:
+            Async iterator of {"type": "day", "day": {...}} events, one per day
+            as soon as the model finishes it, then {"type": "plan", "plan": {...},
+            "study_plan": markdown} once the whole plan is validated (raises
+            LLMClientError or PlanFormatError while iterating on failure)
+        """
+        messages = self._plan_messages(student_data, structured=True)
+        titles = task_titles(student_data)
+        
+        print(f"🤖 Streaming structured study plan for {student_data['student_profile']['name']}...")
+        
+        async def events() -> AsyncIterator[Dict[str, Any]]:
+            parser = StudyPlanStreamParser(titles.keys())
+            deltas = self.llm_client.astream_chat_completion(
+                messages, temperature=0.7, max_tokens=4000, response_format=JSON_RESPONSE_FORMAT
+            )
+            async for delta in deltas:
+                for day in parser.feed(delta):
+                    yield {"type": "day", "day": day.to_dict()}
+            
+            plan = parser.close()
+            yield {"type": "plan", "plan": plan.to_dict(), "study_plan": plan.to_markdown(titles)}
+        
+        return events()
+    
+    def _plan_messages(self, student_data: Dict[str, Any], structured: bool) -> List[Dict[str, str]]:
+        """System and user messages for a study plan request"""
+        user_prompt = self.prompt_builder.format_prompt(student_data, self.prompt_format)
+        if structured:
+            user_prompt += json_output_instructions(student_data, date.today().isoformat())
+        return [
+            {"role": "system", "content": self.prompt_builder.get_system_prompt()},
+            {"role": "user", "content": user_prompt}
+        ]
+    
     def run_demo(
         self,
         use_existing_data: bool = False,
@@ -219,11 +527,54 @@ class UpGradeAIService:
         return result
 
 
+async def run_cohort(service: UpGradeAIService, args: argparse.Namespace) -> Dict[str, Any]:
+    try:
+        return await service.agenerate_cohort(
+            args.cohort,
+            output_dir=args.output_dir,
+            concurrency=args.concurrency,
+            force=args.force,
+            force_refresh=args.refresh
+        )
+    finally:
+        await service.llm_client.aclose()
+
+
 def main():
-    """Main entry point"""
+    """
+    Main entry point
+    
+    Without arguments runs the single-student demo. With --cohort, generates
+    plans for every student in a directory of JSON files or a JSONL file:
+    
+        python ai_service.py --cohort data/cohort.jsonl --concurrency 16
+    """
+    parser = argparse.ArgumentParser(description="UpGrade AI study plan generator")
+    parser.add_argument("--cohort", help="Directory of student JSON files, a shard directory, or a JSONL/Parquet file of students")
+    parser.add_argument("--output-dir", default="output", help="Where plans are written (default: output)")
+    parser.add_argument("--concurrency", type=int, help="Plans generated at once (default: env PLANNER_COHORT_CONCURRENCY or 8)")
+    parser.add_argument("--force", action="store_true", help="Regenerate students that already have a stored plan")
+    parser.add_argument("--refresh", action="store_true", help="Call the LLM even when a stored plan matches unchanged student data")
+    parser.add_argument("--export-plans", metavar="DIR", help="Write each student's latest stored plan as study_plan_<id>.md / response_<id>.json into DIR")
+    args = parser.parse_args()
+    
     # Configuration
     API_KEY = os.getenv("DEEPSEEK_API_KEY")
     
+    if args.export_plans:
+        count = plan_store_for(args.output_dir).export(args.export_plans)
+        print(f"📦 Exported {count} study plans to {args.export_plans}")
+        return count
+    
+    if args.cohort:
+        service = UpGradeAIService()
+        summary = asyncio.run(run_cohort(service, args))
+        print(f"\n✨ Cohort finished: {summary['generated']} generated, {summary['reused']} unchanged, {summary['skipped']} skipped, "
+              f"{summary['failed']} failed in {summary['elapsed_seconds']}s ({summary['plans_per_second']} plans/s)")
+        if summary["failed"]:
+            sys.exit(1)
+        return summary
+    
     # Initialize service
     service = UpGradeAIService(
         api_key=API_KEY,
@@ -0,0 +1,79 @@
+"""
+Single-flight Coalescing Check
+Fires concurrent identical requests at the local mock provider and
+verifies they collapse into a single upstream call.
+
+Usage (from the ai/ directory):
+    python benchmarks/coalescing_check.py --callers 50
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ["LLM_CACHE"] = "false"  # Measure coalescing alone, not the response cache
+
+from planner_llm.llm_client import DeepSeekLLMClient
+from mock_provider import MockProviderConfig, MockProviderServer
+
+
+def check(name: str, upstream: int, results: list, elapsed: float) -> bool:
+    ok = upstream == 1 and len({json.dumps(r, sort_keys=True) for r in results}) == 1
+    status = "✅" if ok else "❌"
+    print(f"{status} {name}: {len(results)} callers -> {upstream} upstream call(s) in {elapsed:.2f}s")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify single-flight coalescing")
+    parser.add_argument("--callers", type=int, default=50, help="Concurrent identical requests")
+    parser.add_argument("--latency", type=float, default=0.5, help="Provider latency in seconds")
+    args = parser.parse_args()
+
+    server = MockProviderServer(MockProviderConfig(latency=f"fixed:{args.latency}", tokens_per_second=0)).start()
+    stats = server.stats
+    client = DeepSeekLLMClient(api_key="mock", api_base_url=server.base_url)
+    messages = [{"role": "user", "content": "What should I study now?"}]
+
+    # Threads (sync facade)
+    stats.reset()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.callers) as pool:
+        results = list(pool.map(lambda _: client.chat_completion(messages, max_tokens=500), range(args.callers)))
+    threads_ok = check("threads", stats.snapshot()["requests"], results, time.perf_counter() - start)
+
+    # Tasks (async API)
+    async def burst():
+        return await asyncio.gather(*(client.achat_completion(messages, max_tokens=500) for _ in range(args.callers)))
+
+    stats.reset()
+    start = time.perf_counter()
+    results = asyncio.run(burst())
+    tasks_ok = check("asyncio", stats.snapshot()["requests"], results, time.perf_counter() - start)
+
+    # Different prompts must not be merged
+    async def distinct():
+        return await asyncio.gather(*(
+            client.achat_completion([{"role": "user", "content": f"Question {i}"}], max_tokens=500)
+            for i in range(5)
+        ))
+
+    stats.reset()
+    asyncio.run(distinct())
+    upstream = stats.snapshot()["requests"]
+    distinct_ok = upstream == 5
+    print(f"{'✅' if distinct_ok else '❌'} distinct prompts: 5 callers -> {upstream} upstream calls")
+
+    print(f"\n📊 Single-flight stats: {client.single_flight.stats()}")
+    server.stop()
+    sys.exit(0 if threads_ok and tasks_ok and distinct_ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Cohort Generation Benchmark
+Compares StudentDataGenerator.generate_complete_student_data (one student at
+a time) with the NumPy bulk generator (StudentDataGenerator.generate_cohort)
+
+Bulk throughput is reported twice: columns only, and columns plus building
+every dict record, since records are only materialized on request.
+
+Usage (from the ai/ directory):
+    python benchmarks/cohort_generation.py --students 100000 --baseline-students 10000
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from data.data_generator import StudentDataGenerator
+
+
+def per_student_rate(num_students: int, seed: int) -> float:
+    """Students/s of the per-student path"""
+    random.seed(seed)
+    start = time.perf_counter()
+    for _ in range(num_students):
+        StudentDataGenerator.generate_complete_student_data()
+    return num_students / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark bulk vs per-student cohort generation")
+    parser.add_argument("--students", type=int, default=100_000, help="Bulk cohort size")
+    parser.add_argument("--baseline-students", type=int, default=10_000,
+                        help="Students generated with the per-student path (its rate does not depend on cohort size)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    args = parser.parse_args()
+
+    baseline = per_student_rate(args.baseline_students, args.seed)
+
+    start = time.perf_counter()
+    cohort = StudentDataGenerator.generate_cohort(args.students, seed=args.seed)
+    columns_elapsed = time.perf_counter() - start
+    for _ in cohort:
+        pass
+    records_elapsed = time.perf_counter() - start
+
+    again = StudentDataGenerator.generate_cohort(args.students, seed=args.seed, today=cohort.today)
+    if any(cohort[i] != again[i] for i in range(0, args.students, max(1, args.students // 100))):
+        print("❌ Same seed produced a different cohort")
+        sys.exit(1)
+
+    print(f"{'path':<28} {'students':>10} {'seconds':>9} {'students/s':>12} {'speedup':>8}")
+    print(f"{'per-student':<28} {args.baseline_students:>10,} {args.baseline_students / baseline:>9.2f} {baseline:>12,.0f} {'1.0x':>8}")
+    for label, elapsed in (("bulk (columns)", columns_elapsed), ("bulk (columns + records)", records_elapsed)):
+        rate = args.students / elapsed
+        print(f"{label:<28} {args.students:>10,} {elapsed:>9.2f} {rate:>12,.0f} {rate / baseline:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
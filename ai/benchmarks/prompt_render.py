@@ -0,0 +1,75 @@
+"""
+Study Plan Prompt Rendering Benchmark
+Times StudyPlanPrompts.format_student_data_prompt on synthetic students with
+growing task counts and checks that cost per task stays flat (linear scaling)
+
+Usage (from the ai/ directory):
+    python benchmarks/prompt_render.py --sizes 10 100 500 1000 2000
+"""
+
+import argparse
+import copy
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from data.data_generator import StudentDataGenerator
+from planner_llm.prompt import StudyPlanPrompts
+
+
+def synthetic_student(num_tasks: int, seed: int = 42) -> Dict[str, Any]:
+    """Generated student with exactly `num_tasks` tasks"""
+    random.seed(seed)
+    student = StudentDataGenerator.generate_complete_student_data()
+    student["tasks"] = StudentDataGenerator.generate_tasks(student["courses"], num_tasks=num_tasks)
+    return student
+
+
+def time_render(student: Dict[str, Any], repeats: int) -> float:
+    """Median seconds per render"""
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        StudyPlanPrompts.format_student_data_prompt(student)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark study plan prompt rendering")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 500, 1000, 2000], help="Task counts")
+    parser.add_argument("--repeats", type=int, default=20, help="Renders per size")
+    parser.add_argument("--tolerance", type=float, default=2.0,
+                        help="Max allowed growth of per-task cost from the second-smallest to the largest size")
+    args = parser.parse_args()
+
+    print(f"{'tasks':>7} {'median ms':>10} {'µs/task':>9} {'prompt chars':>13}")
+    per_task = []
+    for size in args.sizes:
+        student = synthetic_student(size)
+        snapshot = copy.deepcopy(student)
+        elapsed = time_render(student, args.repeats)
+        if student != snapshot:
+            print("❌ Renderer modified its input")
+            sys.exit(1)
+
+        chars = len(StudyPlanPrompts.format_student_data_prompt(student))
+        per_task.append(elapsed / size)
+        print(f"{size:>7} {elapsed * 1000:>10.2f} {elapsed / size * 1e6:>9.2f} {chars:>13,}")
+
+    # The smallest size is dominated by fixed per-prompt overhead, so compare from the next one up
+    baseline = per_task[1] if len(per_task) > 2 else per_task[0]
+    growth = per_task[-1] / baseline
+    ok = growth <= args.tolerance
+    print(f"\n{'✅' if ok else '❌'} Per-task cost grew {growth:.2f}x from {args.sizes[1 if len(per_task) > 2 else 0]} "
+          f"to {args.sizes[-1]} tasks (limit {args.tolerance:.1f}x)")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Study Plan Prompt Size Benchmark
+Compares prompt tokens of the markdown and compact encodings over a generated cohort
+
+Uses tiktoken's cl100k_base encoding when it is installed, otherwise the
+~4 characters per token estimate from chat_history.
+
+Usage (from the ai/ directory):
+    python benchmarks/prompt_tokens.py --students 200 --seed 7
+"""
+
+import argparse
+import random
+import statistics
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from chat_history import estimate_tokens
+from data.data_generator import StudentDataGenerator
+from planner_llm.prompt import PROMPT_FORMATS, StudyPlanPrompts
+
+
+def token_counter() -> Tuple[Callable[[str], int], str]:
+    """Exact counter if tiktoken is available, else the local estimate"""
+    try:
+        import tiktoken
+    except ImportError:
+        return estimate_tokens, "estimate (chars/4)"
+    encoding = tiktoken.get_encoding("cl100k_base")
+    return lambda text: len(encoding.encode(text)), "tiktoken cl100k_base"
+
+
+def percentile(values: List[int], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare study plan prompt sizes per encoding")
+    parser.add_argument("--students", type=int, default=200, help="Cohort size")
+    parser.add_argument("--seed", type=int, default=7, help="Cohort random seed")
+    args = parser.parse_args()
+
+    count, method = token_counter()
+    random.seed(args.seed)
+    now = datetime.now()
+    tokens: Dict[str, List[int]] = {fmt: [] for fmt in PROMPT_FORMATS}
+    for _ in range(args.students):
+        student = StudentDataGenerator.generate_complete_student_data()
+        for fmt in PROMPT_FORMATS:
+            tokens[fmt].append(count(StudyPlanPrompts.format_prompt(student, fmt, now)))
+
+    print(f"📏 Prompt tokens over {args.students} students ({method})\n")
+    print(f"{'format':>10} {'mean':>8} {'p50':>8} {'p95':>8} {'max':>8}")
+    for fmt, values in tokens.items():
+        print(f"{fmt:>10} {statistics.mean(values):>8.0f} {percentile(values, 50):>8.0f} "
+              f"{percentile(values, 95):>8.0f} {max(values):>8}")
+
+    savings = [1 - c / m for m, c in zip(tokens["markdown"], tokens["compact"])]
+    print(f"\n✅ compact saves {statistics.mean(savings) * 100:.1f}% on average "
+          f"(min {min(savings) * 100:.1f}%, max {max(savings) * 100:.1f}%)")
+
+
+if __name__ == "__main__":
+    main()
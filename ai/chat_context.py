@@ -0,0 +1,253 @@
+"""
+Student Context Selection for Chat
+Picks the tasks, courses, grades and risks most relevant to a chat message
+
+A small inverted keyword index over the student's data is combined with
+deadline and priority ranking, so only the top-k items reach the prompt no
+matter how many tasks the student has.
+"""
+
+import os
+import re
+import json
+import math
+import hashlib
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Set
+
+from planner_llm.cache import LRUTTLCache
+
+STOPWORDS = {
+    "a", "an", "and", "are", "about", "at", "be", "can", "do", "does", "for", "from", "have",
+    "help", "how", "i", "in", "is", "it", "me", "my", "now", "of", "on", "or", "should",
+    "so", "that", "the", "this", "to", "what", "when", "which", "with", "you", "your",
+}
+
+# Query words mapped onto the vocabulary used in student data
+SYNONYMS = {
+    "test": "exam", "tests": "exam", "final": "exam", "finals": "exam", "midterm": "exam",
+    "homework": "assignment", "hw": "assignment", "assignments": "assignment",
+    "due": "deadline", "deadlines": "deadline", "mark": "grade", "marks": "grade",
+    "score": "grade", "scores": "grade", "grades": "grade", "class": "course",
+    "classes": "course", "subject": "course", "subjects": "course",
+}
+
+PRIORITY_WEIGHTS = {"urgent": 1.0, "high": 0.8, "medium": 0.5, "low": 0.2}
+
+# Letters and digits split apart so course codes like "AI401" match "AI"
+_TOKEN_RE = re.compile(r"[a-z]+|[0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase keywords with stopwords removed and synonyms folded"""
+    tokens = []
+    for word in _TOKEN_RE.findall(text.lower()):
+        if word in STOPWORDS:
+            continue
+        word = SYNONYMS.get(word, word)
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        tokens.append(word)
+    return tokens
+
+
+def _acronym(name: str) -> str:
+    """"Machine Learning" -> "ml", so students can use the short name"""
+    words = _TOKEN_RE.findall(name.lower())
+    return "".join(w[0] for w in words if w not in STOPWORDS) if len(words) > 1 else ""
+
+
+def parse_date(value: Any) -> Optional[date]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).date()
+    except ValueError:
+        return None
+
+
+class ContextItem:
+    """One selectable fact about the student (a task, course, grade or risk)"""
+
+    def __init__(
+        self,
+        kind: str,
+        text: str,
+        keywords: List[str],
+        deadline: Optional[date] = None,
+        priority: float = 0.0
+    ):
+        self.kind = kind
+        self.text = text
+        self.keywords = set(keywords)
+        self.deadline = deadline
+        self.priority = priority
+
+    def urgency(self, today: date) -> float:
+        """0..1, highest for overdue and imminent deadlines"""
+        if self.deadline is None:
+            return 0.0
+        days = (self.deadline - today).days
+        return 1.0 if days <= 0 else 1.0 / (1.0 + days / 3.0)
+
+
+class StudentContextIndex:
+    """
+    Inverted keyword index over one student's context
+
+    Accepts both the planner's student data shape (task_title, course_name,
+    grades, computed_analytics) and the lighter payload the mobile app sends
+    (tasks with title/courseName/priority/deadline).
+    """
+
+    def __init__(self, context: Dict[str, Any]):
+        self.items: List[ContextItem] = []
+        self.postings: Dict[str, Set[int]] = {}
+
+        course_names = {
+            c.get("course_id"): c.get("course_name", "")
+            for c in context.get("courses") or []
+        }
+        for task in context.get("tasks") or []:
+            self._add_task(task)
+        for course in context.get("courses") or []:
+            self._add_course(course)
+        for grade in context.get("grades") or []:
+            self._add_grade(grade, course_names.get(grade.get("course_id"), ""))
+        analytics = context.get("computed_analytics") or {}
+        for risk in analytics.get("risk_per_course") or []:
+            self._add_risk(risk, course_names.get(risk.get("course_id"), ""))
+
+        self.idf = {
+            term: math.log(1 + len(self.items) / len(ids))
+            for term, ids in self.postings.items()
+        }
+
+    def _add(self, item: ContextItem) -> None:
+        index = len(self.items)
+        self.items.append(item)
+        for term in item.keywords:
+            self.postings.setdefault(term, set()).add(index)
+
+    def _add_task(self, task: Dict[str, Any]) -> None:
+        if task.get("is_completed") or (task.get("current_progress_percentage") or 0) >= 100:
+            return
+
+        title = task.get("task_title") or task.get("title", "")
+        course = task.get("course_name") or task.get("courseName", "")
+        task_type = task.get("task_type", "")
+        priority = str(task.get("priority", "")).lower()
+        deadline = parse_date(task.get("deadline"))
+
+        text = f"Task [{priority or 'normal'}]: {title}"
+        if course and course not in title:
+            text += f" ({course})"
+        if deadline:
+            text += f", due {deadline.isoformat()}"
+        if task.get("current_progress_percentage"):
+            text += f", {task['current_progress_percentage']}% done"
+
+        keywords = tokenize(f"{title} {course} {_acronym(course)} {task.get('course_id', '')} {task_type} {priority}")
+        keywords += ["task", "deadline"] if deadline else ["task"]
+        self._add(ContextItem("task", text, keywords, deadline, PRIORITY_WEIGHTS.get(priority, 0.3)))
+
+    def _add_course(self, course: Dict[str, Any]) -> None:
+        name = course.get("course_name", "")
+        text = f"Course: {name} ({course.get('course_id', '')})"
+        if course.get("difficulty_level"):
+            text += f", difficulty {course['difficulty_level']}/5"
+        if course.get("instructor"):
+            text += f", {course['instructor']}"
+        keywords = tokenize(
+            f"{name} {_acronym(name)} {course.get('course_id', '')} {course.get('instructor', '')}"
+        ) + ["course"]
+        self._add(ContextItem("course", text, keywords))
+
+    def _add_grade(self, grade: Dict[str, Any], course_name: str) -> None:
+        name = grade.get("assessment_name", "")
+        text = f"Grade: {name} in {course_name or grade.get('course_id', '')}: {grade.get('score')}/{grade.get('max_score')}"
+        keywords = tokenize(
+            f"{name} {course_name} {_acronym(course_name)} {grade.get('course_id', '')} {grade.get('assessment_type', '')}"
+        ) + ["grade"]
+        self._add(ContextItem("grade", text, keywords))
+
+    def _add_risk(self, risk: Dict[str, Any], course_name: str) -> None:
+        level = risk.get("risk_level", "")
+        text = f"Risk: {course_name or risk.get('course_id', '')} is {level} risk ({risk.get('reason', '')})"
+        keywords = tokenize(
+            f"{course_name} {_acronym(course_name)} {risk.get('course_id', '')} {risk.get('reason', '')}"
+        ) + ["risk"]
+        priority = PRIORITY_WEIGHTS.get("high" if level == "high" else "low", 0.0)
+        self._add(ContextItem("risk", text, keywords, priority=priority))
+
+    def select(self, query: str, k: int = 8, today: Optional[date] = None) -> List[ContextItem]:
+        """
+        Top-k items for a message
+
+        Items matching the message's keywords rank first (by summed IDF, with
+        urgency and priority as tie-breakers). Remaining slots go to the most
+        pressing open tasks, which is what generic questions like "what
+        should I study now?" need.
+        """
+        today = today or date.today()
+        relevance: Dict[int, float] = {}
+        for term in set(tokenize(query)):
+            for index in self.postings.get(term, ()):
+                relevance[index] = relevance.get(index, 0.0) + self.idf[term]
+
+        def pressure(index: int) -> float:
+            item = self.items[index]
+            return item.urgency(today) + 0.5 * item.priority
+
+        matched = sorted(relevance, key=lambda i: (relevance[i], pressure(i)), reverse=True)[:k]
+        if len(matched) < k:
+            chosen = set(matched)
+            open_tasks = [
+                i for i, item in enumerate(self.items)
+                if item.kind == "task" and i not in chosen
+            ]
+            open_tasks.sort(key=pressure, reverse=True)
+            matched += open_tasks[:k - len(matched)]
+
+        return [self.items[i] for i in matched]
+
+
+_indexes = LRUTTLCache(max_entries=256, ttl_seconds=3600)
+
+
+def context_fingerprint(context: Dict[str, Any]) -> str:
+    """Stable hash of a student context; changes whenever any task or grade does"""
+    payload = json.dumps(context, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def get_context_index(context: Dict[str, Any]) -> StudentContextIndex:
+    """Index for a context, reused while the same context keeps arriving"""
+    key = context_fingerprint(context)
+    index = _indexes.get(key)
+    if index is None:
+        index = StudentContextIndex(context)
+        _indexes.set(key, index)
+    return index
+
+
+def select_context_items(
+    context: Dict[str, Any],
+    query: str,
+    k: Optional[int] = None,
+    today: Optional[date] = None
+) -> List[str]:
+    """
+    Prompt lines for the items most relevant to `query`
+
+    Args:
+        context: Student context (planner student data or the app's chat payload)
+        query: The user's chat message
+        k: Number of items (env CHAT_CONTEXT_TOP_K, default 8)
+        today: Reference date for deadline ranking
+
+    Returns:
+        Rendered item lines, most relevant first
+    """
+    k = k or int(os.getenv("CHAT_CONTEXT_TOP_K", "8"))
+    return [item.text for item in get_context_index(context).select(query, k, today)]
@@ -0,0 +1,210 @@
+"""
+Chat History Compaction
+Fits conversation history to a prompt-token budget, folding older turns into a running summary
+"""
+
+import os
+import hashlib
+from typing import Any, Dict, List, Optional, Tuple
+
+from conversation_store import ConversationStore
+
+Message = Dict[str, str]
+
+# Per-message framing tokens (role markers, separators) added by chat templates
+MESSAGE_OVERHEAD_TOKENS = 4
+
+SUMMARY_PROMPT = """Summarize this conversation between a student and their study assistant for your own future reference.
+Keep concrete facts: courses, tasks, deadlines, exam dates, preferences, commitments and how the student is feeling.
+Merge them into the existing summary if there is one. Reply with the summary only, under 120 words."""
+
+SUMMARY_HEADER = "Summary of the earlier conversation:\n"
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough local token count (~4 characters per token, no tokenizer needed)"""
+    return (len(text) + 3) // 4
+
+
+def estimate_message_tokens(message: Message) -> int:
+    return estimate_tokens(str(message.get("content", ""))) + MESSAGE_OVERHEAD_TOKENS
+
+
+def _fingerprint(message: Message) -> str:
+    """Identify a message so a summary can record where it stops"""
+    payload = f"{message.get('role', '')}\n{message.get('content', '')}"
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def _extractive_summary(previous: str, turns: List[Message], max_chars: int) -> str:
+    """Summary without an LLM call: the opening sentence of each folded turn"""
+    lines = [previous] if previous else []
+    for message in turns:
+        content = " ".join(str(message.get("content", "")).split())
+        first_sentence = content.split(". ")[0][:160]
+        speaker = "Student" if message.get("role") == "user" else "Assistant"
+        lines.append(f"{speaker}: {first_sentence}")
+    # Keep the newest facts when the summary outgrows its budget
+    while len(lines) > 1 and sum(len(line) + 1 for line in lines) > max_chars:
+        lines.pop(0)
+    return "\n".join(lines)[-max_chars:]
+
+
+class HistoryCompactor:
+    """
+    Token-budgeted view of a conversation
+
+    The newest messages that fit `budget_tokens` are sent verbatim; anything
+    older is folded into a running summary sent as one system message. For
+    stored conversations the summary is saved with a fingerprint of the last
+    message it covers, so each turn only summarizes the messages that newly
+    fell out of the window instead of the whole transcript.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        store: Optional[ConversationStore] = None,
+        budget_tokens: Optional[int] = None,
+        summary_max_tokens: Optional[int] = None
+    ):
+        """
+        Initialize the compactor
+
+        Args:
+            client: LLM client used to write summaries (mock clients fall back to extractive summaries)
+            store: Conversation store that caches summaries per conversation
+            budget_tokens: Prompt tokens allowed for history plus summary (env CHAT_HISTORY_TOKEN_BUDGET)
+            summary_max_tokens: Length cap for the running summary (env CHAT_SUMMARY_MAX_TOKENS)
+        """
+        self.client = client
+        self.store = store
+        self.budget_tokens = budget_tokens or int(os.getenv("CHAT_HISTORY_TOKEN_BUDGET", "1500"))
+        self.summary_max_tokens = summary_max_tokens or int(os.getenv("CHAT_SUMMARY_MAX_TOKENS", "200"))
+
+    def _split(
+        self,
+        history: List[Message],
+        conversation_id: Optional[str]
+    ) -> Tuple[str, List[Message], List[Message]]:
+        """
+        Partition history against the budget
+
+        Returns:
+            (previous summary, turns to fold into it, recent turns sent verbatim)
+        """
+        summary = ""
+        start = 0
+        cached = self.store.get_summary(conversation_id) if self.store and conversation_id else None
+        if cached:
+            summary = cached.get("summary", "")
+            covers = cached.get("covers")
+            # Search newest-first; if the covered message was trimmed away,
+            # everything still stored is newer than the summary
+            for index in range(len(history) - 1, -1, -1):
+                if _fingerprint(history[index]) == covers:
+                    start = index + 1
+                    break
+
+        pending = history[start:]
+        available = self.budget_tokens
+        if summary or self._total_tokens(pending) > available:
+            available -= self.summary_max_tokens + estimate_tokens(SUMMARY_HEADER) + MESSAGE_OVERHEAD_TOKENS
+
+        recent_start = len(pending)
+        used = 0
+        for index in range(len(pending) - 1, -1, -1):
+            used += estimate_message_tokens(pending[index])
+            if used > available:
+                break
+            recent_start = index
+
+        return summary, pending[:recent_start], pending[recent_start:]
+
+    @staticmethod
+    def _total_tokens(messages: List[Message]) -> int:
+        return sum(estimate_message_tokens(m) for m in messages)
+
+    def _summary_request(self, previous: str, turns: List[Message]) -> List[Message]:
+        transcript = "\n".join(
+            f"{'Student' if m.get('role') == 'user' else 'Assistant'}: {m.get('content', '')}" for m in turns
+        )
+        content = f"Existing summary:\n{previous}\n\nNew turns:\n{transcript}" if previous else transcript
+        return [
+            {"role": "system", "content": SUMMARY_PROMPT},
+            {"role": "user", "content": content}
+        ]
+
+    def _use_llm(self) -> bool:
+        return bool(getattr(self.client, "api_key", None))
+
+    def _summary_text(self, response: Dict[str, Any], previous: str, turns: List[Message]) -> str:
+        """Summary from an LLM response, or an extractive one if the call failed"""
+        try:
+            text = response["choices"][0]["message"]["content"].strip()
+            if text:
+                return text
+        except (KeyError, IndexError, TypeError, AttributeError):
+            pass
+        return _extractive_summary(previous, turns, self.summary_max_tokens * 4)
+
+    def _finish(
+        self,
+        conversation_id: Optional[str],
+        summary: str,
+        folded: List[Message],
+        recent: List[Message]
+    ) -> List[Message]:
+        if folded and self.store and conversation_id:
+            self.store.set_summary(conversation_id, {"summary": summary, "covers": _fingerprint(folded[-1])})
+
+        if not summary:
+            return recent
+        return [{"role": "system", "content": SUMMARY_HEADER + summary}] + recent
+
+    def compact(self, history: Optional[List[Message]], conversation_id: Optional[str] = None) -> List[Message]:
+        """
+        Fit history to the token budget
+
+        Args:
+            history: Conversation so far, oldest first
+            conversation_id: Stored conversation whose cached summary to reuse and update
+
+        Returns:
+            Messages to place between the system prompt and the new user message
+        """
+        if not history:
+            return []
+
+        summary, folded, recent = self._split(history, conversation_id)
+        if folded:
+            # Untracked (client-supplied) history would be re-summarized every
+            # turn, so only stored conversations pay for an LLM summary
+            if self._use_llm() and conversation_id:
+                response = self.client.chat_completion(
+                    messages=self._summary_request(summary, folded),
+                    temperature=0.2,
+                    max_tokens=self.summary_max_tokens
+                )
+                summary = self._summary_text(response, summary, folded)
+            else:
+                summary = _extractive_summary(summary, folded, self.summary_max_tokens * 4)
+        return self._finish(conversation_id, summary, folded, recent)
+
+    async def acompact(self, history: Optional[List[Message]], conversation_id: Optional[str] = None) -> List[Message]:
+        """Async version of compact"""
+        if not history:
+            return []
+
+        summary, folded, recent = self._split(history, conversation_id)
+        if folded:
+            if self._use_llm() and conversation_id:
+                response = await self.client.achat_completion(
+                    messages=self._summary_request(summary, folded),
+                    temperature=0.2,
+                    max_tokens=self.summary_max_tokens
+                )
+                summary = self._summary_text(response, summary, folded)
+            else:
+                summary = _extractive_summary(summary, folded, self.summary_max_tokens * 4)
+        return self._finish(conversation_id, summary, folded, recent)
@@ -0,0 +1,243 @@
+"""
+Deterministic Chat Intents
+Answers structured questions (the quick-suggestion prompts) straight from student context
+
+"What urgent tasks should I do first?" is a sort over tasks the request
+already carries, so it is answered locally in milliseconds instead of
+costing an LLM round-trip. Anything the rules do not clearly recognize
+falls through to the LLM.
+"""
+
+import re
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional
+
+from chat_context import PRIORITY_WEIGHTS, parse_date
+from planner_llm.metrics import Counter, registry
+
+chat_fast_path = registry.register(Counter(
+    "chat_fast_path_total",
+    "Chat messages answered by deterministic intent rules instead of the LLM",
+    ("intent",)
+))
+
+POLISH_PROMPT = """Rewrite the study assistant's draft answer below in a warm, encouraging tone.
+Keep every task, date and number exactly as given and keep the list order. Do not add new tasks.
+Reply with the rewritten answer only."""
+
+
+class OpenTask:
+    """A not-yet-completed task normalized from either student data shape"""
+
+    def __init__(self, task: Dict[str, Any]):
+        self.title = task.get("task_title") or task.get("title") or "Untitled task"
+        self.course = task.get("course_name") or task.get("courseName") or ""
+        self.priority = str(task.get("priority") or "medium").lower()
+        self.deadline = parse_date(task.get("deadline"))
+        self.progress = task.get("current_progress_percentage") or 0
+        self.minutes = task.get("estimated_duration_minutes")
+
+    @property
+    def remaining_minutes(self) -> Optional[int]:
+        if not self.minutes:
+            return None
+        return round(self.minutes * (100 - self.progress) / 100)
+
+    def days_left(self, today: date) -> Optional[int]:
+        return (self.deadline - today).days if self.deadline else None
+
+    def score(self, today: date) -> float:
+        """Higher means do it sooner: deadline pressure weighted by priority"""
+        days = self.days_left(today)
+        urgency = 0.2 if days is None else (2.0 if days <= 0 else 1.0 / (1.0 + days / 3.0))
+        return urgency * (0.5 + PRIORITY_WEIGHTS.get(self.priority, 0.5)) + (100 - self.progress) / 1000
+
+    def describe(self, today: date) -> str:
+        text = f"**{self.title}**"
+        if self.course and self.course not in self.title:
+            text += f" ({self.course})"
+
+        details = []
+        days = self.days_left(today)
+        if days is not None:
+            if days < 0:
+                details.append(f"overdue by {-days} day{'s' if days != -1 else ''}")
+            elif days == 0:
+                details.append("due today")
+            elif days == 1:
+                details.append("due tomorrow")
+            else:
+                details.append(f"due in {days} days")
+        if self.priority in ("urgent", "high"):
+            details.append(f"{self.priority} priority")
+        if self.progress:
+            details.append(f"{self.progress}% done")
+        if self.remaining_minutes:
+            hours = self.remaining_minutes / 60
+            details.append(f"~{hours:.1f}h left" if hours >= 1 else f"~{self.remaining_minutes} min left")
+
+        return text + (f" - {', '.join(details)}" if details else "")
+
+
+def _open_tasks(context: Dict[str, Any]) -> List[OpenTask]:
+    return [
+        OpenTask(task) for task in context.get("tasks") or []
+        if not task.get("is_completed") and (task.get("current_progress_percentage") or 0) < 100
+    ]
+
+
+def _ranked(context: Dict[str, Any], today: date) -> List[OpenTask]:
+    return sorted(_open_tasks(context), key=lambda t: t.score(today), reverse=True)
+
+
+def _numbered(tasks: List[OpenTask], today: date) -> str:
+    return "\n".join(f"{i}. {task.describe(today)}" for i, task in enumerate(tasks, 1))
+
+
+def answer_urgent_first(context: Dict[str, Any], today: date) -> Optional[str]:
+    ranked = _ranked(context, today)
+    urgent = [
+        t for t in ranked
+        if t.priority in ("urgent", "high") or (t.days_left(today) is not None and t.days_left(today) <= 2)
+    ]
+    if not urgent:
+        if not ranked:
+            return None
+        return (
+            "Good news - nothing is urgent right now. 🎉 The task closest to needing attention is:\n"
+            f"1. {ranked[0].describe(today)}"
+        )
+    return (
+        f"You have {len(urgent)} urgent task{'s' if len(urgent) != 1 else ''}. Do them in this order:\n"
+        f"{_numbered(urgent[:5], today)}\n\n"
+        "Start with the first one and finish it before switching. 💪"
+    )
+
+
+def answer_prioritize(context: Dict[str, Any], today: date) -> Optional[str]:
+    ranked = _ranked(context, today)
+    if not ranked:
+        return None
+    text = f"Here are your {min(len(ranked), 5)} top priorities, ranked by deadline and importance:\n{_numbered(ranked[:5], today)}"
+    if len(ranked) > 5:
+        text += f"\n\n{len(ranked) - 5} more task{'s' if len(ranked) > 6 else ''} can wait until these are done."
+    return text
+
+
+def answer_study_now(context: Dict[str, Any], today: date) -> Optional[str]:
+    ranked = _ranked(context, today)
+    if not ranked:
+        return None
+    first = ranked[0]
+    text = f"Study this now: {first.describe(today)}. 📚"
+    if first.remaining_minutes and first.remaining_minutes > 90:
+        text += "\nBreak it into focused 45-minute sessions with short breaks in between."
+    if len(ranked) > 1:
+        text += f"\nAfter that: {ranked[1].describe(today)}."
+    return text
+
+
+def answer_next_deadline(context: Dict[str, Any], today: date) -> Optional[str]:
+    upcoming = sorted(
+        (t for t in _open_tasks(context) if t.deadline and t.days_left(today) >= 0),
+        key=lambda t: (t.deadline, -PRIORITY_WEIGHTS.get(t.priority, 0.5))
+    )
+    if not upcoming:
+        return None
+    first = upcoming[0]
+    text = f"Your next deadline is {first.describe(today)}."
+    if first.remaining_minutes and first.days_left(today):
+        per_day = first.remaining_minutes / max(first.days_left(today), 1)
+        text += f"\nPlan about {per_day:.0f} minutes a day on it until it's due."
+    same_day = [t for t in upcoming[1:] if t.deadline == first.deadline]
+    if same_day:
+        text += f"\nAlso due the same day:\n{_numbered(same_day[:3], today)}"
+    return text
+
+
+class Intent:
+    """A recognizable question and the rule that answers it"""
+
+    def __init__(self, name: str, patterns: List[str], answer: Callable[[Dict[str, Any], date], Optional[str]]):
+        self.name = name
+        self.patterns = [re.compile(p) for p in patterns]
+        self.answer = answer
+
+    def matches(self, normalized: str) -> bool:
+        return any(p.fullmatch(normalized) for p in self.patterns)
+
+
+# Patterns are anchored (fullmatch) so only short, structured questions
+# qualify; anything with extra detail goes to the LLM
+INTENTS = [
+    Intent("urgent_first", [
+        r"what (urgent|important) tasks? should i (do|start|work on) first",
+        r"(which|what) tasks? (is|are) (most )?urgent",
+        r"what('s| is) urgent",
+    ], answer_urgent_first),
+    Intent("prioritize", [
+        r"help me prioriti[sz]e( my)? tasks",
+        r"prioriti[sz]e my tasks( for me)?",
+        r"what are my (top )?priorities",
+    ], answer_prioritize),
+    Intent("study_now", [
+        r"what should i (study|do|work on) (now|next|first|today)",
+        r"what('s| is) next",
+    ], answer_study_now),
+    Intent("next_deadline", [
+        r"help me prepare for my (next )?deadline",
+        r"when is my next deadline",
+        r"what('s| is) my next deadline",
+    ], answer_next_deadline),
+]
+
+
+def _normalize(message: str) -> str:
+    text = message.lower().replace("\u2019", "'")
+    return " ".join(re.sub(r"[^a-z' ]", " ", text).split())
+
+
+def detect_intent(message: str) -> Optional[Intent]:
+    """The intent a message asks for, if it is one of the structured questions"""
+    normalized = _normalize(message)
+    for intent in INTENTS:
+        if intent.matches(normalized):
+            return intent
+    return None
+
+
+def answer_intent(
+    message: str,
+    context: Optional[Dict[str, Any]],
+    today: Optional[date] = None
+) -> Optional[Dict[str, str]]:
+    """
+    Answer a structured question from student context
+
+    Args:
+        message: The user's chat message
+        context: Student context sent with the message
+        today: Reference date for deadline math
+
+    Returns:
+        {"intent": name, "message": answer}, or None when the LLM should answer
+    """
+    if not context:
+        return None
+    intent = detect_intent(message)
+    if intent is None:
+        return None
+
+    answer = intent.answer(context, today or date.today())
+    if answer is None:
+        return None
+    chat_fast_path.inc(intent=intent.name)
+    return {"intent": intent.name, "message": answer}
+
+
+def polish_messages(user_message: str, draft: str) -> List[Dict[str, str]]:
+    """LLM request that rewords a rule-based answer without changing its facts"""
+    return [
+        {"role": "system", "content": POLISH_PROMPT},
+        {"role": "user", "content": f"Student asked: {user_message}\n\nDraft answer:\n{draft}"}
+    ]
@@ -4,9 +4,16 @@ Uses Llama 3.3 via Groq API for conversational support
 """
 
 import os
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator
 from dotenv import load_dotenv
 from planner_llm.llm_client import GroqClient
+from planner_llm.router import create_routing_client
+from conversation_store import ConversationStore, get_conversation_store
+from chat_history import HistoryCompactor
+from chat_context import select_context_items
+from chat_intents import answer_intent, detect_intent, polish_messages
+from suggestion_cache import SuggestionPrecomputer
+from planner_llm.deadline import deadline_scope
 
 # Load environment variables
 load_dotenv()
@@ -19,7 +26,11 @@ class AIChatService:
         """Initialize the chat service with Llama 3.3"""
         provider = os.getenv("LLM_PROVIDER", "groq").lower()
         
-        if provider == "groq":
+        if "," in provider:
+            # Failover list, e.g. LLM_PROVIDER=groq,openai
+            self.client = create_routing_client(provider.split(","))
+            print("✅ AI Chat Service initialized with provider routing")
+        elif provider == "groq":
             self.client = GroqClient()
             print("✅ AI Chat Service initialized with Llama 3.3 (Groq)")
         else:
@@ -27,6 +38,15 @@ class AIChatService:
             print("✅ AI Chat Service initialized with Llama 3.3 (default)")
         
         self.system_prompt = self._get_system_prompt()
+        self.conversations: ConversationStore = get_conversation_store()
+        self.compactor = HistoryCompactor(self.client, self.conversations)
+        
+        # Rule-based answers can optionally be reworded by the LLM (async paths only)
+        self.polish_intents = os.getenv("CHAT_INTENT_POLISH", "false").lower() in ("1", "true", "yes", "on")
+        self.polish_timeout = float(os.getenv("CHAT_POLISH_TIMEOUT", "3"))
+        
+        # Answers to the quick-suggestion chips, generated ahead of the tap
+        self.suggestion_answers = SuggestionPrecomputer(self._agenerate_suggestion, self.get_quick_suggestions)
     
     def _get_system_prompt(self) -> str:
         """Get the system prompt for the AI assistant"""
@@ -47,39 +67,166 @@ Guidelines:
 
 Remember: You're a study companion, not just a chatbot. Be personal and understanding."""
     
-    def chat(
+    def _build_messages(
         self,
         user_message: str,
         conversation_history: Optional[List[Dict[str, str]]] = None,
         student_context: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, str]]:
+        """Build the message list sent to the LLM"""
+        messages = [{"role": "system", "content": self.system_prompt}]
+        
+        # Add context if provided
+        if student_context:
+            context_msg = self._build_context_message(student_context, user_message)
+            if context_msg:
+                messages.append({"role": "system", "content": context_msg})
+        
+        # Add conversation history (already fitted to the token budget)
+        if conversation_history:
+            messages.extend(conversation_history)
+        
+        # Add current user message
+        messages.append({"role": "user", "content": user_message})
+        
+        return messages
+    
+    def _resolve_history(
+        self,
+        conversation_id: Optional[str],
+        conversation_history: Optional[List[Dict[str, str]]]
+    ) -> Optional[List[Dict[str, str]]]:
+        """Stored history for a conversation ID, else whatever the client sent"""
+        if conversation_id:
+            return self.conversations.get(conversation_id)
+        return conversation_history
+    
+    def _save_turn(self, conversation_id: Optional[str], user_message: str, reply: str) -> None:
+        """Append a completed exchange to the server-side transcript"""
+        if conversation_id:
+            self.conversations.append(
+                conversation_id,
+                {"role": "user", "content": user_message},
+                {"role": "assistant", "content": reply}
+            )
+    
+    def _fast_path(
+        self,
+        user_message: str,
+        student_context: Optional[Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]:
+        """Rule-based answer for structured questions, or None to ask the LLM"""
+        answer = answer_intent(user_message, student_context)
+        if answer is None:
+            return None
+        
+        print(f"⚡ Answered '{answer['intent']}' from student context")
+        return {
+            "success": True,
+            "message": answer["message"],
+            "usage": {},
+            "model": "rules",
+            "intent": answer["intent"]
+        }
+    
+    async def _apolish(self, user_message: str, result: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Let the LLM reword a rule-based answer, within CHAT_POLISH_TIMEOUT
+        
+        The draft is kept if polishing is off, slow or fails.
+        """
+        if not self.polish_intents:
+            return result
+        
+        with deadline_scope(self.polish_timeout):
+            response = await self.client.achat_completion(
+                messages=polish_messages(user_message, result["message"]),
+                temperature=0.3,
+                max_tokens=400
+            )
+        polished = self._format_response(response)
+        if not polished["success"]:
+            return result
+        return dict(result, message=polished["message"], usage=polished["usage"], model=polished["model"])
+    
+    async def _agenerate_suggestion(self, prompt: str, student_context: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Answer a suggestion prompt for the precompute cache
+        
+        Rule-based answers are instant already, so they are only worth
+        precomputing when the LLM polishes them.
+        """
+        if detect_intent(prompt):
+            if not self.polish_intents:
+                return None
+            fast = self._fast_path(prompt, student_context)
+            return await self._apolish(prompt, fast) if fast else None
+        
+        response = await self.client.achat_completion(
+            messages=self._build_messages(prompt, None, student_context),
+            temperature=0.7,
+            max_tokens=500
+        )
+        return self._format_response(response)
+    
+    def _format_response(self, response: Dict[str, Any]) -> Dict[str, Any]:
+        """Extract the assistant message from an LLM response"""
+        if "choices" in response and len(response["choices"]) > 0:
+            ai_message = response["choices"][0]["message"]["content"]
+            
+            return {
+                "success": True,
+                "message": ai_message,
+                "usage": response.get("usage", {}),
+                "model": response.get("model", "llama-3.3-70b-versatile")
+            }
+        
+        return {
+            "success": False,
+            "error": "Failed to get response from AI",
+            "message": "I'm having trouble responding right now. Please try again."
+        }
+    
+    def _error_result(self, error: Exception) -> Dict[str, Any]:
+        """Build the apology result returned when chat fails"""
+        print(f"❌ Error in chat service: {str(error)}")
+        return {
+            "success": False,
+            "error": str(error),
+            "message": "I apologize, but I'm experiencing technical difficulties. Please try again in a moment."
+        }
+    
+    def chat(
+        self,
+        user_message: str,
+        conversation_history: Optional[List[Dict[str, str]]] = None,
+        student_context: Optional[Dict[str, Any]] = None,
+        conversation_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Process a chat message and generate AI response
         
+        Blocks until the provider answers; use achat from async code.
+        
         Args:
             user_message: The user's message
             conversation_history: Previous messages in the conversation
             student_context: Optional context about the student (tasks, schedule, etc.)
+            conversation_id: Server-side conversation to load history from and append to
+                (takes precedence over conversation_history)
             
         Returns:
             Dictionary with AI response and metadata
         """
         try:
-            # Build message history
-            messages = [{"role": "system", "content": self.system_prompt}]
-            
-            # Add context if provided
-            if student_context:
-                context_msg = self._build_context_message(student_context)
-                if context_msg:
-                    messages.append({"role": "system", "content": context_msg})
+            fast = self.suggestion_answers.get(user_message, student_context) or self._fast_path(user_message, student_context)
+            if fast:
+                self._save_turn(conversation_id, user_message, fast["message"])
+                return fast
             
-            # Add conversation history
-            if conversation_history:
-                messages.extend(conversation_history[-10:])  # Keep last 10 messages
-            
-            # Add current user message
-            messages.append({"role": "user", "content": user_message})
+            history = self._resolve_history(conversation_id, conversation_history)
+            history = self.compactor.compact(history, conversation_id)
+            messages = self._build_messages(user_message, history, student_context)
             
             # Get AI response
             print(f"💬 Processing chat message: {user_message[:50]}...")
@@ -89,37 +236,130 @@ Remember: You're a study companion, not just a chatbot. Be personal and understa
                 max_tokens=500  # Shorter responses for chat
             )
             
-            # Extract response content
-            if "choices" in response and len(response["choices"]) > 0:
-                ai_message = response["choices"][0]["message"]["content"]
+            result = self._format_response(response)
+            if result["success"]:
+                self._save_turn(conversation_id, user_message, result["message"])
+            return result
                 
-                return {
-                    "success": True,
-                    "message": ai_message,
-                    "usage": response.get("usage", {}),
-                    "model": response.get("model", "llama-3.3-70b-versatile")
-                }
-            else:
-                return {
-                    "success": False,
-                    "error": "Failed to get response from AI",
-                    "message": "I'm having trouble responding right now. Please try again."
-                }
+        except Exception as e:
+            return self._error_result(e)
+    
+    async def achat(
+        self,
+        user_message: str,
+        conversation_history: Optional[List[Dict[str, str]]] = None,
+        student_context: Optional[Dict[str, Any]] = None,
+        conversation_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Async version of chat
+        
+        Awaits the provider on the shared connection pool, so the event loop
+        keeps serving other requests while the completion is generated.
+        
+        Args:
+            user_message: The user's message
+            conversation_history: Previous messages in the conversation
+            student_context: Optional context about the student (tasks, schedule, etc.)
+            conversation_id: Server-side conversation to load history from and append to
+                (takes precedence over conversation_history)
+            
+        Returns:
+            Dictionary with AI response and metadata
+        """
+        try:
+            precomputed = self.suggestion_answers.get(user_message, student_context)
+            if precomputed:
+                self._save_turn(conversation_id, user_message, precomputed["message"])
+                return precomputed
+            
+            fast = self._fast_path(user_message, student_context)
+            if fast:
+                fast = await self._apolish(user_message, fast)
+                self._save_turn(conversation_id, user_message, fast["message"])
+                return fast
+            
+            history = self._resolve_history(conversation_id, conversation_history)
+            history = await self.compactor.acompact(history, conversation_id)
+            messages = self._build_messages(user_message, history, student_context)
+            
+            print(f"💬 Processing chat message: {user_message[:50]}...")
+            response = await self.client.achat_completion(
+                messages=messages,
+                temperature=0.7,
+                max_tokens=500  # Shorter responses for chat
+            )
+            
+            result = self._format_response(response)
+            if result["success"]:
+                self._save_turn(conversation_id, user_message, result["message"])
+            return result
                 
         except Exception as e:
-            print(f"❌ Error in chat service: {str(e)}")
-            return {
-                "success": False,
-                "error": str(e),
-                "message": "I apologize, but I'm experiencing technical difficulties. Please try again in a moment."
-            }
+            return self._error_result(e)
+    
+    async def astream_chat(
+        self,
+        user_message: str,
+        conversation_history: Optional[List[Dict[str, str]]] = None,
+        student_context: Optional[Dict[str, Any]] = None,
+        conversation_id: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream the AI response token by token
+        
+        Args:
+            user_message: The user's message
+            conversation_history: Previous messages in the conversation
+            student_context: Optional context about the student (tasks, schedule, etc.)
+            conversation_id: Server-side conversation to load history from and append to
+                (takes precedence over conversation_history)
+            
+        Yields:
+            Text fragments of the assistant message
+            
+        Raises:
+            LLMClientError: If the provider request fails
+        """
+        fast = self.suggestion_answers.get(user_message, student_context)
+        if fast is None:
+            fast = self._fast_path(user_message, student_context)
+            if fast:
+                fast = await self._apolish(user_message, fast)
+        if fast:
+            self._save_turn(conversation_id, user_message, fast["message"])
+            yield fast["message"]
+            return
+        
+        history = self._resolve_history(conversation_id, conversation_history)
+        history = await self.compactor.acompact(history, conversation_id)
+        messages = self._build_messages(user_message, history, student_context)
+        
+        print(f"💬 Streaming chat message: {user_message[:50]}...")
+        reply = []
+        async for delta in self.client.astream_chat_completion(
+            messages=messages,
+            temperature=0.7,
+            max_tokens=500
+        ):
+            reply.append(delta)
+            yield delta
+        
+        # Only a fully delivered answer becomes part of the transcript
+        self._save_turn(conversation_id, user_message, "".join(reply))
     
-    def _build_context_message(self, context: Dict[str, Any]) -> str:
-        """Build a context message from student data"""
+    def _build_context_message(self, context: Dict[str, Any], user_message: str = "") -> str:
+        """
+        Build a context message from student data
+        
+        Only the items most relevant to the user's message are included, so
+        the prompt stays bounded however many tasks the student has.
+        """
         parts = []
         
-        if "name" in context:
-            parts.append(f"Student: {context['name']}")
+        name = context.get("name") or (context.get("student_profile") or {}).get("name")
+        if name:
+            parts.append(f"Student: {name}")
         
         if "tasks" in context and context["tasks"]:
             task_count = len(context["tasks"])
@@ -129,6 +369,11 @@ Remember: You're a study companion, not just a chatbot. Be personal and understa
         if "schedule" in context:
             parts.append(f"Today's schedule: {context['schedule']}")
         
+        relevant = select_context_items(context, user_message)
+        if relevant:
+            parts.append("Relevant to this message:")
+            parts.extend(f"- {line}" for line in relevant)
+        
         if parts:
             return "Current context:\n" + "\n".join(parts)
         
@@ -0,0 +1,34 @@
+"""
+Shared pytest fixtures for the AI service tests
+"""
+
+import time
+
+import pytest
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """
+    Controllable clock for TTLs, token buckets, breakers and health windows
+
+    time.time() and time.monotonic() both return clock[0]; tests advance
+    it with `clock[0] += seconds`.
+    """
+    now = [1_000_000.0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def output_dir(tmp_path):
+    """Scratch output directory, so test runs never leave plans.db or plan files in ai/output/"""
+    return str(tmp_path / "output")
+
+
+@pytest.fixture
+def student_data():
+    """A freshly generated fake student"""
+    from data.data_generator import StudentDataGenerator
+    return StudentDataGenerator.generate_complete_student_data()
@@ -0,0 +1,262 @@
+"""
+Conversation Store
+Server-side chat history keyed by conversation ID, so clients send only the new message
+
+In-memory LRU with an optional SQLite tier (CHAT_STORE_PATH) that keeps
+conversations across restarts and after they fall out of memory.
+"""
+
+import os
+import copy
+import json
+import time
+import uuid
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+Message = Dict[str, str]
+
+
+class SQLiteConversationTier:
+    """Persistent conversation tier backed by a single SQLite file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS conversations ("
+            " id TEXT PRIMARY KEY,"
+            " messages TEXT NOT NULL,"
+            " updated_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS conversation_summaries ("
+            " id TEXT PRIMARY KEY,"
+            " summary TEXT NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, conversation_id: str) -> Optional[Tuple[float, List[Message]]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT updated_at, messages FROM conversations WHERE id = ?", (conversation_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def set(self, conversation_id: str, messages: List[Message], updated_at: float) -> None:
+        data = json.dumps(messages, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO conversations (id, messages, updated_at) VALUES (?, ?, ?)",
+                (conversation_id, data, updated_at)
+            )
+            self._conn.commit()
+
+    def get_summary(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT summary FROM conversation_summaries WHERE id = ?", (conversation_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set_summary(self, conversation_id: str, summary: Dict[str, Any]) -> None:
+        data = json.dumps(summary, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO conversation_summaries (id, summary) VALUES (?, ?)",
+                (conversation_id, data)
+            )
+            self._conn.commit()
+
+    def delete(self, conversation_id: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM conversations WHERE id = ?", (conversation_id,))
+            self._conn.execute("DELETE FROM conversation_summaries WHERE id = ?", (conversation_id,))
+            self._conn.commit()
+
+    def purge_expired(self, older_than: float) -> int:
+        """Delete conversations idle since before `older_than` and return how many were removed"""
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM conversations WHERE updated_at < ?", (older_than,))
+            self._conn.execute(
+                "DELETE FROM conversation_summaries WHERE id NOT IN (SELECT id FROM conversations)"
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class ConversationStore:
+    """
+    Chat transcripts keyed by conversation ID
+
+    Only the last `max_messages` messages of a conversation are kept, and
+    conversations idle for longer than `ttl_seconds` are forgotten. When
+    the memory tier is full the least recently used conversation is
+    evicted; with a SQLite tier it is reloaded on its next message.
+
+    A conversation may also carry a running summary of turns that no longer
+    fit the prompt (see chat_history.HistoryCompactor).
+    """
+
+    def __init__(
+        self,
+        max_conversations: int = 1000,
+        max_messages: int = 50,
+        ttl_seconds: float = 86400,
+        db_path: Optional[str] = None
+    ):
+        """
+        Initialize the store
+
+        Args:
+            max_conversations: Memory tier capacity (LRU eviction)
+            max_messages: Messages kept per conversation (oldest dropped first)
+            ttl_seconds: Idle time after which a conversation expires
+            db_path: SQLite file for the persistent tier (None disables it)
+        """
+        self.max_conversations = max_conversations
+        self.max_messages = max_messages
+        self.ttl_seconds = ttl_seconds
+        self.disk = SQLiteConversationTier(db_path) if db_path else None
+
+        self._memory: "OrderedDict[str, Tuple[float, List[Message]]]" = OrderedDict()
+        self._summaries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def new_id() -> str:
+        """Generate an unguessable conversation ID"""
+        return uuid.uuid4().hex
+
+    def _expired(self, updated_at: float) -> bool:
+        return updated_at + self.ttl_seconds < time.time()
+
+    def _remember(self, conversation_id: str, updated_at: float, messages: List[Message]) -> None:
+        """Put a conversation in the memory tier (caller holds the lock)"""
+        self._memory[conversation_id] = (updated_at, messages)
+        self._memory.move_to_end(conversation_id)
+        while len(self._memory) > self.max_conversations:
+            evicted, _ = self._memory.popitem(last=False)
+            self._summaries.pop(evicted, None)
+
+    def _load(self, conversation_id: str) -> Optional[List[Message]]:
+        """Live messages for a conversation, promoting disk hits (caller holds the lock)"""
+        entry = self._memory.get(conversation_id)
+        if entry is None and self.disk is not None:
+            entry = self.disk.get(conversation_id)
+            if entry is not None:
+                self._remember(conversation_id, *entry)
+
+        if entry is None:
+            return None
+
+        updated_at, messages = entry
+        if self._expired(updated_at):
+            self._forget(conversation_id)
+            return None
+
+        self._memory.move_to_end(conversation_id)
+        return messages
+
+    def get(self, conversation_id: str) -> List[Message]:
+        """Stored messages, oldest first (empty for unknown or expired IDs)"""
+        with self._lock:
+            messages = self._load(conversation_id)
+            return copy.deepcopy(messages) if messages else []
+
+    def append(self, conversation_id: str, *messages: Message) -> None:
+        """Add messages to a conversation, creating it if needed"""
+        new = [{"role": m["role"], "content": m["content"]} for m in messages]
+        with self._lock:
+            history = (self._load(conversation_id) or []) + new
+            history = history[-self.max_messages:]
+            updated_at = time.time()
+            self._remember(conversation_id, updated_at, history)
+            if self.disk is not None:
+                self.disk.set(conversation_id, history, updated_at)
+
+    def get_summary(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+        """Running summary of a conversation's older turns, if one was saved"""
+        with self._lock:
+            if self._load(conversation_id) is None:
+                return None
+            summary = self._summaries.get(conversation_id)
+            if summary is None and self.disk is not None:
+                summary = self.disk.get_summary(conversation_id)
+                if summary is not None:
+                    self._summaries[conversation_id] = summary
+            return dict(summary) if summary else None
+
+    def set_summary(self, conversation_id: str, summary: Dict[str, Any]) -> None:
+        """Save a running summary (a JSON-serializable dict)"""
+        with self._lock:
+            self._summaries[conversation_id] = dict(summary)
+            if self.disk is not None:
+                self.disk.set_summary(conversation_id, summary)
+
+    def _forget(self, conversation_id: str) -> None:
+        """Remove a conversation from both tiers (caller holds the lock)"""
+        self._memory.pop(conversation_id, None)
+        self._summaries.pop(conversation_id, None)
+        if self.disk is not None:
+            self.disk.delete(conversation_id)
+
+    def delete(self, conversation_id: str) -> None:
+        with self._lock:
+            self._forget(conversation_id)
+
+    def purge_expired(self) -> int:
+        """Drop idle conversations from both tiers and return how many disk rows were removed"""
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            for conversation_id in [cid for cid, (updated_at, _) in self._memory.items() if updated_at < cutoff]:
+                del self._memory[conversation_id]
+                self._summaries.pop(conversation_id, None)
+            return self.disk.purge_expired(cutoff) if self.disk is not None else 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "memory_conversations": len(self._memory),
+                "persistent": self.disk is not None,
+            }
+
+    def close(self) -> None:
+        if self.disk is not None:
+            self.disk.close()
+
+
+_default_store: Optional[ConversationStore] = None
+_default_store_lock = threading.Lock()
+
+
+def get_conversation_store() -> ConversationStore:
+    """
+    Process-wide conversation store configured from environment variables
+
+    CHAT_STORE_PATH enables the SQLite tier.
+    """
+    global _default_store
+
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = ConversationStore(
+                max_conversations=int(os.getenv("CHAT_STORE_MAX_CONVERSATIONS", "1000")),
+                max_messages=int(os.getenv("CHAT_STORE_MAX_MESSAGES", "50")),
+                ttl_seconds=float(os.getenv("CHAT_STORE_TTL", "86400")),
+                db_path=os.getenv("CHAT_STORE_PATH") or None
+            )
+    return _default_store
@@ -0,0 +1,410 @@
+"""
+Bulk Cohort Generator
+Generates whole cohorts of fake students at once as NumPy columns
+
+StudentDataGenerator builds one nested dict per student from `random`
+calls, which is fine for a demo but far too slow for 100k-1M student load
+and model tests. BulkCohort draws every field for the whole cohort in a
+few vectorized calls and keeps it columnar; the familiar dict record is
+only built when a student is accessed.
+
+Usage (from the ai/ directory):
+    cohort = StudentDataGenerator.generate_cohort(100_000, seed=7)
+    cohort[42]            # one student record
+    for student in cohort:
+        ...
+"""
+
+from datetime import date, timedelta
+from typing import Any, Dict, Iterator, Optional
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError("bulk_generator needs numpy: pip install numpy") from e
+
+from data.data_generator import StudentDataGenerator
+
+G = StudentDataGenerator
+
+MAX_TASK_DEADLINE_DAYS = 14
+MAX_GRADE_AGE_DAYS = 30
+
+# Students whose records are built from one batch of column lists
+RECORD_BLOCK_SIZE = 1024
+
+
+def _offsets(counts: np.ndarray) -> np.ndarray:
+    """Start offsets (plus the final end) of variable-length groups stored back to back"""
+    offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    return offsets
+
+
+def _choice(rng: np.random.Generator, options: list, size) -> np.ndarray:
+    """Vectorized random.choice over a small list of ints"""
+    return np.asarray(options)[rng.integers(0, len(options), size=size)]
+
+
+def _sample_rows(rng: np.random.Generator, rows: int, population: int, counts) -> np.ndarray:
+    """
+    Per-row samples without replacement (vectorized random.sample)
+
+    Returns:
+        Flat array of the first counts[i] indices of a random permutation of
+        range(population) for every row i, rows stored back to back
+    """
+    permutations = np.argsort(rng.random((rows, population)), axis=1)
+    keep = np.arange(population) < np.broadcast_to(counts, rows)[:, None]
+    return permutations[keep]
+
+
+class BulkCohort:
+    """
+    A cohort of generated students stored column by column
+
+    Per-student fields are arrays of length num_students. Courses, tasks and
+    grades are flat arrays with an offsets array per owner (student i owns
+    course rows course_offsets[i]:course_offsets[i + 1], course row c owns
+    grade rows grade_offsets[c]:grade_offsets[c + 1]). Categorical fields
+    hold indices into the StudentDataGenerator catalogs.
+
+    The same seed always produces the same cohort. Student IDs are
+    sequential (S-2026-0000, S-2026-0001, ...) so they are unique.
+    """
+
+    def __init__(
+        self,
+        num_students: int,
+        seed: Optional[int] = None,
+        first_id: int = 0,
+        today: Optional[date] = None,
+        id_width: Optional[int] = None
+    ):
+        """
+        Generate a cohort
+
+        Args:
+            num_students: Cohort size
+            seed: Seed for numpy's default generator (None: fresh entropy)
+            first_id: Number in the first student's ID
+            today: Date deadlines and grade dates are relative to (default: today)
+            id_width: Digits in student ID numbers (default: enough for this cohort, at least 4)
+        """
+        self.num_students = num_students
+        self.seed = seed
+        self.first_id = first_id
+        self.today = today or date.today()
+        self._id_width = id_width or max(4, len(str(first_id + max(num_students - 1, 0))))
+
+        rng = np.random.default_rng(seed)
+        self._generate_profiles(rng)
+        self._generate_courses(rng)
+        self._generate_tasks(rng)
+        self._generate_grades(rng)
+        self._generate_availability(rng)
+        self._generate_behavior(rng)
+
+        # Date strings for every possible offset, so records never call strftime
+        self._deadline_dates = [
+            (self.today + timedelta(days=days)).strftime("%Y-%m-%d")
+            for days in range(MAX_TASK_DEADLINE_DAYS + 1)
+        ]
+        self._grade_dates = [
+            (self.today - timedelta(days=days)).strftime("%Y-%m-%d")
+            for days in range(MAX_GRADE_AGE_DAYS + 1)
+        ]
+        self._emails = [f"{name.lower().replace(' ', '.')}@student.edu" for name in G.STUDENT_NAMES]
+
+    def _generate_profiles(self, rng: np.random.Generator) -> None:
+        n = self.num_students
+        self.name = rng.integers(0, len(G.STUDENT_NAMES), n, dtype=np.int8)
+        self.university = rng.integers(0, len(G.UNIVERSITIES), n, dtype=np.int8)
+        self.major = rng.integers(0, len(G.MAJORS), n, dtype=np.int8)
+        self.academic_year = rng.integers(2, 5, n, dtype=np.int8)
+        self.goals = _sample_rows(rng, n, len(G.GOALS), 3).astype(np.int8).reshape(n, 3)
+
+    def _generate_courses(self, rng: np.random.Generator) -> None:
+        n = self.num_students
+        self.course_counts = rng.integers(3, 6, n)
+        self.course_offsets = _offsets(self.course_counts)
+        self.course = _sample_rows(rng, n, len(G.COURSES), self.course_counts).astype(np.int8)
+
+        rows = len(self.course)
+        self.instructor = rng.integers(0, len(G.INSTRUCTORS), rows, dtype=np.int8)
+        self.importance_weight = np.round(rng.uniform(0.6, 0.95, rows), 2)
+        self.attendance = rng.integers(60, 96, rows, dtype=np.int8)
+        self.risk_score = rng.integers(30, 86, rows, dtype=np.int8)
+
+    def _generate_tasks(self, rng: np.random.Generator) -> None:
+        n = self.num_students
+        self.task_counts = rng.integers(4, 9, n)
+        self.task_offsets = _offsets(self.task_counts)
+        rows = int(self.task_offsets[-1])
+        owner = np.repeat(np.arange(n), self.task_counts)
+
+        # Each task belongs to one of its student's courses (global course row)
+        local_course = (rng.random(rows) * self.course_counts[owner]).astype(np.int64)
+        task_course = self.course_offsets[owner] + local_course
+        task_number = np.arange(rows) - self.task_offsets[owner] + 1
+        task_type = rng.integers(0, len(G.TASK_TYPES), rows, dtype=np.int8)
+        deadline_days = rng.integers(1, MAX_TASK_DEADLINE_DAYS + 1, rows, dtype=np.int8)
+        duration = _choice(rng, G.TASK_DURATIONS, rows).astype(np.int16)
+        progress = rng.integers(0, 71, rows, dtype=np.int8)
+
+        # Each student's tasks sorted by deadline (stable, like list.sort)
+        order = np.lexsort((deadline_days, owner))
+        self.task_course = task_course[order]
+        self.task_number = task_number[order].astype(np.int8)
+        self.task_type = task_type[order]
+        self.deadline_days = deadline_days[order]
+        self.duration = duration[order]
+        self.progress = progress[order]
+
+        # Workload forecast: the first three tasks are this week's load
+        this_week = (np.arange(rows) - self.task_offsets[owner]) < 3
+        minutes = self.duration.astype(np.int64)
+        self.current_week_load = np.bincount(owner, weights=minutes * this_week, minlength=n).astype(np.int64) // 60
+        self.next_week_load = np.bincount(owner, weights=minutes * ~this_week, minlength=n).astype(np.int64) // 60
+
+    def _generate_grades(self, rng: np.random.Generator) -> None:
+        course_rows = len(self.course)
+        self.grade_counts = rng.integers(1, 4, course_rows)
+        self.grade_offsets = _offsets(self.grade_counts)
+        rows = int(self.grade_offsets[-1])
+        owner = np.repeat(np.arange(course_rows), self.grade_counts)
+
+        self.grade_number = (np.arange(rows) - self.grade_offsets[owner] + 1).astype(np.int8)
+        self.assessment_type = rng.integers(0, len(G.ASSESSMENT_TYPES), rows, dtype=np.int8)
+        self.max_score = _choice(rng, G.MAX_SCORES, rows).astype(np.int16)
+        low = self.max_score // 2
+        self.score = (low + rng.random(rows) * (self.max_score - low + 1)).astype(np.int16)
+        self.grade_age_days = rng.integers(5, MAX_GRADE_AGE_DAYS + 1, rows, dtype=np.int8)
+        self.grade_weight = _choice(rng, G.GRADE_WEIGHTS, rows).astype(np.int8)
+
+    def _generate_availability(self, rng: np.random.Generator) -> None:
+        n = self.num_students
+        days = len(G.DAYS_OF_WEEK)
+        self.available = rng.random((n, days)) >= 0.2
+        self.available[:, G.DAYS_OF_WEEK.index("Friday")] = False
+        self.slot_counts = rng.integers(1, 3, (n, days), dtype=np.int8)
+        self.slot_start = rng.integers(14, 20, (n, days, 2), dtype=np.int8)
+        self.slot_end = np.minimum(self.slot_start + rng.integers(2, 6, (n, days, 2), dtype=np.int8), 23)
+        self.max_daily_study_hours = rng.integers(3, 7, n, dtype=np.int8)
+
+    def _generate_behavior(self, rng: np.random.Generator) -> None:
+        n = self.num_students
+        self.focus_session = _choice(rng, [30, 45, 50, 60], n).astype(np.int8)
+        self.break_minutes = _choice(rng, [5, 10, 15], n).astype(np.int8)
+        self.study_hours_last_week = rng.integers(8, 21, n, dtype=np.int8)
+        self.productivity_score = rng.integers(60, 91, n, dtype=np.int8)
+        self.missed_deadlines = rng.integers(0, 6, n, dtype=np.int8)
+        self.late_submission_rate = np.round(rng.uniform(0.0, 0.4, n), 2)
+        self.daily_study_minutes = rng.integers(60, 181, n, dtype=np.int16)
+        self.most_delayed_course = rng.integers(0, len(G.DELAYED_COURSES), n, dtype=np.int8)
+
+    def __len__(self) -> int:
+        return self.num_students
+
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        if index < 0:
+            index += self.num_students
+        if not 0 <= index < self.num_students:
+            raise IndexError(f"student index {index} out of range")
+        return self.record(index)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return self.records()
+
+    def student_id(self, index: int) -> str:
+        return f"S-2026-{self.first_id + index:0{self._id_width}d}"
+
+    def record(self, index: int) -> Dict[str, Any]:
+        """
+        Build one student's record
+
+        Returns:
+            Dict shaped like StudentDataGenerator.generate_complete_student_data
+        """
+        return next(self._build_records(index, index + 1))
+
+    def records(self, start: int = 0, stop: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Build student records one at a time for a range of the cohort"""
+        stop = self.num_students if stop is None else min(stop, self.num_students)
+        for block_start in range(start, stop, RECORD_BLOCK_SIZE):
+            yield from self._build_records(block_start, min(block_start + RECORD_BLOCK_SIZE, stop))
+
+    def _build_records(self, start: int, stop: int) -> Iterator[Dict[str, Any]]:
+        # Columns are converted to Python lists one block at a time; per-record
+        # numpy indexing would cost more than building the dicts
+        course_start, course_stop = int(self.course_offsets[start]), int(self.course_offsets[stop])
+        task_start, task_stop = int(self.task_offsets[start]), int(self.task_offsets[stop])
+        grade_start, grade_stop = int(self.grade_offsets[course_start]), int(self.grade_offsets[course_stop])
+        students = slice(start, stop)
+        course_rows = slice(course_start, course_stop)
+        task_rows = slice(task_start, task_stop)
+        grade_rows = slice(grade_start, grade_stop)
+
+        course_offsets = (self.course_offsets[start:stop + 1] - course_start).tolist()
+        task_offsets = (self.task_offsets[start:stop + 1] - task_start).tolist()
+        grade_offsets = (self.grade_offsets[course_start:course_stop + 1] - grade_start).tolist()
+
+        student_columns = zip(
+            range(start, stop),
+            self.name[students].tolist(),
+            self.university[students].tolist(),
+            self.major[students].tolist(),
+            self.academic_year[students].tolist(),
+            self.goals[students].tolist(),
+            self.available[students].tolist(),
+            self.slot_counts[students].tolist(),
+            self.slot_start[students].tolist(),
+            self.slot_end[students].tolist(),
+            self.max_daily_study_hours[students].tolist(),
+            self.focus_session[students].tolist(),
+            self.break_minutes[students].tolist(),
+            self.study_hours_last_week[students].tolist(),
+            self.productivity_score[students].tolist(),
+            self.missed_deadlines[students].tolist(),
+            self.late_submission_rate[students].tolist(),
+            self.daily_study_minutes[students].tolist(),
+            self.most_delayed_course[students].tolist(),
+            self.current_week_load[students].tolist(),
+            self.next_week_load[students].tolist()
+        )
+
+        course = self.course[course_rows].tolist()
+        instructor = self.instructor[course_rows].tolist()
+        importance_weight = self.importance_weight[course_rows].tolist()
+        attendance = self.attendance[course_rows].tolist()
+        risk_score = self.risk_score[course_rows].tolist()
+
+        task_course = (self.task_course[task_rows] - course_start).tolist()
+        task_number = self.task_number[task_rows].tolist()
+        task_type = self.task_type[task_rows].tolist()
+        deadline_days = self.deadline_days[task_rows].tolist()
+        duration = self.duration[task_rows].tolist()
+        progress = self.progress[task_rows].tolist()
+
+        grade_number = self.grade_number[grade_rows].tolist()
+        assessment_type = self.assessment_type[grade_rows].tolist()
+        score = self.score[grade_rows].tolist()
+        max_score = self.max_score[grade_rows].tolist()
+        grade_age_days = self.grade_age_days[grade_rows].tolist()
+        grade_weight = self.grade_weight[grade_rows].tolist()
+
+        for position, (
+            index, name, university, major, academic_year, goals,
+            available, slot_counts, slot_start, slot_end, max_daily_study_hours,
+            focus_session, break_minutes, study_hours_last_week, productivity_score,
+            missed_deadlines, late_submission_rate, daily_study_minutes, most_delayed_course,
+            current_week_load, next_week_load
+        ) in enumerate(student_columns):
+            first_course, last_course = course_offsets[position], course_offsets[position + 1]
+
+            courses = []
+            risk_per_course = []
+            grades = []
+            course_attendance = {}
+            for row in range(first_course, last_course):
+                catalog = G.COURSES[course[row]]
+                course_id = catalog["code"]
+                courses.append({
+                    "course_id": course_id,
+                    "course_name": catalog["name"],
+                    "instructor": f"Dr. {G.INSTRUCTORS[instructor[row]]}",
+                    "credit_hours": catalog["credits"],
+                    "difficulty_level": catalog["difficulty"],
+                    "importance_weight": importance_weight[row]
+                })
+                course_attendance[course_id] = attendance[row]
+                risk_level, reason = G.risk_level(risk_score[row])
+                risk_per_course.append({
+                    "course_id": course_id,
+                    "risk_score": risk_score[row],
+                    "risk_level": risk_level,
+                    "reason": reason
+                })
+                for grade in range(grade_offsets[row], grade_offsets[row + 1]):
+                    assessment = G.ASSESSMENT_TYPES[assessment_type[grade]]
+                    grades.append({
+                        "course_id": course_id,
+                        "assessment_type": assessment,
+                        "assessment_name": f"{assessment.capitalize()} {grade_number[grade]}",
+                        "score": score[grade],
+                        "max_score": max_score[grade],
+                        "date": self._grade_dates[grade_age_days[grade]],
+                        "weight_percentage": grade_weight[grade]
+                    })
+
+            tasks = []
+            for row in range(task_offsets[position], task_offsets[position + 1]):
+                task_course_data = courses[task_course[row] - first_course]
+                type_name = G.TASK_TYPES[task_type[row]]
+                number = task_number[row]
+                days = deadline_days[row]
+                tasks.append({
+                    "task_id": f"T-{task_course_data['course_id']}-{number:02d}",
+                    "course_id": task_course_data["course_id"],
+                    "course_name": task_course_data["course_name"],
+                    "task_title": f"{type_name.capitalize()} {number} – {task_course_data['course_name']}",
+                    "task_type": type_name,
+                    "deadline": self._deadline_dates[days],
+                    "estimated_duration_minutes": duration[row],
+                    "current_progress_percentage": progress[row],
+                    "priority": G.task_priority(days),
+                    "is_completed": False
+                })
+
+            weekly_schedule = {}
+            for day, is_available, slots, starts, ends in zip(
+                G.DAYS_OF_WEEK, available, slot_counts, slot_start, slot_end
+            ):
+                weekly_schedule[day] = [
+                    {"start": f"{starts[slot]:02d}:00", "end": f"{ends[slot]:02d}:00"}
+                    for slot in range(slots)
+                ] if is_available else []
+
+            yield {
+                "student_profile": {
+                    "student_id": self.student_id(index),
+                    "name": G.STUDENT_NAMES[name],
+                    "email": self._emails[name],
+                    "university": G.UNIVERSITIES[university],
+                    "major": G.MAJORS[major],
+                    "academic_year": academic_year,
+                    "semester": "Spring 2026",
+                    "timezone": "Africa/Cairo",
+                    "goals": [G.GOALS[goal] for goal in goals]
+                },
+                "courses": courses,
+                "tasks": tasks,
+                "grades": grades,
+                "attendance": course_attendance,
+                "availability": {
+                    "weekly_schedule": weekly_schedule,
+                    "max_daily_study_hours": max_daily_study_hours
+                },
+                "productivity_pattern": {
+                    "preferred_study_days": [day for day, slots in weekly_schedule.items() if slots],
+                    "peak_focus_hours": ["18:00-22:00"],
+                    "average_focus_session_minutes": focus_session,
+                    "average_break_minutes": break_minutes,
+                    "total_study_hours_last_week": study_hours_last_week,
+                    "productivity_score": productivity_score
+                },
+                "historical_behavior": {
+                    "missed_deadlines_count": missed_deadlines,
+                    "late_submission_rate": late_submission_rate,
+                    "average_daily_study_minutes": daily_study_minutes,
+                    "most_delayed_course": G.DELAYED_COURSES[most_delayed_course]
+                },
+                "computed_analytics": {
+                    "risk_per_course": risk_per_course,
+                    "workload_forecast": {
+                        "current_week_load_hours": current_week_load,
+                        "next_week_load_hours": next_week_load,
+                        "overload_risk": current_week_load + next_week_load > 20
+                    }
+                }
+            }
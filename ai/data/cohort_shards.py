@@ -0,0 +1,304 @@
+"""
+Sharded Cohort Files
+Streams generated students to fixed-size JSONL or Parquet shards
+
+A cohort is split into shards of `shard_size` students. Each shard is
+generated and written by a worker process from its own seed, derived from
+the run seed and the shard index, so the same seed reproduces every shard
+regardless of worker count or scheduling. A worker only holds its current
+shard, so memory stays flat however large the cohort is. A manifest.json
+next to the shards records the seed and the shard list.
+
+Usage (from the ai/ directory):
+    python data/data_generator.py --students 1000000 --output-dir data/cohort --format parquet
+"""
+
+import os
+import json
+import time
+from datetime import date
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from data.data_generator import StudentDataGenerator
+from data.student_index import write_index
+
+SHARD_FORMATS = ("jsonl", "parquet")
+MANIFEST_NAME = "manifest.json"
+DEFAULT_SHARD_SIZE = 50_000
+PARQUET_ROW_GROUP_SIZE = 10_000
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError("Parquet shards need pyarrow: pip install pyarrow") from e
+    return pyarrow, pyarrow.parquet
+
+
+def shard_seed(seed: int, shard_index: int) -> int:
+    """Seed of one shard, independent of how many shards the run has"""
+    import numpy as np
+    return int(np.random.SeedSequence([seed, shard_index]).generate_state(1, dtype=np.uint64)[0])
+
+
+def shard_path(output_dir: str, shard_index: int, fmt: str) -> Path:
+    return Path(output_dir) / f"students-{shard_index:05d}.{fmt}"
+
+
+def _atomic_path(path: Path) -> Path:
+    """Temporary sibling written first, so an interrupted write never looks like a finished shard"""
+    return path.with_name(path.name + ".tmp")
+
+
+def write_jsonl(records: Iterable[Dict[str, Any]], path: Path, index: bool = True) -> int:
+    """
+    Stream records to a JSONL file (one student per line)
+
+    Args:
+        records: Student records
+        path: Output file
+        index: Also write the <file>.idx sidecar for lookup by student_id
+
+    Returns:
+        Number of records written
+    """
+    temp_path = _atomic_path(path)
+    entries: List[Tuple[str, int, int]] = []
+    count = offset = 0
+    with open(temp_path, 'wb') as f:
+        for record in records:
+            line = json.dumps(record, ensure_ascii=False).encode("utf-8")
+            f.write(line)
+            f.write(b"\n")
+            if index:
+                entries.append((record["student_profile"]["student_id"], offset, len(line)))
+            offset += len(line) + 1
+            count += 1
+    os.replace(temp_path, path)
+    if index:
+        write_index(str(path), entries)
+    return count
+
+
+def parquet_schema():
+    """Arrow schema of a student record (attendance is a course_id -> percentage map)"""
+    pa, _ = _import_pyarrow()
+    text, integer, number = pa.string(), pa.int64(), pa.float64()
+    slot = pa.list_(pa.struct([("start", text), ("end", text)]))
+    return pa.schema([
+        ("student_profile", pa.struct([
+            ("student_id", text), ("name", text), ("email", text), ("university", text),
+            ("major", text), ("academic_year", integer), ("semester", text), ("timezone", text),
+            ("goals", pa.list_(text))
+        ])),
+        ("courses", pa.list_(pa.struct([
+            ("course_id", text), ("course_name", text), ("instructor", text),
+            ("credit_hours", integer), ("difficulty_level", integer), ("importance_weight", number)
+        ]))),
+        ("tasks", pa.list_(pa.struct([
+            ("task_id", text), ("course_id", text), ("course_name", text), ("task_title", text),
+            ("task_type", text), ("deadline", text), ("estimated_duration_minutes", integer),
+            ("current_progress_percentage", integer), ("priority", text), ("is_completed", pa.bool_())
+        ]))),
+        ("grades", pa.list_(pa.struct([
+            ("course_id", text), ("assessment_type", text), ("assessment_name", text),
+            ("score", integer), ("max_score", integer), ("date", text), ("weight_percentage", integer)
+        ]))),
+        ("attendance", pa.map_(text, integer)),
+        ("availability", pa.struct([
+            ("weekly_schedule", pa.struct([(day, slot) for day in StudentDataGenerator.DAYS_OF_WEEK])),
+            ("max_daily_study_hours", integer)
+        ])),
+        ("productivity_pattern", pa.struct([
+            ("preferred_study_days", pa.list_(text)), ("peak_focus_hours", pa.list_(text)),
+            ("average_focus_session_minutes", integer), ("average_break_minutes", integer),
+            ("total_study_hours_last_week", integer), ("productivity_score", integer)
+        ])),
+        ("historical_behavior", pa.struct([
+            ("missed_deadlines_count", integer), ("late_submission_rate", number),
+            ("average_daily_study_minutes", integer), ("most_delayed_course", text)
+        ])),
+        ("computed_analytics", pa.struct([
+            ("risk_per_course", pa.list_(pa.struct([
+                ("course_id", text), ("risk_score", integer), ("risk_level", text), ("reason", text)
+            ]))),
+            ("workload_forecast", pa.struct([
+                ("current_week_load_hours", integer), ("next_week_load_hours", integer),
+                ("overload_risk", pa.bool_())
+            ]))
+        ]))
+    ])
+
+
+def write_parquet(
+    records: Iterable[Dict[str, Any]],
+    path: Path,
+    row_group_size: int = PARQUET_ROW_GROUP_SIZE
+) -> int:
+    """
+    Stream records to a Parquet file, one row group at a time
+
+    Returns:
+        Number of records written
+    """
+    pa, pq = _import_pyarrow()
+    schema = parquet_schema()
+    temp_path = _atomic_path(path)
+    count = 0
+    batch: List[Dict[str, Any]] = []
+    with pq.ParquetWriter(temp_path, schema, compression="zstd") as writer:
+        for record in records:
+            batch.append({**record, "attendance": list(record["attendance"].items())})
+            if len(batch) >= row_group_size:
+                writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+                count += len(batch)
+                batch = []
+        if batch:
+            writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+            count += len(batch)
+    os.replace(temp_path, path)
+    return count
+
+
+def iter_jsonl(path: Path) -> Iterator[Dict[str, Any]]:
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def iter_parquet(path: Path) -> Iterator[Dict[str, Any]]:
+    """Read a Parquet shard one row group at a time"""
+    _, pq = _import_pyarrow()
+    parquet_file = pq.ParquetFile(path)
+    for group in range(parquet_file.num_row_groups):
+        for record in parquet_file.read_row_group(group).to_pylist():
+            record["attendance"] = dict(record["attendance"])
+            yield record
+
+
+def iter_cohort_records(source: str) -> Iterator[Dict[str, Any]]:
+    """
+    Read student records lazily from a shard directory or a single shard
+
+    Args:
+        source: Directory with a manifest.json, or a .jsonl / .parquet file
+
+    Yields:
+        Student data dictionaries, in shard order
+    """
+    path = Path(source)
+    if path.is_dir():
+        with open(path / MANIFEST_NAME, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        for shard in manifest["shards"]:
+            yield from iter_cohort_records(str(path / shard["file"]))
+        return
+
+    if path.suffix == ".parquet":
+        yield from iter_parquet(path)
+    else:
+        yield from iter_jsonl(path)
+
+
+def _write_shard(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Generate and write one shard (runs in a worker process)"""
+    from data.bulk_generator import BulkCohort
+
+    cohort = BulkCohort(
+        job["count"],
+        seed=job["seed"],
+        first_id=job["first_id"],
+        today=date.fromisoformat(job["today"]),
+        id_width=job["id_width"]
+    )
+    path = Path(job["path"])
+    if job["format"] == "parquet":
+        written = write_parquet(cohort.records(), path)
+    else:
+        written = write_jsonl(cohort.records(), path)
+    return {"file": path.name, "first_id": job["first_id"], "count": written, "seed": job["seed"]}
+
+
+def write_cohort_shards(
+    num_students: int,
+    output_dir: str,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+    fmt: str = "jsonl",
+    seed: Optional[int] = None,
+    workers: Optional[int] = None,
+    today: Optional[date] = None
+) -> Dict[str, Any]:
+    """
+    Generate a cohort into fixed-size shards with a process pool
+
+    Args:
+        num_students: Cohort size
+        output_dir: Directory for the shards and manifest.json
+        shard_size: Students per shard
+        fmt: "jsonl" or "parquet"
+        seed: Run seed (None: a random one, recorded in the manifest)
+        workers: Worker processes (default: CPU count)
+        today: Date deadlines and grade dates are relative to (default: today)
+
+    Returns:
+        The manifest (seed, format, shard list, elapsed seconds)
+
+    Raises:
+        ValueError: For an unknown format or a non-positive shard size
+    """
+    if fmt not in SHARD_FORMATS:
+        raise ValueError(f"Unknown shard format '{fmt}' (expected one of {', '.join(SHARD_FORMATS)})")
+    if shard_size <= 0:
+        raise ValueError("shard_size must be positive")
+    if fmt == "parquet":
+        _import_pyarrow()  # Fail before starting workers
+
+    import numpy as np
+    if seed is None:
+        seed = int(np.random.SeedSequence().generate_state(1, dtype=np.uint32)[0])
+    today = today or date.today()
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+
+    # The same ID width in every shard keeps IDs sortable across shards
+    id_width = max(4, len(str(max(num_students - 1, 0))))
+    jobs = [
+        {
+            "path": str(shard_path(output_dir, index, fmt)),
+            "format": fmt,
+            "first_id": first_id,
+            "count": min(shard_size, num_students - first_id),
+            "seed": shard_seed(seed, index),
+            "today": today.isoformat(),
+            "id_width": id_width
+        }
+        for index, first_id in enumerate(range(0, num_students, shard_size))
+    ]
+
+    started = time.monotonic()
+    print(f"🏭 Generating {num_students:,} students into {len(jobs)} {fmt} shards (seed {seed})")
+    shards: List[Dict[str, Any]] = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_write_shard, job) for job in jobs]
+        for future in as_completed(futures):
+            shards.append(future.result())
+            written = sum(shard["count"] for shard in shards)
+            print(f"📦 {len(shards)}/{len(jobs)} shards, {written:,} students ({time.monotonic() - started:.1f}s)")
+
+    shards.sort(key=lambda shard: shard["first_id"])
+    manifest = {
+        "format": fmt,
+        "seed": seed,
+        "num_students": num_students,
+        "shard_size": shard_size,
+        "generated_for": today.isoformat(),
+        "shards": shards,
+        "elapsed_seconds": round(time.monotonic() - started, 2)
+    }
+    with open(Path(output_dir) / MANIFEST_NAME, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
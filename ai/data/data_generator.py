@@ -3,10 +3,13 @@ Fake Student Data Generator
 Generates realistic student profiles with courses, tasks, grades, and analytics
 """
 
+import sys
 import json
 import random
-from datetime import datetime, timedelta
-from typing import Dict, List, Any
+import argparse
+from pathlib import Path
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Any, Optional, Tuple
 
 
 class StudentDataGenerator:
@@ -42,6 +45,27 @@ class StudentDataGenerator:
     
     DAYS_OF_WEEK = ["Saturday", "Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
     
+    GOALS = [
+        "Improve GPA",
+        "Avoid missing deadlines",
+        "Reduce study stress",
+        "Master programming skills",
+        "Prepare for exams",
+        "Balance work and life"
+    ]
+    
+    INSTRUCTORS = ['Mohamed Ali', 'Sara Ahmed', 'Ahmed Hassan', 'Fatima Said']
+    
+    TASK_DURATIONS = [60, 90, 120, 180, 240]
+    
+    ASSESSMENT_TYPES = ["midterm", "quiz", "assignment", "project"]
+    
+    MAX_SCORES = [10, 20, 30, 50, 100]
+    
+    GRADE_WEIGHTS = [10, 15, 20, 30]
+    
+    DELAYED_COURSES = ["Artificial Intelligence", "Machine Learning", "Data Mining"]
+    
     @staticmethod
     def generate_student_profile() -> Dict[str, Any]:
         """Generate a random student profile"""
@@ -58,14 +82,7 @@ class StudentDataGenerator:
             "academic_year": random.randint(2, 4),
             "semester": "Spring 2026",
             "timezone": "Africa/Cairo",
-            "goals": random.sample([
-                "Improve GPA",
-                "Avoid missing deadlines",
-                "Reduce study stress",
-                "Master programming skills",
-                "Prepare for exams",
-                "Balance work and life"
-            ], k=3)
+            "goals": random.sample(StudentDataGenerator.GOALS, k=3)
         }
     
     @staticmethod
@@ -78,7 +95,7 @@ class StudentDataGenerator:
             courses.append({
                 "course_id": course["code"],
                 "course_name": course["name"],
-                "instructor": f"Dr. {random.choice(['Mohamed Ali', 'Sara Ahmed', 'Ahmed Hassan', 'Fatima Said'])}",
+                "instructor": f"Dr. {random.choice(StudentDataGenerator.INSTRUCTORS)}",
                 "credit_hours": course["credits"],
                 "difficulty_level": course["difficulty"],
                 "importance_weight": round(random.uniform(0.6, 0.95), 2)
@@ -100,14 +117,6 @@ class StudentDataGenerator:
             deadline_days = random.randint(1, 14)
             deadline = today + timedelta(days=deadline_days)
             
-            # Priority based on deadline and difficulty
-            if deadline_days <= 2:
-                priority = "high"
-            elif deadline_days <= 7:
-                priority = "medium"
-            else:
-                priority = "low"
-            
             tasks.append({
                 "task_id": f"T-{course['course_id']}-{i+1:02d}",
                 "course_id": course["course_id"],
@@ -115,9 +124,9 @@ class StudentDataGenerator:
                 "task_title": f"{task_type.capitalize()} {i+1} – {course['course_name']}",
                 "task_type": task_type,
                 "deadline": deadline.strftime("%Y-%m-%d"),
-                "estimated_duration_minutes": random.choice([60, 90, 120, 180, 240]),
+                "estimated_duration_minutes": random.choice(StudentDataGenerator.TASK_DURATIONS),
                 "current_progress_percentage": random.randint(0, 70),
-                "priority": priority,
+                "priority": StudentDataGenerator.task_priority(deadline_days),
                 "is_completed": False
             })
         
@@ -126,6 +135,15 @@ class StudentDataGenerator:
         
         return tasks
     
+    @staticmethod
+    def task_priority(deadline_days: int) -> str:
+        """Priority based on days until the deadline"""
+        if deadline_days <= 2:
+            return "high"
+        if deadline_days <= 7:
+            return "medium"
+        return "low"
+    
     @staticmethod
     def generate_grades(courses: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Generate random grades for courses"""
@@ -135,8 +153,8 @@ class StudentDataGenerator:
             num_assessments = random.randint(1, 3)
             
             for i in range(num_assessments):
-                assessment_type = random.choice(["midterm", "quiz", "assignment", "project"])
-                max_score = random.choice([10, 20, 30, 50, 100])
+                assessment_type = random.choice(StudentDataGenerator.ASSESSMENT_TYPES)
+                max_score = random.choice(StudentDataGenerator.MAX_SCORES)
                 score = random.randint(int(max_score * 0.5), max_score)
                 
                 past_date = datetime.now() - timedelta(days=random.randint(5, 30))
@@ -148,7 +166,7 @@ class StudentDataGenerator:
                     "score": score,
                     "max_score": max_score,
                     "date": past_date.strftime("%Y-%m-%d"),
-                    "weight_percentage": random.choice([10, 15, 20, 30])
+                    "weight_percentage": random.choice(StudentDataGenerator.GRADE_WEIGHTS)
                 })
         
         return grades
@@ -211,9 +229,18 @@ class StudentDataGenerator:
             "missed_deadlines_count": random.randint(0, 5),
             "late_submission_rate": round(random.uniform(0.0, 0.4), 2),
             "average_daily_study_minutes": random.randint(60, 180),
-            "most_delayed_course": random.choice(["Artificial Intelligence", "Machine Learning", "Data Mining"])
+            "most_delayed_course": random.choice(StudentDataGenerator.DELAYED_COURSES)
         }
     
+    @staticmethod
+    def risk_level(risk_score: int) -> Tuple[str, str]:
+        """Risk level and its explanation for a course risk score"""
+        if risk_score >= 70:
+            return "high", "High difficulty + low progress + close deadline"
+        if risk_score >= 50:
+            return "medium", "Moderate performance and upcoming assessments"
+        return "low", "Good progress and manageable workload"
+    
     @staticmethod
     def generate_computed_analytics(courses: List[Dict[str, Any]], tasks: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Generate risk analytics and workload forecasts"""
@@ -221,16 +248,7 @@ class StudentDataGenerator:
         
         for course in courses:
             risk_score = random.randint(30, 85)
-            
-            if risk_score >= 70:
-                risk_level = "high"
-                reason = "High difficulty + low progress + close deadline"
-            elif risk_score >= 50:
-                risk_level = "medium"
-                reason = "Moderate performance and upcoming assessments"
-            else:
-                risk_level = "low"
-                reason = "Good progress and manageable workload"
+            risk_level, reason = StudentDataGenerator.risk_level(risk_score)
             
             risk_per_course.append({
                 "course_id": course["course_id"],
@@ -280,10 +298,68 @@ class StudentDataGenerator:
             "historical_behavior": historical_behavior,
             "computed_analytics": computed_analytics
         }
+    
+    @staticmethod
+    def generate_cohort(
+        num_students: int,
+        seed: Optional[int] = None,
+        first_id: int = 0,
+        today: Optional[date] = None
+    ):
+        """
+        Generate a large cohort at once with NumPy (see data/bulk_generator.py)
+        
+        Much faster than calling generate_complete_student_data per student;
+        records have the same shape and are only built when accessed.
+        
+        Args:
+            num_students: Cohort size
+            seed: Seed for a reproducible cohort
+            first_id: Number in the first student's ID (S-2026-<first_id>)
+            today: Date deadlines and grade dates are relative to (default: today)
+            
+        Returns:
+            BulkCohort (indexable and iterable student records)
+        """
+        from data.bulk_generator import BulkCohort
+        return BulkCohort(num_students, seed=seed, first_id=first_id, today=today)
 
 
 def main():
-    """Generate and save sample student data"""
+    """
+    Generate and save sample student data
+    
+    Without arguments writes one student to data/generated_student_data.json.
+    With --students, streams a whole cohort to sharded JSONL/Parquet files:
+    
+        python data/data_generator.py --students 1000000 --output-dir data/cohort --seed 7
+    """
+    parser = argparse.ArgumentParser(description="Generate fake student data")
+    parser.add_argument("--students", type=int, help="Cohort size; writes sharded files instead of one sample student")
+    parser.add_argument("--output-dir", default="data/cohort", help="Directory for cohort shards (default: data/cohort)")
+    parser.add_argument("--format", choices=["jsonl", "parquet"], default="jsonl", help="Shard format (parquet needs pyarrow)")
+    parser.add_argument("--shard-size", type=int, default=50_000, help="Students per shard (default: 50000)")
+    parser.add_argument("--seed", type=int, help="Run seed; the same seed reproduces every shard")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    args = parser.parse_args()
+    
+    if args.students:
+        # Run as a script from ai/, so make the data package importable
+        sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+        from data.cohort_shards import write_cohort_shards
+        
+        manifest = write_cohort_shards(
+            args.students,
+            args.output_dir,
+            shard_size=args.shard_size,
+            fmt=args.format,
+            seed=args.seed,
+            workers=args.workers
+        )
+        print(f"✅ {manifest['num_students']:,} students in {len(manifest['shards'])} shards saved to: {args.output_dir} "
+              f"({manifest['elapsed_seconds']}s, seed {manifest['seed']})")
+        return
+    
     generator = StudentDataGenerator()
     student_data = generator.generate_complete_student_data()
     
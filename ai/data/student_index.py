@@ -0,0 +1,237 @@
+"""
+Indexed Student Data Files
+Random access to single students in large JSONL files
+
+A student data file is plain JSONL (one student per line) with a sidecar
+`<file>.idx`: an on-disk open-addressing hash table mapping a hash of each
+student_id to the byte offset and length of its line. Both files are
+memory-mapped, so fetching a student reads one index slot and parses one
+line, no matter how large the file is, and opening a file costs nothing.
+
+Usage (from the ai/ directory):
+    python data/student_index.py build data/cohort/students-00000.jsonl
+    python data/student_index.py get data/cohort/students-00000.jsonl S-2026-000042
+"""
+
+import os
+import sys
+import json
+import mmap
+import struct
+import hashlib
+import argparse
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+INDEX_SUFFIX = ".idx"
+INDEX_MAGIC = b"UGSIDX1\0"
+
+# magic, slot count, record count, size of the data file the index was built for
+_HEADER = struct.Struct("<8sQQQ")
+# student_id hash (0 = empty slot), line offset, line length
+_SLOT = struct.Struct("<QQQ")
+
+
+def index_path(path: str) -> str:
+    return path + INDEX_SUFFIX
+
+
+def _file_version(stat: os.stat_result) -> Tuple[int, int, int]:
+    # A replaced file gets a new inode; one rewritten in place a new mtime or size
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+def _key_hash(student_id: str) -> int:
+    # Stable across processes (unlike hash()); 0 marks an empty slot
+    value = int.from_bytes(hashlib.blake2b(student_id.encode("utf-8"), digest_size=8).digest(), "little")
+    return value or 1
+
+
+def write_index(path: str, entries: List[Tuple[str, int, int]]) -> None:
+    """
+    Write the sidecar index of a data file
+
+    Args:
+        path: Data file the index describes (must already be complete)
+        entries: (student_id, line offset, line length) per record
+    """
+    num_slots = 1
+    while num_slots < 2 * len(entries):  # Load factor <= 0.5 keeps probes short
+        num_slots *= 2
+    mask = num_slots - 1
+
+    table = bytearray(num_slots * _SLOT.size)
+    for student_id, offset, length in entries:
+        key = _key_hash(student_id)
+        slot = key & mask
+        while _SLOT.unpack_from(table, slot * _SLOT.size)[0]:
+            slot = (slot + 1) & mask
+        _SLOT.pack_into(table, slot * _SLOT.size, key, offset, length)
+
+    temp_path = index_path(path) + ".tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(_HEADER.pack(INDEX_MAGIC, num_slots, len(entries), os.path.getsize(path)))
+        f.write(table)
+    os.replace(temp_path, index_path(path))
+
+
+def _iter_lines(data) -> Iterator[Tuple[int, bytes]]:
+    """(offset, line) for every non-empty line of a bytes-like buffer"""
+    position, size = 0, len(data)
+    while position < size:
+        end = data.find(b"\n", position)
+        if end == -1:
+            end = size
+        line = data[position:end]
+        if line.strip():
+            yield position, line
+        position = end + 1
+
+
+def _map(f) -> Any:
+    # mmap cannot map an empty file
+    if os.fstat(f.fileno()).st_size == 0:
+        return b""
+    return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def build_index(path: str) -> int:
+    """
+    Index an existing JSONL student file
+
+    Returns:
+        Number of students indexed
+    """
+    entries = []
+    with open(path, 'rb') as f:
+        data = _map(f)
+        for offset, line in _iter_lines(data):
+            student_id = json.loads(line)["student_profile"]["student_id"]
+            entries.append((student_id, offset, len(line)))
+        if isinstance(data, mmap.mmap):
+            data.close()
+    write_index(path, entries)
+    return len(entries)
+
+
+class IndexedStudentFile:
+    """
+    Memory-mapped JSONL student file with constant-time lookup by student_id
+
+    Raises ValueError on open if the sidecar index is missing, unreadable,
+    or was built for a different version of the data file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._data_file = open(path, 'rb')
+        try:
+            self._index_file = open(index_path(path), 'rb')
+        except FileNotFoundError:
+            self._data_file.close()
+            raise ValueError(f"{path} has no index; build it with build_index()")
+        self._data = _map(self._data_file)
+        self._index = _map(self._index_file)
+        self._versions = (
+            _file_version(os.fstat(self._data_file.fileno())),
+            _file_version(os.fstat(self._index_file.fileno()))
+        )
+
+        if len(self._index) < _HEADER.size:
+            self.close()
+            raise ValueError(f"Unreadable index for {path}")
+        magic, self._num_slots, self._num_records, data_size = _HEADER.unpack_from(self._index, 0)
+        if magic != INDEX_MAGIC:
+            self.close()
+            raise ValueError(f"Unreadable index for {path}")
+        if data_size != len(self._data):
+            self.close()
+            raise ValueError(f"Index for {path} is stale; rebuild it with build_index()")
+        self._mask = self._num_slots - 1
+
+    def is_current(self) -> bool:
+        """Whether the data file and index on disk are still the ones mapped"""
+        try:
+            on_disk = (_file_version(os.stat(self.path)), _file_version(os.stat(index_path(self.path))))
+        except FileNotFoundError:
+            return False
+        return on_disk == self._versions
+
+    def _candidates(self, student_id: str) -> Iterator[Tuple[int, int]]:
+        """(offset, length) of every line whose student_id hash matches"""
+        key = _key_hash(student_id)
+        slot = key & self._mask
+        while True:
+            slot_key, offset, length = _SLOT.unpack_from(self._index, _HEADER.size + slot * _SLOT.size)
+            if slot_key == 0:
+                return
+            if slot_key == key:
+                yield offset, length
+            slot = (slot + 1) & self._mask
+
+    def get(self, student_id: str) -> Optional[Dict[str, Any]]:
+        """Student record, or None if the file has no such student"""
+        for offset, length in self._candidates(student_id):
+            record = json.loads(self._data[offset:offset + length])
+            # Hashes can collide, so confirm the ID before serving the record
+            if record["student_profile"]["student_id"] == student_id:
+                return record
+        return None
+
+    def __getitem__(self, student_id: str) -> Dict[str, Any]:
+        record = self.get(student_id)
+        if record is None:
+            raise KeyError(student_id)
+        return record
+
+    def __contains__(self, student_id: str) -> bool:
+        return self.get(student_id) is not None
+
+    def __len__(self) -> int:
+        return self._num_records
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """Every student in file order, parsed one line at a time"""
+        for _, line in _iter_lines(self._data):
+            yield json.loads(line)
+
+    def close(self) -> None:
+        for mapped in (getattr(self, "_data", None), getattr(self, "_index", None)):
+            if isinstance(mapped, mmap.mmap):
+                mapped.close()
+        self._data_file.close()
+        if hasattr(self, "_index_file"):
+            self._index_file.close()
+
+    def __enter__(self) -> "IndexedStudentFile":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def main():
+    """Build an index or look up one student"""
+    parser = argparse.ArgumentParser(description="Indexed student data files")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build = subparsers.add_parser("build", help="Index JSONL student files")
+    build.add_argument("files", nargs="+")
+    get = subparsers.add_parser("get", help="Print one student from an indexed file")
+    get.add_argument("file")
+    get.add_argument("student_id")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        for path in args.files:
+            print(f"🗂️  Indexed {build_index(path):,} students in {path}")
+        return
+
+    with IndexedStudentFile(args.file) as students:
+        record = students.get(args.student_id)
+    if record is None:
+        print(f"❌ {args.student_id} not found in {args.file}")
+        sys.exit(1)
+    print(json.dumps(record, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,357 @@
+"""
+Local Mock LLM Provider
+OpenAI-compatible /chat/completions stand-in for offline load and latency testing
+
+Speaks the same protocol DeepSeekLLMClient uses (JSON and SSE streaming) with
+configurable latency distributions, token rates, error injection and 429s.
+
+Usage:
+    python mock_provider.py --port 9000 --latency lognormal:0.8:0.5 --tokens-per-second 250
+
+Then point a client at it, e.g.:
+    GROQ_API_KEY=mock GROQ_API_BASE=http://127.0.0.1:9000/v1 python -m uvicorn app.main:app
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+try:
+    import uvicorn
+    from fastapi import FastAPI, Request
+    from fastapi.responses import JSONResponse, StreamingResponse
+except ImportError as e:
+    raise ImportError("mock_provider needs fastapi and uvicorn: pip install fastapi uvicorn") from e
+
+
+FILLER_WORDS = (
+    "review", "practice", "focus", "deadline", "chapter", "quiz", "assignment",
+    "schedule", "break", "session", "priority", "notes", "summary", "exercise",
+    "revise", "plan", "project", "exam", "concepts", "problems",
+)
+
+
+class LatencyDistribution:
+    """
+    Samples time-to-first-token in seconds
+
+    Spec format: "<kind>:<params>" where kind is one of
+    fixed:S | uniform:MIN:MAX | normal:MEAN:STD | lognormal:MEDIAN:SIGMA | exponential:MEAN
+    """
+
+    def __init__(self, spec: str = "fixed:0.2", rng: Optional[random.Random] = None):
+        self.spec = spec
+        self.rng = rng or random.Random()
+        kind, *params = spec.split(":")
+        self.kind = kind
+        self.params = [float(p) for p in params]
+
+        expected = {"fixed": 1, "uniform": 2, "normal": 2, "lognormal": 2, "exponential": 1}
+        if kind not in expected or len(self.params) != expected[kind]:
+            raise ValueError(f"Invalid latency spec '{spec}' (see LatencyDistribution docstring)")
+
+    def sample(self) -> float:
+        p = self.params
+        if self.kind == "fixed":
+            value = p[0]
+        elif self.kind == "uniform":
+            value = self.rng.uniform(p[0], p[1])
+        elif self.kind == "normal":
+            value = self.rng.gauss(p[0], p[1])
+        elif self.kind == "lognormal":
+            # Parameterized by median so "lognormal:0.8:0.5" centers on 0.8s
+            value = p[0] * self.rng.lognormvariate(0.0, p[1])
+        else:
+            value = self.rng.expovariate(1.0 / p[0]) if p[0] > 0 else 0.0
+        return max(0.0, value)
+
+
+class MockProviderConfig:
+    """Behavior knobs for the mock provider"""
+
+    def __init__(
+        self,
+        latency: str = "fixed:0.2",
+        tokens_per_second: float = 200.0,
+        completion_tokens: int = 300,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        retry_after: float = 1.0,
+        requests_per_minute: Optional[int] = None,
+        hang_rate: float = 0.0,
+        hang_seconds: float = 120.0,
+        seed: Optional[int] = None
+    ):
+        """
+        Initialize the config
+
+        Args:
+            latency: Time-to-first-token distribution spec
+            tokens_per_second: Generation speed after the first token (0 = instant)
+            completion_tokens: Tokens per answer (capped by the request's max_tokens)
+            error_rate: Probability of a 500 response
+            rate_limit_rate: Probability of a random 429 response
+            retry_after: Retry-After seconds sent with 429s
+            requests_per_minute: Real sliding-window limit; excess requests get 429
+            hang_rate: Probability of stalling for hang_seconds (timeout testing)
+            hang_seconds: Length of an injected stall
+            seed: Seed for reproducible runs
+        """
+        self.rng = random.Random(seed)
+        self.latency = LatencyDistribution(latency, self.rng)
+        self.tokens_per_second = tokens_per_second
+        self.completion_tokens = completion_tokens
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.requests_per_minute = requests_per_minute
+        self.hang_rate = hang_rate
+        self.hang_seconds = hang_seconds
+
+
+class MockProviderStats:
+    """Counters exposed at GET /stats"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self.lock:
+            self.counts = {"requests": 0, "completed": 0, "streamed": 0, "errors": 0, "rate_limited": 0, "hangs": 0}
+            self.in_flight = 0
+            self.max_in_flight = 0
+
+    def incr(self, name: str) -> None:
+        with self.lock:
+            self.counts[name] += 1
+
+    def enter(self) -> None:
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def leave(self) -> None:
+        with self.lock:
+            self.in_flight -= 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self.lock:
+            return dict(self.counts, in_flight=self.in_flight, max_in_flight=self.max_in_flight)
+
+
+def _estimate_tokens(messages: List[Dict[str, Any]]) -> int:
+    return max(1, sum(len(str(m.get("content", ""))) for m in messages) // 4)
+
+
+def create_app(config: Optional[MockProviderConfig] = None) -> FastAPI:
+    """Build the mock provider ASGI app"""
+    config = config or MockProviderConfig()
+    stats = MockProviderStats()
+    window: Deque[float] = deque()
+
+    app = FastAPI(title="UpGrade Mock LLM Provider")
+    app.state.config = config
+    app.state.stats = stats
+
+    def rate_limited() -> bool:
+        """Sliding one-minute window for the real RPM limit"""
+        if not config.requests_per_minute:
+            return False
+        now = time.monotonic()
+        while window and now - window[0] > 60:
+            window.popleft()
+        if len(window) >= config.requests_per_minute:
+            return True
+        window.append(now)
+        return False
+
+    def fault() -> Optional[Tuple[int, Dict[str, Any], Dict[str, str]]]:
+        """Decide on an injected failure for this request"""
+        if rate_limited() or config.rng.random() < config.rate_limit_rate:
+            stats.incr("rate_limited")
+            return 429, {"error": {"message": "Rate limit reached", "type": "rate_limit_exceeded"}}, {
+                "Retry-After": f"{config.retry_after:g}"
+            }
+        if config.rng.random() < config.error_rate:
+            stats.incr("errors")
+            return 500, {"error": {"message": "Injected server error", "type": "server_error"}}, {}
+        return None
+
+    def completion_words(max_tokens: int) -> List[str]:
+        count = max(1, min(max_tokens, config.completion_tokens))
+        return [config.rng.choice(FILLER_WORDS) for _ in range(count)]
+
+    @app.post("/chat/completions")
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        stats.incr("requests")
+
+        injected = fault()
+        if injected:
+            status, payload, headers = injected
+            return JSONResponse(payload, status_code=status, headers=headers)
+
+        if config.rng.random() < config.hang_rate:
+            stats.incr("hangs")
+            await asyncio.sleep(config.hang_seconds)
+
+        messages = body.get("messages", [])
+        model = body.get("model", "mock-model")
+        words = completion_words(int(body.get("max_tokens", 4000)))
+        prompt_tokens = _estimate_tokens(messages)
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": len(words),
+            "total_tokens": prompt_tokens + len(words)
+        }
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        ttft = config.latency.sample()
+        per_token = 1.0 / config.tokens_per_second if config.tokens_per_second > 0 else 0.0
+
+        if not body.get("stream"):
+            stats.enter()
+            try:
+                await asyncio.sleep(ttft + per_token * (len(words) - 1))
+            finally:
+                stats.leave()
+            stats.incr("completed")
+            return {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": " ".join(words)},
+                    "finish_reason": "stop"
+                }],
+                "usage": usage
+            }
+
+        async def events():
+            stats.enter()
+            try:
+                await asyncio.sleep(ttft)
+                for i, word in enumerate(words):
+                    chunk = {
+                        "id": completion_id,
+                        "object": "chat.completion.chunk",
+                        "model": model,
+                        "choices": [{"index": 0, "delta": {"content": word if i == 0 else " " + word}, "finish_reason": None}]
+                    }
+                    yield f"data: {json.dumps(chunk)}\n\n"
+                    if per_token:
+                        await asyncio.sleep(per_token)
+                final = {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "model": model,
+                    "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+                    "usage": usage
+                }
+                yield f"data: {json.dumps(final)}\n\n"
+                yield "data: [DONE]\n\n"
+                stats.incr("streamed")
+            finally:
+                stats.leave()
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.get("/v1/models")
+    @app.get("/models")
+    async def models():
+        return {"object": "list", "data": [{"id": "mock-model", "object": "model"}]}
+
+    @app.get("/stats")
+    async def get_stats():
+        return stats.snapshot()
+
+    @app.post("/stats/reset")
+    async def reset_stats():
+        stats.reset()
+        return {"status": "ok"}
+
+    return app
+
+
+class MockProviderServer:
+    """Runs the mock provider on a background thread (for benchmarks and checks)"""
+
+    def __init__(self, config: Optional[MockProviderConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        self.app = create_app(config)
+        self._server = uvicorn.Server(uvicorn.Config(self.app, host=host, port=port, log_level="warning"))
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+
+    @property
+    def stats(self) -> MockProviderStats:
+        return self.app.state.stats
+
+    @property
+    def base_url(self) -> str:
+        sock = self._server.servers[0].sockets[0]
+        host, port = sock.getsockname()[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "MockProviderServer":
+        self._thread.start()
+        while not self._server.started:
+            time.sleep(0.01)
+        return self
+
+    def stop(self) -> None:
+        self._server.should_exit = True
+        self._thread.join(timeout=5)
+
+    def __enter__(self) -> "MockProviderServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenAI-compatible mock LLM provider")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--latency", default="fixed:0.2",
+                        help="TTFT distribution: fixed:S | uniform:MIN:MAX | normal:MEAN:STD | "
+                             "lognormal:MEDIAN:SIGMA | exponential:MEAN")
+    parser.add_argument("--tokens-per-second", type=float, default=200.0, help="Generation speed (0 = instant)")
+    parser.add_argument("--completion-tokens", type=int, default=300, help="Tokens per answer (capped by max_tokens)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability of HTTP 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Probability of a random HTTP 429")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds on 429")
+    parser.add_argument("--rpm", type=int, default=None, help="Enforce a real requests-per-minute limit")
+    parser.add_argument("--hang-rate", type=float, default=0.0, help="Probability of stalling (timeout testing)")
+    parser.add_argument("--hang-seconds", type=float, default=120.0, help="Stall length")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for reproducible runs")
+    args = parser.parse_args()
+
+    config = MockProviderConfig(
+        latency=args.latency,
+        tokens_per_second=args.tokens_per_second,
+        completion_tokens=args.completion_tokens,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after,
+        requests_per_minute=args.rpm,
+        hang_rate=args.hang_rate,
+        hang_seconds=args.hang_seconds,
+        seed=args.seed
+    )
+
+    print(f"🧪 Mock LLM provider on http://{args.host}:{args.port}/v1 (latency {args.latency}, "
+          f"{args.tokens_per_second:g} tok/s, errors {args.error_rate:.0%}, 429s {args.rate_limit_rate:.0%})")
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Study Plan Cache
+Serves stored plans for students whose plan-relevant data has not changed
+
+Plans are keyed by a fingerprint of the canonicalized student data, the
+"days left" the prompt renders for each deadline, and the generation
+settings (model, prompt template, formats). Re-running a cohort only calls
+the LLM for students whose prompt would actually differ.
+
+The calendar date itself is not part of the key. A student with no dated
+tasks keeps their plan across days. Once a deadline's "days left" changes,
+the plan's urgency no longer matches and it is regenerated.
+"""
+
+import os
+import json
+import hashlib
+from datetime import date
+from typing import Any, Dict, Optional
+
+from planner_llm.prompt import StudyPlanPrompts, days_until_lookup
+from planner_llm.formatter import JSON_OUTPUT_INSTRUCTIONS, STUDY_PLAN_SCHEMA
+from plan_store import PlanStore, plan_store_for
+
+# Changes to the prompt templates change every fingerprint, so stale plans
+# are never served after the prompts are edited
+_TEMPLATE_DIGEST = hashlib.sha256(
+    json.dumps(
+        [
+            StudyPlanPrompts.SYSTEM_PROMPT,
+            StudyPlanPrompts.TASK_INSTRUCTIONS,
+            StudyPlanPrompts.COMPACT_TASK_INSTRUCTIONS,
+            JSON_OUTPUT_INSTRUCTIONS,
+            STUDY_PLAN_SCHEMA
+        ],
+        sort_keys=True,
+        ensure_ascii=False
+    ).encode("utf-8")
+).hexdigest()
+
+
+def canonical_student_data(student_data: Dict[str, Any]) -> str:
+    """Key-order and whitespace independent JSON text of a student record"""
+    return json.dumps(student_data, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def days_left_by_deadline(student_data: Dict[str, Any], reference_date: date) -> Dict[str, Optional[int]]:
+    """The "days left" the prompt renders for each task deadline (None for unparseable dates)"""
+    days_until = days_until_lookup(reference_date.toordinal())
+    days_left: Dict[str, Optional[int]] = {}
+    for task in student_data.get("tasks") or []:
+        deadline = str(task.get("deadline"))
+        if deadline not in days_left:
+            try:
+                days_left[deadline] = days_until(deadline)
+            except ValueError:
+                days_left[deadline] = None
+    return days_left
+
+
+def plan_fingerprint(student_data: Dict[str, Any], reference_date: date, **settings: Any) -> str:
+    """
+    Fingerprint of everything a generated plan depends on
+
+    Only the date-relative values the prompt renders are keyed on, not
+    `reference_date` itself.
+
+    Args:
+        student_data: Complete student data dictionary
+        reference_date: Day the prompt's "days left" are counted from
+        settings: Generation settings (model, prompt_format, output_format, ...)
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    payload = "\n".join([
+        _TEMPLATE_DIGEST,
+        json.dumps(days_left_by_deadline(student_data, reference_date), sort_keys=True),
+        json.dumps(settings, sort_keys=True, default=str),
+        canonical_student_data(student_data)
+    ])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class PlanCache:
+    """
+    Generated plan results by fingerprint
+
+    Entries live in the output directory's plan store (a table of plans.db
+    for the SQLite backend), so plans and their cache share one place.
+    """
+
+    def __init__(self, store: PlanStore):
+        self.store = store
+
+    def get(self, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """Stored result for a fingerprint, or None"""
+        return self.store.cached_result(fingerprint)
+
+    def set(self, fingerprint: str, result: Dict[str, Any]) -> None:
+        """Store a successful result"""
+        self.store.cache_result(fingerprint, result)
+
+
+def plan_cache_for(output_dir: str) -> Optional[PlanCache]:
+    """
+    Plan cache kept in a directory's plan store
+
+    PLANNER_PLAN_CACHE=false disables it.
+    """
+    if os.getenv("PLANNER_PLAN_CACHE", "true").lower() in ("0", "false", "no", "off"):
+        return None
+    return PlanCache(plan_store_for(output_dir))
@@ -0,0 +1,358 @@
+"""
+Study Plan Store
+Indexed storage for generated study plans
+
+The default SQLite backend keeps every generated plan in one file indexed
+by (student_id, generated_at), so "latest plan for student X" is a single
+index seek instead of a directory scan, and writes are committed in
+batches. The original layout (study_plan_<id>.md + response_<id>.json per
+student) is still available as the "files" backend and as an export.
+
+A store also holds the plan cache (plan_cache.py): finished results keyed
+by a fingerprint of their inputs. SQLite keeps them in a table of the same
+database; the files backend keeps one JSON file per fingerprint.
+"""
+
+import os
+import json
+import time
+import atexit
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+
+class StoredPlan:
+    """One generated plan as kept by a store"""
+
+    def __init__(self, student_id: str, student_name: str, generated_at: float, result: Dict[str, Any]):
+        self.student_id = student_id
+        self.student_name = student_name
+        self.generated_at = generated_at
+        self.result = result
+
+    @property
+    def study_plan(self) -> str:
+        return self.result.get("study_plan", "")
+
+
+def write_plan_files(directory: str, plan: StoredPlan) -> Tuple[Path, Path]:
+    """
+    Write a plan in the per-student file layout
+
+    Returns:
+        (study_plan_<id>.md path, response_<id>.json path)
+    """
+    Path(directory).mkdir(parents=True, exist_ok=True)
+
+    plan_file = Path(directory) / f"study_plan_{plan.student_id}.md"
+    with open(plan_file, 'w', encoding='utf-8') as f:
+        f.write(f"# Study Plan for {plan.student_name}\n\n")
+        f.write(f"**Generated**: {plan.generated_at}\n\n")
+        f.write(plan.study_plan)
+
+    # Written last and atomically, so a half-written response file never
+    # marks a student as done
+    response_file = Path(directory) / f"response_{plan.student_id}.json"
+    temp_file = response_file.with_suffix(".json.tmp")
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        json.dump(plan.result, f, indent=2, ensure_ascii=False)
+    os.replace(temp_file, response_file)
+
+    return plan_file, response_file
+
+
+class PlanStore(ABC):
+    """Interface implemented by plan storage backends"""
+
+    location = ""
+
+    @abstractmethod
+    def put(self, plan: StoredPlan) -> None:
+        """Add a plan (may be buffered until flush)"""
+
+    @abstractmethod
+    def latest(self, student_id: str) -> Optional[StoredPlan]:
+        """Most recently generated plan for a student"""
+
+    @abstractmethod
+    def history(self, student_id: str, limit: int = 10) -> List[StoredPlan]:
+        """A student's plans, newest first"""
+
+    @abstractmethod
+    def student_ids(self) -> Set[str]:
+        """Students with at least one stored plan"""
+
+    def cached_result(self, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """Plan cache entry for a fingerprint (backends without a cache never hit)"""
+        return None
+
+    def cache_result(self, fingerprint: str, result: Dict[str, Any]) -> None:
+        """Store a plan cache entry"""
+
+    def latest_plans(self) -> List[StoredPlan]:
+        """Latest plan of every student"""
+        return [plan for plan in (self.latest(student_id) for student_id in sorted(self.student_ids())) if plan]
+
+    def export(self, directory: str) -> int:
+        """
+        Write every student's latest plan in the per-student file layout
+
+        Returns:
+            Number of students exported
+        """
+        plans = self.latest_plans()
+        for plan in plans:
+            write_plan_files(directory, plan)
+        return len(plans)
+
+    def flush(self) -> None:
+        """Persist buffered writes"""
+
+    def close(self) -> None:
+        self.flush()
+
+
+class FilePlanStore(PlanStore):
+    """The original layout: one Markdown and one JSON file per student, latest plan only"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.location = directory
+
+    def put(self, plan: StoredPlan) -> None:
+        write_plan_files(self.directory, plan)
+
+    def latest(self, student_id: str) -> Optional[StoredPlan]:
+        response_file = Path(self.directory) / f"response_{student_id}.json"
+        try:
+            with open(response_file, 'r', encoding='utf-8') as f:
+                result = json.load(f)
+        except FileNotFoundError:
+            return None
+        return StoredPlan(student_id, "", response_file.stat().st_mtime, result)
+
+    def history(self, student_id: str, limit: int = 10) -> List[StoredPlan]:
+        plan = self.latest(student_id)
+        return [plan] if plan and limit > 0 else []
+
+    def student_ids(self) -> Set[str]:
+        return {
+            path.name[len("response_"):-len(".json")]
+            for path in Path(self.directory).glob("response_*.json")
+        }
+
+    def _cache_path(self, fingerprint: str) -> Path:
+        # Fanned out by the first two characters so no directory grows to a whole faculty
+        return Path(self.directory) / ".plan_cache" / fingerprint[:2] / f"{fingerprint}.json"
+
+    def cached_result(self, fingerprint: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._cache_path(fingerprint), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"⚠️  Ignoring unreadable cached plan {fingerprint[:12]}: {e}")
+            return None
+
+    def cache_result(self, fingerprint: str, result: Dict[str, Any]) -> None:
+        path = self._cache_path(fingerprint)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_suffix(".json.tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False)
+        os.replace(temp_path, path)
+
+
+class SQLitePlanStore(PlanStore):
+    """
+    All plans in one SQLite file, indexed by (student_id, generated_at)
+
+    Writes (plans and plan cache entries) are buffered and committed
+    together once `batch_size` rows are pending or the oldest has waited
+    `flush_interval` seconds; reads flush first, so a store always sees its
+    own writes.
+    """
+
+    def __init__(self, path: str, batch_size: int = 200, flush_interval: float = 2.0):
+        """
+        Open (or create) a store
+
+        Args:
+            path: SQLite file
+            batch_size: Plans committed per transaction
+            flush_interval: Longest a buffered plan waits for its commit (seconds)
+        """
+        self.path = path
+        self.location = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._pending: List[Tuple[str, str, float, str]] = []
+        self._pending_cache: Dict[str, Tuple[str, str, float]] = {}
+        self._pending_since = 0.0
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS plans ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " student_id TEXT NOT NULL,"
+            " student_name TEXT NOT NULL,"
+            " generated_at REAL NOT NULL,"
+            " result TEXT NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS plans_student_time ON plans (student_id, generated_at)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS plan_cache ("
+            " fingerprint TEXT PRIMARY KEY,"
+            " result TEXT NOT NULL,"
+            " stored_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def put(self, plan: StoredPlan) -> None:
+        row = (plan.student_id, plan.student_name, plan.generated_at, json.dumps(plan.result, ensure_ascii=False))
+        with self._lock:
+            self._buffer_locked()
+            self._pending.append(row)
+            self._maybe_flush_locked()
+
+    def cache_result(self, fingerprint: str, result: Dict[str, Any]) -> None:
+        row = (fingerprint, json.dumps(result, ensure_ascii=False), time.time())
+        with self._lock:
+            self._buffer_locked()
+            self._pending_cache[fingerprint] = row
+            self._maybe_flush_locked()
+
+    def _buffer_locked(self) -> None:
+        if not self._pending and not self._pending_cache:
+            self._pending_since = time.monotonic()
+
+    def _maybe_flush_locked(self) -> None:
+        pending = len(self._pending) + len(self._pending_cache)
+        if pending >= self.batch_size or time.monotonic() - self._pending_since >= self.flush_interval:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if not self._pending and not self._pending_cache:
+            return
+        if self._pending:
+            self._conn.executemany(
+                "INSERT INTO plans (student_id, student_name, generated_at, result) VALUES (?, ?, ?, ?)",
+                self._pending
+            )
+        if self._pending_cache:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO plan_cache (fingerprint, result, stored_at) VALUES (?, ?, ?)",
+                list(self._pending_cache.values())
+            )
+        self._conn.commit()
+        self._pending = []
+        self._pending_cache = {}
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def _query(self, sql: str, params: tuple = ()) -> List[tuple]:
+        with self._lock:
+            self._flush_locked()
+            return self._conn.execute(sql, params).fetchall()
+
+    @staticmethod
+    def _plan(row: tuple) -> StoredPlan:
+        return StoredPlan(row[0], row[1], row[2], json.loads(row[3]))
+
+    def latest(self, student_id: str) -> Optional[StoredPlan]:
+        rows = self._query(
+            "SELECT student_id, student_name, generated_at, result FROM plans"
+            " WHERE student_id = ? ORDER BY generated_at DESC, id DESC LIMIT 1",
+            (student_id,)
+        )
+        return self._plan(rows[0]) if rows else None
+
+    def history(self, student_id: str, limit: int = 10) -> List[StoredPlan]:
+        rows = self._query(
+            "SELECT student_id, student_name, generated_at, result FROM plans"
+            " WHERE student_id = ? ORDER BY generated_at DESC, id DESC LIMIT ?",
+            (student_id, limit)
+        )
+        return [self._plan(row) for row in rows]
+
+    def student_ids(self) -> Set[str]:
+        return {row[0] for row in self._query("SELECT DISTINCT student_id FROM plans")}
+
+    def cached_result(self, fingerprint: str) -> Optional[Dict[str, Any]]:
+        rows = self._query("SELECT result FROM plan_cache WHERE fingerprint = ?", (fingerprint,))
+        return json.loads(rows[0][0]) if rows else None
+
+    def latest_plans(self) -> List[StoredPlan]:
+        # SQLite takes the bare columns of a MAX() aggregate from the row holding the maximum
+        rows = self._query(
+            "SELECT student_id, student_name, MAX(generated_at), result FROM plans"
+            " GROUP BY student_id ORDER BY student_id"
+        )
+        return [self._plan(row) for row in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_locked()
+            self._conn.close()
+
+
+# Backend name -> factory taking the output directory
+PLAN_STORE_BACKENDS: Dict[str, Callable[[str], PlanStore]] = {
+    "sqlite": lambda output_dir: SQLitePlanStore(os.path.join(output_dir, "plans.db")),
+    "files": FilePlanStore,
+}
+
+_stores: Dict[Tuple[str, str], PlanStore] = {}
+_stores_lock = threading.Lock()
+
+
+def register_plan_store(name: str, factory: Callable[[str], PlanStore]) -> None:
+    """Make a custom backend selectable through PLANNER_PLAN_STORE"""
+    PLAN_STORE_BACKENDS[name] = factory
+
+
+def plan_store_for(output_dir: str, backend: Optional[str] = None) -> PlanStore:
+    """
+    Shared plan store for an output directory
+
+    Args:
+        output_dir: Directory the store lives in (plans.db for SQLite)
+        backend: Backend name (env PLANNER_PLAN_STORE, default "sqlite")
+
+    Raises:
+        ValueError: For an unknown backend
+    """
+    backend = (backend or os.getenv("PLANNER_PLAN_STORE", "sqlite")).lower()
+    if backend not in PLAN_STORE_BACKENDS:
+        raise ValueError(f"Unknown plan store '{backend}' (expected one of {', '.join(PLAN_STORE_BACKENDS)})")
+
+    key = (backend, os.path.abspath(output_dir))
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            if not _stores:
+                # Commit whatever is still buffered when the process exits
+                atexit.register(close_plan_stores)
+            store = PLAN_STORE_BACKENDS[backend](output_dir)
+            _stores[key] = store
+    return store
+
+
+def close_plan_stores() -> None:
+    """Flush and close every store opened through plan_store_for"""
+    with _stores_lock:
+        stores = list(_stores.values())
+        _stores.clear()
+    for store in stores:
+        store.close()
@@ -0,0 +1,271 @@
+"""
+Response Cache for LLM Completions
+In-memory LRU/TTL cache with an optional SQLite tier that survives restarts
+"""
+
+import os
+import copy
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Tuple
+
+
+def make_cache_key(
+    model: str,
+    messages: List[Dict[str, Any]],
+    temperature: float,
+    max_tokens: int,
+    response_format: Optional[Dict[str, Any]] = None
+) -> str:
+    """
+    Build a stable cache key for a chat completion request
+
+    Messages are normalized to role + whitespace-collapsed content so that
+    cosmetic differences (extra keys, trailing spaces) still hit the cache.
+    """
+    normalized = [
+        {
+            "role": message.get("role", ""),
+            "content": " ".join(str(message.get("content", "")).split())
+        }
+        for message in messages
+    ]
+    request = {
+        "model": model,
+        "messages": normalized,
+        "temperature": round(float(temperature), 3),
+        "max_tokens": max_tokens
+    }
+    if response_format:
+        # Only added when set, so keys of plain requests stay the same
+        request["response_format"] = response_format
+    payload = json.dumps(request, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LRUTTLCache:
+    """Thread-safe in-memory LRU cache whose entries expire after a TTL"""
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 3600):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at < time.time():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """Store a value, evicting the least recently used entry when full"""
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCacheTier:
+    """Persistent cache tier backed by a single SQLite file"""
+
+    def __init__(self, path: str, ttl_seconds: float = 86400):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " expires_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] < time.time():
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        data = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, data, time.time() + ttl)
+            )
+            self._conn.commit()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def purge_expired(self) -> int:
+        """Delete expired rows and return how many were removed"""
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM llm_cache WHERE expires_at < ?", (time.time(),))
+            self._conn.commit()
+            return cursor.rowcount
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class CompletionCache:
+    """
+    Two-tier cache for chat completion responses
+
+    Lookups go memory -> disk; disk hits are promoted to memory. Requests
+    sampled above `max_temperature` bypass the cache, since callers asking
+    for high-entropy output expect a fresh answer each time.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 3600,
+        disk_path: Optional[str] = None,
+        disk_ttl_seconds: float = 86400,
+        max_temperature: float = 1.0
+    ):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries: Memory tier capacity (LRU eviction)
+            ttl_seconds: Memory tier time-to-live
+            disk_path: SQLite file for the persistent tier (None disables it)
+            disk_ttl_seconds: Disk tier time-to-live
+            max_temperature: Requests with a higher temperature are never cached
+        """
+        self.memory = LRUTTLCache(max_entries, ttl_seconds)
+        self.disk = SQLiteCacheTier(disk_path, disk_ttl_seconds) if disk_path else None
+        self.max_temperature = max_temperature
+
+        self._stats_lock = threading.Lock()
+        self._stats = {"hits": 0, "memory_hits": 0, "disk_hits": 0, "misses": 0, "bypassed": 0, "stores": 0}
+
+    def _count(self, *names: str) -> None:
+        with self._stats_lock:
+            for name in names:
+                self._stats[name] += 1
+
+    def is_cacheable(self, temperature: float, stream: bool = False) -> bool:
+        """Apply the bypass rules; bypassed requests are counted"""
+        if stream or temperature > self.max_temperature:
+            self._count("bypassed")
+            return False
+        return True
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        value = self.memory.get(key)
+        if value is not None:
+            self._count("hits", "memory_hits")
+            return copy.deepcopy(value)
+
+        if self.disk is not None:
+            value = self.disk.get(key)
+            if value is not None:
+                self.memory.set(key, copy.deepcopy(value))
+                self._count("hits", "disk_hits")
+                return value
+
+        self._count("misses")
+        return None
+
+    def set(self, key: str, response: Dict[str, Any]) -> None:
+        """Store a successful response (error responses are never cached)"""
+        if "error" in response or not response.get("choices"):
+            return
+
+        self.memory.set(key, copy.deepcopy(response))
+        if self.disk is not None:
+            self.disk.set(key, response)
+        self._count("stores")
+
+    def clear(self) -> None:
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters plus current memory size and hit rate"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        stats["memory_entries"] = len(self.memory)
+        return stats
+
+
+_default_cache: Optional[CompletionCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache() -> Optional[CompletionCache]:
+    """
+    Process-wide cache configured from environment variables
+
+    LLM_CACHE=false disables caching; LLM_CACHE_PATH enables the SQLite tier.
+    """
+    global _default_cache
+
+    if os.getenv("LLM_CACHE", "true").lower() in ("0", "false", "no", "off"):
+        return None
+
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = CompletionCache(
+                max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1024")),
+                ttl_seconds=float(os.getenv("LLM_CACHE_TTL", "3600")),
+                disk_path=os.getenv("LLM_CACHE_PATH") or None,
+                disk_ttl_seconds=float(os.getenv("LLM_CACHE_DISK_TTL", "86400")),
+                max_temperature=float(os.getenv("LLM_CACHE_MAX_TEMPERATURE", "1.0"))
+            )
+    return _default_cache
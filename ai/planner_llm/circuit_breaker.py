@@ -0,0 +1,176 @@
+"""
+Circuit Breaker for LLM Providers
+Fails fast while a provider's recent error rate is above a threshold
+"""
+
+import os
+import time
+import threading
+from collections import deque
+from typing import Deque, Dict, Any, Optional
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a provider whose circuit is open"""
+
+
+class CircuitBreaker:
+    """
+    Closed -> open -> half-open circuit breaker
+
+    - closed: calls pass; outcomes go into a rolling window. Once the window
+      holds `min_requests` outcomes and the failure ratio reaches
+      `error_threshold`, the circuit opens.
+    - open: calls fail immediately for `reset_timeout` seconds.
+    - half-open: up to `half_open_max_calls` probes pass; a success closes
+      the circuit, a failure re-opens it. A probe that ends without an
+      outcome (cancelled, unexpected error) must give its slot back with
+      release(); one still unresolved after `probe_timeout` seconds is
+      treated as abandoned and the circuit re-opens.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        error_threshold: Optional[float] = None,
+        min_requests: Optional[int] = None,
+        window: int = 20,
+        reset_timeout: Optional[float] = None,
+        half_open_max_calls: int = 1,
+        probe_timeout: Optional[float] = None
+    ):
+        """
+        Initialize the breaker
+
+        Args:
+            name: Provider label used in messages
+            error_threshold: Failure ratio that opens the circuit (env LLM_BREAKER_ERROR_RATE)
+            min_requests: Outcomes needed before the ratio is trusted (env LLM_BREAKER_MIN_REQUESTS)
+            window: Number of recent outcomes considered
+            reset_timeout: Seconds to stay open before probing (env LLM_BREAKER_RESET_TIMEOUT)
+            half_open_max_calls: Concurrent probes allowed while half-open
+            probe_timeout: Seconds a half-open probe may stay unresolved (env LLM_BREAKER_PROBE_TIMEOUT)
+        """
+        self.name = name
+        self.error_threshold = error_threshold if error_threshold is not None else float(os.getenv("LLM_BREAKER_ERROR_RATE", "0.5"))
+        self.min_requests = min_requests if min_requests is not None else int(os.getenv("LLM_BREAKER_MIN_REQUESTS", "5"))
+        self.reset_timeout = reset_timeout if reset_timeout is not None else float(os.getenv("LLM_BREAKER_RESET_TIMEOUT", "30"))
+        self.half_open_max_calls = half_open_max_calls
+        self.probe_timeout = probe_timeout if probe_timeout is not None else float(os.getenv("LLM_BREAKER_PROBE_TIMEOUT", "120"))
+
+        self._outcomes: Deque[bool] = deque(maxlen=window)
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        self._probe_started_at = 0.0
+        # Bumped on every half-open period so stale probe tokens are ignored
+        self._half_open_generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def _maybe_half_open(self) -> None:
+        now = time.monotonic()
+        if self._state == self.OPEN and now - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._half_open_calls = 0
+            self._half_open_generation += 1
+        elif (
+            self._state == self.HALF_OPEN
+            and self._half_open_calls
+            and now - self._probe_started_at >= self.probe_timeout
+        ):
+            print(f"⏱️  Probe for {self.name} never finished")
+            self._trip()
+
+    def before_call(self) -> Optional[int]:
+        """
+        Admit or reject a call
+
+        Returns:
+            A probe token when the call was admitted as a half-open probe
+            (pass it to release() if the call ends without an outcome), else None
+
+        Raises:
+            CircuitOpenError: While the circuit is open (or probes are in use)
+        """
+        with self._lock:
+            self._maybe_half_open()
+
+            if self._state == self.OPEN:
+                retry_in = self.reset_timeout - (time.monotonic() - self._opened_at)
+                raise CircuitOpenError(f"Circuit open for {self.name} (retry in {retry_in:.0f}s)")
+
+            if self._state == self.HALF_OPEN:
+                if self._half_open_calls >= self.half_open_max_calls:
+                    raise CircuitOpenError(f"Circuit half-open for {self.name}, probe in progress")
+                self._half_open_calls += 1
+                self._probe_started_at = time.monotonic()
+                return self._half_open_generation
+            return None
+
+    def release(self, probe: Optional[int]) -> None:
+        """Give back a probe slot whose call ended without a success or failure"""
+        if probe is None:
+            return
+        with self._lock:
+            if self._state == self.HALF_OPEN and probe == self._half_open_generation and self._half_open_calls:
+                self._half_open_calls -= 1
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                print(f"🟢 Circuit closed for {self.name}")
+                self._state = self.CLOSED
+                self._outcomes.clear()
+            self._outcomes.append(True)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._trip()
+                return
+
+            self._outcomes.append(False)
+            if len(self._outcomes) >= self.min_requests:
+                failures = self._outcomes.count(False)
+                if failures / len(self._outcomes) >= self.error_threshold:
+                    self._trip()
+
+    def _trip(self) -> None:
+        if self._state != self.OPEN:
+            print(f"🔴 Circuit opened for {self.name} ({self.reset_timeout:.0f}s)")
+        self._state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            self._maybe_half_open()
+            return {
+                "state": self._state,
+                "recent_failures": self._outcomes.count(False),
+                "recent_requests": len(self._outcomes),
+            }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(provider_key: str) -> CircuitBreaker:
+    """Shared breaker for a provider endpoint"""
+    with _breakers_lock:
+        breaker = _breakers.get(provider_key)
+        if breaker is None:
+            breaker = CircuitBreaker(provider_key)
+            _breakers[provider_key] = breaker
+    return breaker
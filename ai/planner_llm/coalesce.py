@@ -0,0 +1,100 @@
+"""
+Single-flight Request Coalescing
+Concurrent identical LLM requests share one in-flight provider call
+"""
+
+import copy
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+
+class _Call:
+    """One in-flight blocking call and the result its waiters will share"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent calls with the same key
+
+    The first caller (the leader) performs the call; callers arriving
+    while it is in flight wait and receive a copy of the same result.
+    Nothing is remembered after the call finishes - that is the response
+    cache's job.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self._tasks: Dict[Tuple[asyncio.AbstractEventLoop, str], asyncio.Future] = {}
+        self._stats = {"calls": 0, "coalesced": 0}
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Run `fn` once per key across concurrent threads"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self._stats["calls"] += 1
+            else:
+                self._stats["coalesced"] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result)
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        # Waiters copy concurrently, so the leader must not hand out the shared object
+        return copy.deepcopy(call.result)
+
+    async def ado(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await `factory()` once per key across concurrent tasks
+
+        The call runs in its own task, so a cancelled caller (e.g. a client
+        that disconnected) does not cancel the request for everyone else.
+        """
+        loop = asyncio.get_running_loop()
+        task_key = (loop, key)
+
+        with self._lock:
+            task = self._tasks.get(task_key)
+            leader = task is None
+            if leader:
+                task = asyncio.ensure_future(factory())
+                self._tasks[task_key] = task
+                task.add_done_callback(lambda _: self._tasks.pop(task_key, None))
+                self._stats["calls"] += 1
+            else:
+                self._stats["coalesced"] += 1
+
+        result = await asyncio.shield(task)
+        return result if leader else copy.deepcopy(result)
+
+    def stats(self) -> Dict[str, int]:
+        """Provider calls made and requests that piggybacked on one"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["in_flight"] = len(self._calls) + len(self._tasks)
+        return stats
+
+
+# Shared by every client so identical requests coalesce process-wide
+default_single_flight = SingleFlight()
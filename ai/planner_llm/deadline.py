@@ -0,0 +1,65 @@
+"""
+Request Deadline Propagation
+Carries the caller's end-to-end time budget down to individual LLM calls
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+
+class DeadlineExceeded(Exception):
+    """The caller's time budget ran out before the LLM call could finish"""
+
+
+# Absolute deadline on the time.monotonic() clock; None means unbounded.
+# Context variables follow asyncio tasks and copy_context() threads, so a
+# deadline set by request middleware reaches chat_completion unchanged.
+_deadline: ContextVar[Optional[float]] = ContextVar("llm_deadline", default=None)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left in the current budget (None when no deadline is set)"""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def bounded_timeout(timeout: float) -> float:
+    """
+    Clamp a per-call timeout to the remaining budget
+
+    Raises:
+        DeadlineExceeded: If the budget is already spent
+    """
+    left = remaining()
+    if left is None:
+        return timeout
+    if left <= 0:
+        raise DeadlineExceeded("Request deadline exceeded")
+    return min(timeout, left)
+
+
+@contextmanager
+def deadline_scope(seconds: Optional[float]) -> Iterator[None]:
+    """
+    Run a block with at most `seconds` of budget
+
+    Nested scopes can only shorten an outer deadline, never extend it.
+    """
+    if seconds is None:
+        yield
+        return
+
+    new_deadline = time.monotonic() + seconds
+    current = _deadline.get()
+    if current is not None:
+        new_deadline = min(current, new_deadline)
+
+    token = _deadline.set(new_deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
@@ -0,0 +1,415 @@
+"""
+Structured Study Plan Output
+JSON schema, typed plan model and a streaming parser for JSON study plans
+
+In JSON mode the model returns days -> time slots -> task IDs instead of
+free Markdown, so clients can render and act on the schedule directly.
+StudyPlanStreamParser emits each day as soon as its JSON object is
+complete, so the first day can be shown while later days are still being
+generated.
+"""
+
+import re
+import json
+import bisect
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+# OpenAI-compatible JSON mode; DeepSeek and Groq accept json_object but not
+# every model supports strict json_schema, so the schema goes in the prompt
+JSON_RESPONSE_FORMAT = {"type": "json_object"}
+
+STUDY_PLAN_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "required": ["summary", "days"],
+    "properties": {
+        "summary": {"type": "string"},
+        "days": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["date", "slots"],
+                "properties": {
+                    "date": {"type": "string", "description": "YYYY-MM-DD"},
+                    "day": {"type": "string", "description": "Weekday name"},
+                    "focus": {"type": "string"},
+                    "slots": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "required": ["start", "end", "activity"],
+                            "properties": {
+                                "start": {"type": "string", "description": "HH:MM"},
+                                "end": {"type": "string", "description": "HH:MM"},
+                                "task_ids": {"type": "array", "items": {"type": "string"}},
+                                "activity": {"type": "string"},
+                                "notes": {"type": "string"}
+                            }
+                        }
+                    }
+                }
+            }
+        },
+        "tips": {"type": "array", "items": {"type": "string"}},
+        "risk_alerts": {"type": "array", "items": {"type": "string"}}
+    }
+}
+
+JSON_OUTPUT_INSTRUCTIONS = """
+## Output Format (overrides the Markdown format above)
+Reply with one JSON object only, no Markdown and no code fences, matching this JSON schema:
+{schema}
+
+- List "days" in date order, starting today ({today}); put each day's most important slot first
+- Every slot must lie inside the student's availability; breaks are slots with an empty "task_ids"
+- "task_ids" may only contain these IDs: {task_ids}"""
+
+_TIME_RE = re.compile(r"^\d{1,2}:\d{2}$")
+
+
+class PlanFormatError(ValueError):
+    """Model output that is not a valid study plan"""
+
+
+def _require_str(data: Dict[str, Any], field: str, where: str) -> str:
+    value = data.get(field)
+    if not isinstance(value, str) or not value.strip():
+        raise PlanFormatError(f"{where}: '{field}' must be a non-empty string")
+    return value.strip()
+
+
+class PlanSlot:
+    """One scheduled block of time"""
+
+    def __init__(self, start: str, end: str, activity: str, task_ids: Optional[List[str]] = None, notes: str = ""):
+        self.start = start
+        self.end = end
+        self.activity = activity
+        self.task_ids = task_ids or []
+        self.notes = notes
+
+    @classmethod
+    def from_dict(cls, data: Any, where: str = "slot", known_task_ids: Optional[Set[str]] = None) -> "PlanSlot":
+        if not isinstance(data, dict):
+            raise PlanFormatError(f"{where} must be an object")
+        start = _require_str(data, "start", where)
+        end = _require_str(data, "end", where)
+        if not _TIME_RE.match(start) or not _TIME_RE.match(end):
+            raise PlanFormatError(f"{where}: times must be HH:MM, got '{start}'-'{end}'")
+
+        task_ids = data.get("task_ids") or []
+        if not isinstance(task_ids, list):
+            raise PlanFormatError(f"{where}: 'task_ids' must be a list")
+        task_ids = [str(task_id) for task_id in task_ids]
+        if known_task_ids is not None:
+            unknown = [task_id for task_id in task_ids if task_id not in known_task_ids]
+            if unknown:
+                # The model invented IDs; keep the slot but drop what it can't link to
+                print(f"⚠️  Dropping unknown task IDs in {where}: {', '.join(unknown)}")
+                task_ids = [task_id for task_id in task_ids if task_id in known_task_ids]
+
+        return cls(start, end, _require_str(data, "activity", where), task_ids, str(data.get("notes") or ""))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "start": self.start,
+            "end": self.end,
+            "task_ids": list(self.task_ids),
+            "activity": self.activity,
+            "notes": self.notes
+        }
+
+
+class PlanDay:
+    """A day's schedule"""
+
+    def __init__(self, date: str, slots: List[PlanSlot], day: str = "", focus: str = ""):
+        self.date = date
+        self.slots = slots
+        self.day = day
+        self.focus = focus
+
+    @classmethod
+    def from_dict(cls, data: Any, where: str = "day", known_task_ids: Optional[Set[str]] = None) -> "PlanDay":
+        if not isinstance(data, dict):
+            raise PlanFormatError(f"{where} must be an object")
+        date = _require_str(data, "date", where)
+        slots = data.get("slots")
+        if not isinstance(slots, list):
+            raise PlanFormatError(f"{where}: 'slots' must be a list")
+        return cls(
+            date,
+            [PlanSlot.from_dict(slot, f"{where} ({date}) slot {i + 1}", known_task_ids) for i, slot in enumerate(slots)],
+            str(data.get("day") or ""),
+            str(data.get("focus") or "")
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "date": self.date,
+            "day": self.day,
+            "focus": self.focus,
+            "slots": [slot.to_dict() for slot in self.slots]
+        }
+
+    def to_markdown(self, task_titles: Optional[Dict[str, str]] = None) -> str:
+        title = f"{self.day} {self.date}".strip() if self.day else self.date
+        lines = [f"### {title}" + (f" - {self.focus}" if self.focus else "")]
+        for slot in self.slots:
+            line = f"- {slot.start}-{slot.end}: {slot.activity}"
+            if slot.task_ids and task_titles:
+                linked = [task_titles[task_id] for task_id in slot.task_ids if task_id in task_titles]
+                if linked and not all(title in slot.activity for title in linked):
+                    line += f" ({'; '.join(linked)})"
+            if slot.notes:
+                line += f" - {slot.notes}"
+            lines.append(line)
+        return "\n".join(lines)
+
+
+class StudyPlan:
+    """A complete structured study plan"""
+
+    def __init__(
+        self,
+        summary: str,
+        days: List[PlanDay],
+        tips: Optional[List[str]] = None,
+        risk_alerts: Optional[List[str]] = None
+    ):
+        self.summary = summary
+        self.days = days
+        self.tips = tips or []
+        self.risk_alerts = risk_alerts or []
+
+    @classmethod
+    def from_dict(cls, data: Any, known_task_ids: Optional[Iterable[str]] = None) -> "StudyPlan":
+        """
+        Validate and build a plan from decoded JSON
+
+        Args:
+            data: Decoded model output
+            known_task_ids: Task IDs slots may reference (others are dropped)
+
+        Raises:
+            PlanFormatError: If required fields are missing or malformed
+        """
+        if not isinstance(data, dict):
+            raise PlanFormatError("plan must be a JSON object")
+        known = set(known_task_ids) if known_task_ids is not None else None
+        days = data.get("days")
+        if not isinstance(days, list):
+            raise PlanFormatError("plan: 'days' must be a list")
+        return cls(
+            str(data.get("summary") or ""),
+            [PlanDay.from_dict(day, f"day {i + 1}", known) for i, day in enumerate(days)],
+            [str(tip) for tip in data.get("tips") or []],
+            [str(alert) for alert in data.get("risk_alerts") or []]
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "summary": self.summary,
+            "days": [day.to_dict() for day in self.days],
+            "tips": list(self.tips),
+            "risk_alerts": list(self.risk_alerts)
+        }
+
+    def to_markdown(self, task_titles: Optional[Dict[str, str]] = None) -> str:
+        """Markdown rendering, so consumers of the Markdown plan keep working"""
+        sections = ["# 📅 Personalized Study Plan"]
+        if self.summary:
+            sections.append(self.summary)
+        if self.days:
+            sections.append("## 🗓️ Schedule\n\n" + "\n\n".join(day.to_markdown(task_titles) for day in self.days))
+        if self.risk_alerts:
+            sections.append("## ⚠️ Risk Alerts\n\n" + "\n".join(f"- {alert}" for alert in self.risk_alerts))
+        if self.tips:
+            sections.append("## 💡 Study Tips\n\n" + "\n".join(f"{i}. {tip}" for i, tip in enumerate(self.tips, 1)))
+        return "\n\n".join(sections) + "\n"
+
+
+def json_output_instructions(student_data: Dict[str, Any], today: str) -> str:
+    """Prompt block asking for a JSON plan that only references this student's tasks"""
+    task_ids = ", ".join(task["task_id"] for task in student_data["tasks"]) or "(none)"
+    return JSON_OUTPUT_INSTRUCTIONS.format(
+        schema=json.dumps(STUDY_PLAN_SCHEMA, separators=(",", ":")),
+        today=today,
+        task_ids=task_ids
+    )
+
+
+def _json_object_text(content: str) -> str:
+    """The outermost {...} of a reply, tolerating code fences or stray prose around it"""
+    start = content.find("{")
+    end = content.rfind("}")
+    if start == -1 or end < start:
+        raise PlanFormatError("no JSON object in model output")
+    return content[start:end + 1]
+
+
+def parse_study_plan(content: str, known_task_ids: Optional[Iterable[str]] = None) -> StudyPlan:
+    """
+    Parse a complete JSON study plan reply
+
+    Raises:
+        PlanFormatError: If the reply is not valid plan JSON
+    """
+    try:
+        data = json.loads(_json_object_text(content))
+    except json.JSONDecodeError as e:
+        raise PlanFormatError(f"invalid JSON: {e}") from e
+    return StudyPlan.from_dict(data, known_task_ids)
+
+
+def task_titles(student_data: Dict[str, Any]) -> Dict[str, str]:
+    return {task["task_id"]: task["task_title"] for task in student_data.get("tasks") or []}
+
+
+def attach_structured_plan(result: Dict[str, Any], student_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Turn a successful JSON-mode study plan result into a structured one
+
+    Adds "plan" (the validated plan as a dict) and replaces "study_plan"
+    with its Markdown rendering. If the reply cannot be parsed the raw
+    text is kept, "plan" is None and "plan_error" says why.
+    """
+    if not result.get("success"):
+        return result
+    titles = task_titles(student_data)
+    try:
+        plan = parse_study_plan(result["study_plan"], titles.keys())
+    except PlanFormatError as e:
+        print(f"⚠️  Study plan is not valid JSON, keeping raw text: {e}")
+        result["plan"] = None
+        result["plan_error"] = str(e)
+        return result
+
+    result["plan"] = plan.to_dict()
+    result["study_plan"] = plan.to_markdown(titles)
+    return result
+
+
+class StudyPlanStreamParser:
+    """
+    Incremental parser for a streamed JSON study plan
+
+    feed() scans only the newly arrived text, tracking strings and nesting,
+    and returns each element of the top-level "days" array as a PlanDay as
+    soon as its closing brace arrives. close() parses and validates the
+    whole plan.
+
+    Deltas are kept as a list of chunks rather than one growing string, and
+    only the chunks under a finished key or day are joined, so a stream
+    costs time linear in its length.
+    """
+
+    def __init__(self, known_task_ids: Optional[Iterable[str]] = None):
+        self.known_task_ids = set(known_task_ids) if known_task_ids is not None else None
+        self.days_emitted = 0
+        self._chunks: List[str] = []
+        # Absolute offset of each chunk's first character
+        self._offsets: List[int] = []
+        self._pos = 0
+        self._started = False
+        self._in_string = False
+        self._escaped = False
+        self._string_start = 0
+        # One frame per open container: [bracket, key it is stored under, last key seen, expecting a key]
+        self._stack: List[List[Any]] = []
+        self._day_start: Optional[int] = None
+
+    def feed(self, delta: str) -> List[PlanDay]:
+        """
+        Consume a text delta
+
+        Returns:
+            Days completed by this delta, in order
+
+        Raises:
+            PlanFormatError: If a completed day is malformed
+        """
+        if not delta:
+            return []
+        self._chunks.append(delta)
+        self._offsets.append(self._pos)
+        days: List[PlanDay] = []
+
+        for pos, char in enumerate(delta, self._pos):
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    frame = self._stack[-1] if self._stack else None
+                    if frame and frame[0] == "{" and frame[3]:
+                        frame[2] = json.loads(self._slice(self._string_start, pos + 1))
+                continue
+
+            if not self._started:
+                # Skip code fences or prose before the object
+                if char != "{":
+                    continue
+                self._started = True
+
+            if char == '"':
+                self._in_string = True
+                self._string_start = pos
+            elif char in "{[":
+                parent = self._stack[-1] if self._stack else None
+                key = parent[2] if parent and parent[0] == "{" else None
+                if char == "{" and self._is_days_array(parent):
+                    self._day_start = pos
+                self._stack.append([char, key, None, char == "{"])
+            elif char in "}]":
+                if not self._stack:
+                    continue
+                self._stack.pop()
+                if char == "}" and self._day_start is not None and self._is_days_array(self._stack[-1] if self._stack else None):
+                    days.append(self._decode_day(self._slice(self._day_start, pos + 1)))
+                    self._day_start = None
+            elif char == "," and self._stack and self._stack[-1][0] == "{":
+                self._stack[-1][3] = True
+            elif char == ":" and self._stack and self._stack[-1][0] == "{":
+                self._stack[-1][3] = False
+
+        self._pos += len(delta)
+        return days
+
+    def _slice(self, start: int, end: int) -> str:
+        """Fed text between absolute offsets, joining only the chunks that overlap it"""
+        first = bisect.bisect_right(self._offsets, start) - 1
+        last = bisect.bisect_left(self._offsets, end)
+        joined = "".join(self._chunks[first:last])
+        base = self._offsets[first]
+        return joined[start - base:end - base]
+
+    def _is_days_array(self, frame: Optional[List[Any]]) -> bool:
+        """Whether `frame` is the top-level plan's "days" array"""
+        return frame is not None and frame[0] == "[" and frame[1] == "days" and len(self._stack) == 2
+
+    def _decode_day(self, raw: str) -> PlanDay:
+        self.days_emitted += 1
+        try:
+            data = json.loads(raw)
+        except json.JSONDecodeError as e:
+            raise PlanFormatError(f"day {self.days_emitted}: invalid JSON: {e}") from e
+        return PlanDay.from_dict(data, f"day {self.days_emitted}", self.known_task_ids)
+
+    @property
+    def text(self) -> str:
+        """Everything fed so far"""
+        if len(self._chunks) > 1:
+            self._chunks = ["".join(self._chunks)]
+            self._offsets = [0]
+        return self._chunks[0] if self._chunks else ""
+
+    def close(self) -> StudyPlan:
+        """
+        Parse the complete plan once the stream has ended
+
+        Raises:
+            PlanFormatError: If the full reply is not a valid plan
+        """
+        return parse_study_plan(self.text, self.known_task_ids)
@@ -4,21 +4,98 @@ Handles communication with DeepSeek R1 API for generating personalized study pla
 """
 
 import os
+import re
 import json
-from typing import Dict, Any, Optional
-import requests
-from requests.exceptions import RequestException, Timeout
+import time
+import asyncio
+from typing import Dict, Any, Optional, Iterator, AsyncIterator
+import httpx
+
+from planner_llm.transport import (
+    LLMTransport,
+    get_transport,
+    DEFAULT_MAX_CONNECTIONS,
+    DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+    DEFAULT_KEEPALIVE_EXPIRY,
+)
+from planner_llm.cache import CompletionCache, get_default_cache, make_cache_key
+from planner_llm.rate_limit import ProviderRateLimiter, get_rate_limiter, estimate_request_tokens
+from planner_llm.retry import RetryPolicy, parse_retry_after
+from planner_llm.coalesce import SingleFlight, default_single_flight
+from planner_llm.circuit_breaker import CircuitOpenError, get_circuit_breaker
+from planner_llm import deadline, metrics
+from planner_llm.deadline import DeadlineExceeded, bounded_timeout
+
+
+def _env_float(name: str) -> Optional[float]:
+    """Read an optional numeric environment variable"""
+    value = os.getenv(name)
+    return float(value) if value else None
+
+
+class LLMClientError(Exception):
+    """Raised by streaming calls, which cannot return an error dictionary"""
+
+
+# Mock-mode answer to JSON (structured) study plan requests; task IDs match data/sample_student.json
+MOCK_JSON_PLAN = {
+    "summary": "Finish the Data Mining quiz prep first, then split the remaining 80% of the AI assignment across two evenings.",
+    "days": [
+        {
+            "date": "2026-02-01",
+            "day": "Sunday",
+            "focus": "Quiz prep and assignment start",
+            "slots": [
+                {"start": "18:00", "end": "20:00", "task_ids": ["T-DS-02"], "activity": "Review classification algorithms", "notes": "Practice problems at the end"},
+                {"start": "20:00", "end": "20:10", "task_ids": [], "activity": "Break", "notes": ""},
+                {"start": "20:10", "end": "22:00", "task_ids": ["T-AI-01"], "activity": "Implement search algorithms", "notes": ""}
+            ]
+        },
+        {
+            "date": "2026-02-02",
+            "day": "Monday",
+            "focus": "AI assignment",
+            "slots": [
+                {"start": "19:00", "end": "20:50", "task_ids": ["T-AI-01"], "activity": "Complete and test the AI assignment", "notes": ""},
+                {"start": "20:50", "end": "21:00", "task_ids": [], "activity": "Break", "notes": ""},
+                {"start": "21:00", "end": "22:00", "task_ids": ["T-DS-02"], "activity": "Final quiz review", "notes": ""}
+            ]
+        }
+    ],
+    "tips": [
+        "Start with the hardest task when your energy is highest",
+        "Study 50 minutes, then take a 10 minute break",
+        "Set reminders 24h before each deadline"
+    ],
+    "risk_alerts": [
+        "AI401 is high risk (78/100) - needs immediate attention",
+        "Next week has 14 hours of work - start early"
+    ]
+}
 
 
 class DeepSeekLLMClient:
     """Client for DeepSeek R1 LLM API"""
     
+    # Prefix of the <PREFIX>_RPM / <PREFIX>_TPM rate limit env vars
+    ENV_PREFIX = "DEEPSEEK"
+    
     def __init__(
         self,
         api_key: Optional[str] = None,
         api_base_url: Optional[str] = None,
         model: str = "deepseek-reasoner",
-        timeout: int = 60
+        timeout: int = 60,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+        http2: Optional[bool] = None,
+        cache: Optional[CompletionCache] = None,
+        use_cache: bool = True,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        coalesce: bool = True
     ):
         """
         Initialize DeepSeek LLM Client
@@ -28,6 +105,16 @@ class DeepSeekLLMClient:
             api_base_url: API base URL (defaults to DeepSeek's official endpoint)
             model: Model name to use
             timeout: Request timeout in seconds
+            max_connections: Connection pool size shared with other clients of this endpoint
+            max_keepalive_connections: Idle keep-alive connections kept in the pool
+            keepalive_expiry: Seconds before an idle connection is closed
+            http2: Use HTTP/2 (None = auto-detect, needs the 'h2' package)
+            cache: Response cache (defaults to the shared cache configured by LLM_CACHE_*)
+            use_cache: Set False to disable response caching for this client
+            requests_per_minute: Client-side RPM quota (or set <ENV_PREFIX>_RPM)
+            tokens_per_minute: Client-side TPM quota (or set <ENV_PREFIX>_TPM)
+            retry_policy: Backoff settings for 429/5xx/network errors
+            coalesce: Share one provider call among concurrent identical requests
         """
         self.api_key = api_key or os.getenv("DEEPSEEK_API_KEY")
         self.api_base_url = api_base_url or os.getenv(
@@ -35,70 +122,633 @@ class DeepSeekLLMClient:
             "https://api.deepseek.com/v1"
         )
         self.model = model
+        self.provider_name = self.ENV_PREFIX.lower()
         self.timeout = timeout
+        self.transport: LLMTransport = get_transport(
+            self.api_base_url,
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+            http2=http2
+        )
+        self.cache = (cache or get_default_cache()) if use_cache else None
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.single_flight: Optional[SingleFlight] = default_single_flight if coalesce else None
+        self.circuit_breaker = get_circuit_breaker(self.api_base_url)
+        self.rate_limiter: Optional[ProviderRateLimiter] = get_rate_limiter(
+            self.api_base_url,
+            requests_per_minute or _env_float(f"{self.ENV_PREFIX}_RPM"),
+            tokens_per_minute or _env_float(f"{self.ENV_PREFIX}_TPM")
+        )
         
         if not self.api_key:
             print("⚠️  Warning: No API key provided. Set DEEPSEEK_API_KEY environment variable.")
     
+    def _build_request(
+        self,
+        messages: list,
+        temperature: float,
+        max_tokens: int,
+        stream: bool,
+        response_format: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Build URL, headers and JSON payload for a chat completion call"""
+        payload = {
+            "model": self.model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "stream": stream
+        }
+        if response_format:
+            payload["response_format"] = response_format
+        
+        return {
+            "url": f"{self.api_base_url}/chat/completions",
+            "headers": {
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json"
+            },
+            "json": payload,
+            "timeout": self.timeout
+        }
+    
+    def _cache_key(
+        self,
+        messages: list,
+        temperature: float,
+        max_tokens: int,
+        use_cache: bool,
+        response_format: Optional[Dict[str, Any]] = None
+    ) -> Optional[str]:
+        """Cache key for a request, or None when the cache must be bypassed"""
+        if not use_cache or self.cache is None:
+            return None
+        if not self.cache.is_cacheable(temperature):
+            return None
+        return make_cache_key(self.model, messages, temperature, max_tokens, response_format)
+    
+    def _send(self, request: Dict[str, Any], estimated_tokens: int, stream: bool = False) -> httpx.Response:
+        """
+        POST a request through the rate limiter, retrying transient failures
+        
+        Network errors, timeouts, 429s and 5xx responses are retried with
+        jittered exponential backoff, honoring Retry-After. A 429 also pauses
+        the provider's rate limiter so queued callers back off together.
+        Each attempt's timeout is clamped to the caller's remaining deadline,
+        and retries stop once the next backoff would overrun it. A timeout
+        caused by that clamp is the caller's, so it does not count against
+        the provider's circuit breaker.
+        
+        Returns:
+            Successful response (streamed responses must be closed by the caller)
+            
+        Raises:
+            httpx.HTTPError: When retries are exhausted or the error is not retryable
+            CircuitOpenError: When the provider's circuit breaker is open
+            DeadlineExceeded: When the caller's time budget is spent
+        """
+        client = self.transport.client
+        attempt = 0
+        
+        while True:
+            if attempt:
+                metrics.llm_retries.inc(provider=self.provider_name, model=self.model)
+            bounded_timeout(self.timeout)
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(estimated_tokens, max_wait=deadline.remaining())
+            
+            request["timeout"] = timeout = bounded_timeout(self.timeout)
+            probe = self.circuit_breaker.before_call()
+            
+            try:
+                response = client.send(client.build_request("POST", **request), stream=stream)
+            except BaseException as e:
+                if isinstance(e, httpx.TimeoutException) and timeout < self.timeout:
+                    # The caller's budget ran out, not the provider: no failure recorded
+                    self.circuit_breaker.release(probe)
+                    raise DeadlineExceeded("Request deadline exceeded") from e
+                if not isinstance(e, httpx.TransportError):
+                    # Interrupted or unexpected: no verdict on the provider, but free a probe slot
+                    self.circuit_breaker.release(probe)
+                    raise
+                self.circuit_breaker.record_failure()
+                delay = self.retry_policy.backoff(attempt) if self.retry_policy.should_retry_error(attempt) else None
+                if not self._fits_deadline(delay):
+                    raise
+                print(f"🔁 Retrying after error ({e.__class__.__name__}) in {delay:.1f}s")
+                time.sleep(delay)
+                attempt += 1
+                continue
+            
+            self._record_outcome(response)
+            delay = self._retry_delay(response, attempt)
+            limiter_waits = self._pause_rate_limiter(response, delay)
+            if not self._fits_deadline(delay):
+                if response.is_error:
+                    response.close()
+                    response.raise_for_status()
+                return response
+            
+            response.close()
+            if delay:
+                print(f"🔁 Retrying after HTTP {response.status_code} in {delay:.1f}s")
+                if not limiter_waits:
+                    time.sleep(delay)
+            attempt += 1
+    
+    async def _asend(self, request: Dict[str, Any], estimated_tokens: int, stream: bool = False) -> httpx.Response:
+        """
+        Async version of _send
+        
+        Under a deadline the whole attempt (not just each socket read) is
+        cancelled when the budget runs out.
+        """
+        client = self.transport.async_client
+        attempt = 0
+        
+        while True:
+            if attempt:
+                metrics.llm_retries.inc(provider=self.provider_name, model=self.model)
+            bounded_timeout(self.timeout)
+            if self.rate_limiter is not None:
+                await self.rate_limiter.aacquire(estimated_tokens, max_wait=deadline.remaining())
+            
+            request["timeout"] = timeout = bounded_timeout(self.timeout)
+            probe = self.circuit_breaker.before_call()
+            
+            try:
+                response = await asyncio.wait_for(
+                    client.send(client.build_request("POST", **request), stream=stream),
+                    timeout=deadline.remaining()
+                )
+            except BaseException as e:
+                if isinstance(e, asyncio.TimeoutError) or (isinstance(e, httpx.TimeoutException) and timeout < self.timeout):
+                    # The caller's budget ran out, not the provider: no failure recorded
+                    self.circuit_breaker.release(probe)
+                    raise DeadlineExceeded("Request deadline exceeded") from e
+                if not isinstance(e, httpx.TransportError):
+                    # Cancelled (client gone, losing hedge) or unexpected: free a probe slot
+                    self.circuit_breaker.release(probe)
+                    raise
+                self.circuit_breaker.record_failure()
+                delay = self.retry_policy.backoff(attempt) if self.retry_policy.should_retry_error(attempt) else None
+                if not self._fits_deadline(delay):
+                    raise
+                print(f"🔁 Retrying after error ({e.__class__.__name__}) in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            
+            self._record_outcome(response)
+            delay = self._retry_delay(response, attempt)
+            limiter_waits = self._pause_rate_limiter(response, delay)
+            if not self._fits_deadline(delay):
+                if response.is_error:
+                    await response.aclose()
+                    response.raise_for_status()
+                return response
+            
+            await response.aclose()
+            if delay:
+                print(f"🔁 Retrying after HTTP {response.status_code} in {delay:.1f}s")
+                if not limiter_waits:
+                    await asyncio.sleep(delay)
+            attempt += 1
+    
+    @staticmethod
+    def _fits_deadline(delay: Optional[float]) -> bool:
+        """Whether a retry after `delay` seconds is allowed and still within budget"""
+        if delay is None:
+            return False
+        left = deadline.remaining()
+        return left is None or delay < left
+    
+    def _record_outcome(self, response: httpx.Response) -> None:
+        """Feed the circuit breaker; only server errors count against the provider"""
+        if response.status_code >= 500:
+            self.circuit_breaker.record_failure()
+        else:
+            self.circuit_breaker.record_success()
+    
+    def _retry_delay(self, response: httpx.Response, attempt: int) -> Optional[float]:
+        """Seconds to wait before retrying this response, or None to stop"""
+        if not self.retry_policy.should_retry_status(response.status_code, attempt):
+            return None
+        
+        retry_after = parse_retry_after(response.headers.get("retry-after"))
+        return self.retry_policy.backoff(attempt, retry_after)
+    
+    def _pause_rate_limiter(self, response: httpx.Response, delay: Optional[float]) -> bool:
+        """
+        On a 429, make the shared limiter hold everyone back for `delay`
+        
+        Returns:
+            True if the limiter will make the retry wait, so the caller must not sleep too
+        """
+        if delay is None or response.status_code != 429 or self.rate_limiter is None:
+            return False
+        print(f"⏳ Provider rate limit hit, holding requests for {delay:.1f}s")
+        self.rate_limiter.pause(delay)
+        return True
+    
+    def _settle_usage(self, estimated_tokens: int, result: Dict[str, Any]) -> None:
+        """Give unused token reservations back to the rate limiter"""
+        if self.rate_limiter is not None:
+            self.rate_limiter.settle(estimated_tokens, (result.get("usage") or {}).get("total_tokens"))
+    
+    def _observe_call(
+        self,
+        outcome: str,
+        started: float,
+        stream: bool = False,
+        first_token_at: Optional[float] = None,
+        usage: Optional[Dict[str, int]] = None
+    ) -> None:
+        """Record one provider call in the metrics registry"""
+        labels = {"provider": self.provider_name, "model": self.model}
+        metrics.llm_requests.inc(outcome=outcome, **labels)
+        if outcome != "ok":
+            return
+        
+        now = time.monotonic()
+        stream_label = "true" if stream else "false"
+        # A non-streamed answer reaches the caller all at once
+        metrics.llm_time_to_first_token.observe((first_token_at or now) - started, stream=stream_label, **labels)
+        metrics.llm_request_duration.observe(now - started, stream=stream_label, **labels)
+        metrics.record_tokens(self.provider_name, self.model, usage)
+    
+    @staticmethod
+    def _estimated_usage(messages: list, completion_chars: int) -> Dict[str, int]:
+        """Token usage for streams, which arrive without a usage block"""
+        return {
+            "prompt_tokens": estimate_request_tokens(messages, 0),
+            "completion_tokens": completion_chars // 4,
+        }
+    
+    def _flight_key(
+        self,
+        messages: list,
+        temperature: float,
+        max_tokens: int,
+        response_format: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Key under which identical in-flight requests are coalesced"""
+        return f"{self.api_base_url}|{make_cache_key(self.model, messages, temperature, max_tokens, response_format)}"
+    
     def chat_completion(
         self,
         messages: list,
         temperature: float = 0.7,
         max_tokens: int = 4000,
-        stream: bool = False
+        stream: bool = False,
+        use_cache: bool = True,
+        response_format: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """
         Send chat completion request to DeepSeek API
         
+        Blocking facade over the shared connection pool; use
+        achat_completion from async code.
+        
         Args:
             messages: List of message dictionaries with 'role' and 'content'
             temperature: Sampling temperature (0.0 to 1.0)
             max_tokens: Maximum tokens in response
             stream: Whether to stream the response
+            use_cache: Set False to skip the response cache (and coalescing) for this call
+            response_format: Provider response_format, e.g. {"type": "json_object"} for JSON mode
             
         Returns:
             API response dictionary
         """
+        if stream:
+            try:
+                content = "".join(self.stream_chat_completion(messages, temperature, max_tokens, response_format))
+            except LLMClientError as e:
+                return self._error_response(str(e))
+            return self._stream_result(content)
+        
         if not self.api_key:
-            return self._mock_response(messages)
+            return self._mock_response(messages, response_format)
         
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
+        cache_key = self._cache_key(messages, temperature, max_tokens, use_cache, response_format)
+        if cache_key:
+            cached = self.cache.get(cache_key)
+            metrics.llm_cache_lookups.inc(
+                provider=self.provider_name, model=self.model, result="miss" if cached is None else "hit"
+            )
+            if cached is not None:
+                return cached
         
-        payload = {
-            "model": self.model,
-            "messages": messages,
-            "temperature": temperature,
-            "max_tokens": max_tokens,
-            "stream": stream
-        }
+        if use_cache and self.single_flight is not None:
+            return self.single_flight.do(
+                self._flight_key(messages, temperature, max_tokens, response_format),
+                lambda: self._fetch(messages, temperature, max_tokens, cache_key, response_format)
+            )
+        return self._fetch(messages, temperature, max_tokens, cache_key, response_format)
+    
+    def _fetch(
+        self,
+        messages: list,
+        temperature: float,
+        max_tokens: int,
+        cache_key: Optional[str],
+        response_format: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Call the provider and store a successful result in the cache"""
+        request = self._build_request(messages, temperature, max_tokens, stream=False, response_format=response_format)
+        estimated_tokens = estimate_request_tokens(messages, max_tokens)
+        
+        started = time.monotonic()
         
         try:
-            response = requests.post(
-                f"{self.api_base_url}/chat/completions",
-                headers=headers,
-                json=payload,
-                timeout=self.timeout
+            response = self._send(request, estimated_tokens)
+            result = response.json()
+            self._observe_call("ok", started, usage=result.get("usage"))
+            self._settle_usage(estimated_tokens, result)
+            if cache_key:
+                self.cache.set(cache_key, result)
+            return result
+            
+        except (CircuitOpenError, DeadlineExceeded) as e:
+            print(f"⛔ {str(e)}")
+            self._observe_call("circuit_open" if isinstance(e, CircuitOpenError) else "deadline", started)
+            return self._error_response(str(e))
+            
+        except httpx.TimeoutException:
+            print("❌ Request timed out")
+            self._observe_call("timeout", started)
+            return self._error_response("Request timed out")
+            
+        except httpx.HTTPError as e:
+            print(f"❌ API request failed: {str(e)}")
+            self._observe_call("http_error", started)
+            return self._error_response(str(e))
+    
+    async def achat_completion(
+        self,
+        messages: list,
+        temperature: float = 0.7,
+        max_tokens: int = 4000,
+        stream: bool = False,
+        use_cache: bool = True,
+        response_format: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Async version of chat_completion
+        
+        Runs on the event loop's keep-alive pool, so concurrent callers share
+        connections instead of each opening (and TLS-handshaking) a new one.
+        
+        Args:
+            messages: List of message dictionaries with 'role' and 'content'
+            temperature: Sampling temperature (0.0 to 1.0)
+            max_tokens: Maximum tokens in response
+            stream: Whether to stream the response
+            use_cache: Set False to skip the response cache (and coalescing) for this call
+            response_format: Provider response_format, e.g. {"type": "json_object"} for JSON mode
+            
+        Returns:
+            API response dictionary
+        """
+        if stream:
+            try:
+                deltas = self.astream_chat_completion(messages, temperature, max_tokens, response_format)
+                content = "".join([delta async for delta in deltas])
+            except LLMClientError as e:
+                return self._error_response(str(e))
+            return self._stream_result(content)
+        
+        if not self.api_key:
+            return self._mock_response(messages, response_format)
+        
+        cache_key = self._cache_key(messages, temperature, max_tokens, use_cache, response_format)
+        if cache_key:
+            cached = self.cache.get(cache_key)
+            metrics.llm_cache_lookups.inc(
+                provider=self.provider_name, model=self.model, result="miss" if cached is None else "hit"
             )
+            if cached is not None:
+                return cached
+        
+        if use_cache and self.single_flight is not None:
+            return await self.single_flight.ado(
+                self._flight_key(messages, temperature, max_tokens, response_format),
+                lambda: self._afetch(messages, temperature, max_tokens, cache_key, response_format)
+            )
+        return await self._afetch(messages, temperature, max_tokens, cache_key, response_format)
+    
+    async def _afetch(
+        self,
+        messages: list,
+        temperature: float,
+        max_tokens: int,
+        cache_key: Optional[str],
+        response_format: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Async version of _fetch"""
+        request = self._build_request(messages, temperature, max_tokens, stream=False, response_format=response_format)
+        estimated_tokens = estimate_request_tokens(messages, max_tokens)
+        
+        started = time.monotonic()
+        
+        try:
+            response = await self._asend(request, estimated_tokens)
+            result = response.json()
+            self._observe_call("ok", started, usage=result.get("usage"))
+            self._settle_usage(estimated_tokens, result)
+            if cache_key:
+                self.cache.set(cache_key, result)
+            return result
             
-            response.raise_for_status()
-            return response.json()
+        except (CircuitOpenError, DeadlineExceeded) as e:
+            print(f"⛔ {str(e)}")
+            self._observe_call("circuit_open" if isinstance(e, CircuitOpenError) else "deadline", started)
+            return self._error_response(str(e))
             
-        except Timeout:
+        except httpx.TimeoutException:
             print("❌ Request timed out")
+            self._observe_call("timeout", started)
             return self._error_response("Request timed out")
             
-        except RequestException as e:
+        except httpx.HTTPError as e:
             print(f"❌ API request failed: {str(e)}")
+            self._observe_call("http_error", started)
             return self._error_response(str(e))
     
+    def stream_chat_completion(
+        self,
+        messages: list,
+        temperature: float = 0.7,
+        max_tokens: int = 4000,
+        response_format: Optional[Dict[str, Any]] = None
+    ) -> Iterator[str]:
+        """
+        Stream a chat completion, yielding content deltas as they arrive
+        
+        Retries only happen before the first byte; a stream that fails
+        midway raises instead of silently restarting.
+        
+        Args:
+            messages: List of message dictionaries with 'role' and 'content'
+            temperature: Sampling temperature (0.0 to 1.0)
+            max_tokens: Maximum tokens in response
+            response_format: Provider response_format, e.g. {"type": "json_object"} for JSON mode
+            
+        Yields:
+            Text fragments of the assistant message
+            
+        Raises:
+            LLMClientError: If the request fails or times out
+        """
+        if not self.api_key:
+            yield from self._mock_stream(messages, response_format)
+            return
+        
+        request = self._build_request(messages, temperature, max_tokens, stream=True, response_format=response_format)
+        estimated_tokens = estimate_request_tokens(messages, max_tokens)
+        
+        started = time.monotonic()
+        first_token_at: Optional[float] = None
+        completion_chars = 0
+        
+        try:
+            response = self._send(request, estimated_tokens, stream=True)
+            try:
+                for line in response.iter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data == "[DONE]":
+                        break
+                    delta = self._parse_stream_chunk(data)
+                    if delta:
+                        if first_token_at is None:
+                            first_token_at = time.monotonic()
+                        completion_chars += len(delta)
+                        yield delta
+            finally:
+                response.close()
+            self._observe_call(
+                "ok", started, stream=True, first_token_at=first_token_at,
+                usage=self._estimated_usage(messages, completion_chars)
+            )
+                        
+        except (CircuitOpenError, DeadlineExceeded) as e:
+            print(f"⛔ {str(e)}")
+            self._observe_call("circuit_open" if isinstance(e, CircuitOpenError) else "deadline", started, stream=True)
+            raise LLMClientError(str(e)) from e
+            
+        except httpx.TimeoutException as e:
+            print("❌ Stream timed out")
+            self._observe_call("timeout", started, stream=True)
+            raise LLMClientError("Request timed out") from e
+            
+        except httpx.HTTPError as e:
+            print(f"❌ Stream request failed: {str(e)}")
+            self._observe_call("http_error", started, stream=True)
+            raise LLMClientError(str(e)) from e
+    
+    async def astream_chat_completion(
+        self,
+        messages: list,
+        temperature: float = 0.7,
+        max_tokens: int = 4000,
+        response_format: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[str]:
+        """
+        Async version of stream_chat_completion
+        
+        Yields:
+            Text fragments of the assistant message
+            
+        Raises:
+            LLMClientError: If the request fails or times out
+        """
+        if not self.api_key:
+            for delta in self._mock_stream(messages, response_format):
+                yield delta
+                await asyncio.sleep(0)
+            return
+        
+        request = self._build_request(messages, temperature, max_tokens, stream=True, response_format=response_format)
+        estimated_tokens = estimate_request_tokens(messages, max_tokens)
+        
+        started = time.monotonic()
+        first_token_at: Optional[float] = None
+        completion_chars = 0
+        
+        try:
+            response = await self._asend(request, estimated_tokens, stream=True)
+            try:
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data == "[DONE]":
+                        break
+                    delta = self._parse_stream_chunk(data)
+                    if delta:
+                        if first_token_at is None:
+                            first_token_at = time.monotonic()
+                        completion_chars += len(delta)
+                        yield delta
+            finally:
+                await response.aclose()
+            self._observe_call(
+                "ok", started, stream=True, first_token_at=first_token_at,
+                usage=self._estimated_usage(messages, completion_chars)
+            )
+                        
+        except (CircuitOpenError, DeadlineExceeded) as e:
+            print(f"⛔ {str(e)}")
+            self._observe_call("circuit_open" if isinstance(e, CircuitOpenError) else "deadline", started, stream=True)
+            raise LLMClientError(str(e)) from e
+            
+        except httpx.TimeoutException as e:
+            print("❌ Stream timed out")
+            self._observe_call("timeout", started, stream=True)
+            raise LLMClientError("Request timed out") from e
+            
+        except httpx.HTTPError as e:
+            print(f"❌ Stream request failed: {str(e)}")
+            self._observe_call("http_error", started, stream=True)
+            raise LLMClientError(str(e)) from e
+    
+    @staticmethod
+    def _parse_stream_chunk(data: str) -> str:
+        """Extract the content delta from one server-sent event payload"""
+        try:
+            chunk = json.loads(data)
+        except json.JSONDecodeError:
+            return ""
+        
+        choices = chunk.get("choices") or []
+        if not choices:
+            return ""
+        return (choices[0].get("delta") or {}).get("content") or ""
+    
+    def _stream_result(self, content: str) -> Dict[str, Any]:
+        """Wrap streamed content in the non-streaming response shape"""
+        return {
+            "choices": [{
+                "message": {
+                    "role": "assistant",
+                    "content": content
+                },
+                "finish_reason": "stop"
+            }],
+            "usage": {},
+            "model": self.model if self.api_key else "mock-model"
+        }
+    
     def generate_study_plan(
         self,
         student_data: Dict[str, Any],
         system_prompt: str,
-        user_prompt: str
+        user_prompt: str,
+        response_format: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """
         Generate personalized study plan from student data
@@ -107,6 +757,7 @@ class DeepSeekLLMClient:
             student_data: Complete student data dictionary
             system_prompt: System instructions for the LLM
             user_prompt: User prompt template (will be formatted with data)
+            response_format: Provider response_format for structured (JSON) plans
             
         Returns:
             Study plan response from LLM
@@ -118,7 +769,30 @@ class DeepSeekLLMClient:
         
         print(f"🤖 Generating study plan for {student_data['student_profile']['name']}...")
         
-        response = self.chat_completion(messages, temperature=0.7, max_tokens=4000)
+        response = self.chat_completion(messages, temperature=0.7, max_tokens=4000, response_format=response_format)
+        
+        if "error" in response:
+            print(f"❌ Error generating plan: {response['error']}")
+            return response
+        
+        return self._parse_study_plan_response(response)
+    
+    async def agenerate_study_plan(
+        self,
+        student_data: Dict[str, Any],
+        system_prompt: str,
+        user_prompt: str,
+        response_format: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Async version of generate_study_plan"""
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt}
+        ]
+        
+        print(f"🤖 Generating study plan for {student_data['student_profile']['name']}...")
+        
+        response = await self.achat_completion(messages, temperature=0.7, max_tokens=4000, response_format=response_format)
         
         if "error" in response:
             print(f"❌ Error generating plan: {response['error']}")
@@ -152,10 +826,13 @@ class DeepSeekLLMClient:
                 "raw_response": api_response
             }
     
-    def _mock_response(self, messages: list) -> Dict[str, Any]:
+    def _mock_response(self, messages: list, response_format: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Generate mock response when no API key is provided"""
         print("⚠️  Running in MOCK MODE (no API key)")
         
+        if response_format:
+            return self._mock_completion(json.dumps(MOCK_JSON_PLAN, ensure_ascii=False, indent=2))
+        
         mock_plan = """
 # 📅 Personalized Study Plan
 
@@ -221,11 +898,15 @@ class DeepSeekLLMClient:
 **Generated by UpGrade AI Planner** 🎓
 """
         
+        return self._mock_completion(mock_plan)
+    
+    @staticmethod
+    def _mock_completion(content: str) -> Dict[str, Any]:
         return {
             "choices": [{
                 "message": {
                     "role": "assistant",
-                    "content": mock_plan
+                    "content": content
                 },
                 "finish_reason": "stop"
             }],
@@ -237,6 +918,19 @@ class DeepSeekLLMClient:
             "model": "mock-model"
         }
     
+    def _mock_stream(self, messages: list, response_format: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+        """Split the mock response into word-sized deltas"""
+        content = self._mock_response(messages, response_format)["choices"][0]["message"]["content"]
+        yield from re.findall(r"\S+\s*|\s+", content)
+    
+    def close(self) -> None:
+        """Close this client's pooled connections"""
+        self.transport.close()
+    
+    async def aclose(self) -> None:
+        """Close pooled connections opened on the current event loop"""
+        await self.transport.aclose()
+    
     def _error_response(self, error_message: str) -> Dict[str, Any]:
         """Create error response dictionary"""
         return {
@@ -251,14 +945,17 @@ class OpenAICompatibleClient(DeepSeekLLMClient):
     (e.g., OpenAI, Together AI, Groq, etc.)
     """
     
+    ENV_PREFIX = "OPENAI"
+    
     def __init__(
         self,
         api_key: Optional[str] = None,
         api_base_url: Optional[str] = "https://api.openai.com/v1",
         model: str = "gpt-4",
-        timeout: int = 60
+        timeout: int = 60,
+        **transport_options
     ):
-        super().__init__(api_key, api_base_url, model, timeout)
+        super().__init__(api_key, api_base_url, model, timeout, **transport_options)
 
 
 class GroqClient(DeepSeekLLMClient):
@@ -267,11 +964,14 @@ class GroqClient(DeepSeekLLMClient):
     Fast inference for open-source models like Llama 3.3
     """
     
+    ENV_PREFIX = "GROQ"
+    
     def __init__(
         self,
         api_key: Optional[str] = None,
         model: str = "llama-3.3-70b-versatile",
-        timeout: int = 60
+        timeout: int = 60,
+        **transport_options
     ):
         """
         Initialize Groq client
@@ -280,17 +980,50 @@ class GroqClient(DeepSeekLLMClient):
             api_key: Groq API key (or set GROQ_API_KEY env var)
             model: Model name (default: llama-3.3-70b-versatile)
             timeout: Request timeout in seconds
+            **transport_options: Connection pool settings (see DeepSeekLLMClient)
         """
         groq_api_key = api_key or os.getenv("GROQ_API_KEY")
         groq_base_url = os.getenv("GROQ_API_BASE", "https://api.groq.com/openai/v1")
         groq_model = os.getenv("GROQ_MODEL", model)
         
-        super().__init__(groq_api_key, groq_base_url, groq_model, timeout)
+        super().__init__(groq_api_key, groq_base_url, groq_model, timeout, **transport_options)
         
         if not self.api_key:
             print("⚠️  Warning: No Groq API key provided. Set GROQ_API_KEY environment variable.")
 
 
+def create_llm_client(
+    provider: str,
+    api_key: Optional[str] = None,
+    api_base_url: Optional[str] = None,
+    model: Optional[str] = None
+) -> DeepSeekLLMClient:
+    """
+    Create a client for a provider name ('groq', 'openai' or 'deepseek')
+    
+    Unspecified settings come from the provider's environment variables.
+    """
+    provider = provider.strip().lower()
+    
+    if provider == "groq":
+        return GroqClient(
+            api_key=api_key or os.getenv("GROQ_API_KEY"),
+            model=model or os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile")
+        )
+    elif provider == "openai":
+        return OpenAICompatibleClient(
+            api_key=api_key or os.getenv("OPENAI_API_KEY"),
+            api_base_url=api_base_url or os.getenv("OPENAI_API_BASE", "https://api.openai.com/v1"),
+            model=model or os.getenv("OPENAI_MODEL", "gpt-4")
+        )
+    else:  # deepseek
+        return DeepSeekLLMClient(
+            api_key=api_key or os.getenv("DEEPSEEK_API_KEY"),
+            api_base_url=api_base_url or os.getenv("DEEPSEEK_API_BASE"),
+            model=model or os.getenv("DEEPSEEK_MODEL", "deepseek-reasoner")
+        )
+
+
 def test_client():
     """Test the LLM client"""
     client = DeepSeekLLMClient()
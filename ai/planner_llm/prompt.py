@@ -4,8 +4,59 @@ Contains system prompts and user prompt templates for LLM interaction
 """
 
 import json
-from typing import Dict, Any
-from datetime import datetime
+from typing import Dict, Any, Callable, List, Optional, Tuple
+from datetime import date, datetime, time
+
+
+PROMPT_FORMATS = ("markdown", "compact")
+
+
+# A prompt section: (renderer appending to a parts list, renderer arguments).
+# Each section's text depends only on its arguments.
+Section = Tuple[Callable[..., None], tuple]
+
+
+def _day_anchor(now: datetime) -> int:
+    """
+    Day ordinal that "days left" counts from
+    
+    (midnight of deadline - now).days is the deadline's ordinal minus this,
+    so task text only changes when the date does, not every second.
+    """
+    return now.toordinal() + (now.time() != time())
+
+
+def days_left_reference(now: Optional[datetime] = None) -> date:
+    """The date study plan prompts count "days left" from at time `now`"""
+    return date.fromordinal(_day_anchor(now or datetime.now()))
+
+
+def days_until_lookup(anchor: int) -> Callable[[str], int]:
+    """
+    Days-left lookup for YYYY-MM-DD deadlines, counted from the day ordinal `anchor`
+    
+    Deadlines repeat, so each distinct date is parsed once. The lookup
+    raises ValueError for a deadline that is not an ISO date.
+    """
+    days_left: Dict[str, int] = {}
+    
+    def days_until(deadline: str) -> int:
+        days = days_left.get(deadline)
+        if days is None:
+            days = date.fromisoformat(deadline).toordinal() - anchor
+            days_left[deadline] = days
+        return days
+    
+    return days_until
+
+
+def _cell(value: Any) -> str:
+    """Table cell text; pipes and newlines would break the row"""
+    return str(value).replace("|", "/").replace("\n", " ")
+
+
+def _row(*values: Any) -> str:
+    return "|".join(_cell(v) for v in values) + "\n"
 
 
 class StudyPlanPrompts:
@@ -51,40 +102,79 @@ Output Format:
 
 Be encouraging, practical, and data-driven in your recommendations."""
 
+    TASK_INSTRUCTIONS = """---
+
+## 🎯 Your Task
+
+Based on this comprehensive student data, create a personalized, actionable study plan that:
+
+1. **Prioritizes urgent and high-risk tasks** for the next 48-72 hours
+2. **Creates a detailed weekly schedule** matching the student's availability
+3. **Optimizes for peak productivity hours** and respects break patterns
+4. **Provides specific time allocations** for each task
+5. **Addresses high-risk courses** with targeted interventions
+6. **Prevents workload overload** with realistic scheduling
+7. **Includes study tips and strategies** tailored to the student's needs
+8. **Motivates the student** while being practical and achievable
+
+Generate a complete study plan now."""
+
     @staticmethod
-    def format_student_data_prompt(student_data: Dict[str, Any]) -> str:
+    def format_student_data_prompt(student_data: Dict[str, Any], now: Optional[datetime] = None) -> str:
         """
         Format student data into a comprehensive prompt for the LLM
         
+        Sections are rendered independently into fragments that are joined
+        once, so the cost is linear in the number of tasks. The input is not
+        modified.
+        
         Args:
             student_data: Complete student data dictionary
+            now: Reference time for "days left" (defaults to the current time)
             
         Returns:
             Formatted prompt string
         """
-        profile = student_data["student_profile"]
-        courses = student_data["courses"]
-        tasks = student_data["tasks"]
-        grades = student_data["grades"]
-        attendance = student_data["attendance"]
-        availability = student_data["availability"]
-        productivity = student_data["productivity_pattern"]
-        historical = student_data["historical_behavior"]
+        now = now or datetime.now()
         analytics = student_data["computed_analytics"]
         
-        # Format tasks with priority
-        high_priority_tasks = [t for t in tasks if t["priority"] == "high"]
-        medium_priority_tasks = [t for t in tasks if t["priority"] == "medium"]
-        low_priority_tasks = [t for t in tasks if t["priority"] == "low"]
-        
-        # Calculate days until deadlines
-        today = datetime.now()
-        for task in tasks:
-            deadline = datetime.strptime(task["deadline"], "%Y-%m-%d")
-            days_left = (deadline - today).days
-            task["days_until_deadline"] = days_left
+        return StudyPlanPrompts._assemble([
+            (StudyPlanPrompts._render_profile, (student_data["student_profile"],)),
+            (StudyPlanPrompts._render_availability, (student_data["availability"],)),
+            (StudyPlanPrompts._render_behavior,
+             (student_data["productivity_pattern"], student_data["historical_behavior"])),
+            (StudyPlanPrompts._render_grades, (student_data["grades"][:5],)),  # Show last 5 grades
+            (StudyPlanPrompts._render_courses,
+             (student_data["courses"], student_data["attendance"], analytics["risk_per_course"])),
+            (StudyPlanPrompts._render_tasks, (student_data["tasks"], _day_anchor(now))),
+            (StudyPlanPrompts._render_risks, (analytics["risk_per_course"], analytics["workload_forecast"])),
+        ], StudyPlanPrompts.TASK_INSTRUCTIONS)
+    
+    @staticmethod
+    def _assemble(sections: List[Section], instructions: str) -> str:
+        """
+        Render sections in the order given, one blank line apart, followed by the instructions
         
-        prompt = f"""# Student Analysis Request
+        Both formats list sections from least to most frequently changing
+        (profile, availability, habits and grades before courses, tasks and
+        risks), so when a student updates a task everything before the task
+        list stays byte-identical and providers with prompt prefix caching
+        can reuse it together with the system prompt.
+        """
+        parts: List[str] = []
+        for render, args in sections:
+            start = len(parts)
+            render(parts, *args)
+            # Trim the section's own edge newlines in place; joining once keeps this linear
+            parts[start] = parts[start].lstrip("\n")
+            parts[-1] = parts[-1].rstrip("\n")
+            parts.append("\n\n")
+        parts.append(instructions.strip("\n"))
+        return "".join(parts)
+    
+    @staticmethod
+    def _render_profile(parts: List[str], profile: Dict[str, Any]) -> None:
+        parts.append(f"""# Student Analysis Request
 
 ## 👤 Student Profile
 - **Name**: {profile['name']}
@@ -94,89 +184,112 @@ Be encouraging, practical, and data-driven in your recommendations."""
 - **Academic Year**: {profile['academic_year']}
 - **Semester**: {profile['semester']}
 - **Goals**: {', '.join(profile['goals'])}
-
-## 📚 Enrolled Courses ({len(courses)} courses)
-"""
-        
+""")
+    
+    @staticmethod
+    def _render_courses(
+        parts: List[str],
+        courses: List[Dict[str, Any]],
+        attendance: Dict[str, Any],
+        risks: List[Dict[str, Any]]
+    ) -> None:
+        risk_by_course = StudyPlanPrompts._risk_by_course(risks)
+        parts.append(f"\n## 📚 Enrolled Courses ({len(courses)} courses)\n")
         for course in courses:
-            course_risk = next(
-                (r for r in analytics["risk_per_course"] if r["course_id"] == course["course_id"]),
-                None
-            )
+            course_risk = risk_by_course.get(course["course_id"])
             risk_info = f" | ⚠️ Risk: {course_risk['risk_level'].upper()} ({course_risk['risk_score']}/100)" if course_risk else ""
             attendance_pct = attendance.get(course["course_id"], "N/A")
             
-            prompt += f"""
+            parts.append(f"""
 ### {course['course_name']} ({course['course_id']})
 - Instructor: {course['instructor']}
 - Credits: {course['credit_hours']} | Difficulty: {course['difficulty_level']}/5 | Importance: {course['importance_weight']}
 - Attendance: {attendance_pct}%{risk_info}
-"""
+""")
+    
+    @staticmethod
+    def _render_tasks(parts: List[str], tasks: List[Dict[str, Any]], anchor: int) -> None:
+        by_priority: Dict[str, List[Dict[str, Any]]] = {"high": [], "medium": [], "low": []}
+        for task in tasks:
+            group = by_priority.get(task["priority"])
+            if group is not None:
+                group.append(task)
+        
+        days_until = days_until_lookup(anchor)
         
-        prompt += f"""
+        high = by_priority["high"]
+        parts.append(f"""
 
 ## 📝 Pending Tasks ({len(tasks)} tasks)
 
-### 🔴 HIGH PRIORITY ({len(high_priority_tasks)} tasks)
-"""
-        
-        for task in high_priority_tasks:
-            prompt += f"""
+### 🔴 HIGH PRIORITY ({len(high)} tasks)
+""")
+        for task in high:
+            minutes = task['estimated_duration_minutes']
+            parts.append(f"""
 **{task['task_title']}**
 - Course: {task['course_name']}
 - Type: {task['task_type']}
-- Deadline: {task['deadline']} ({task['days_until_deadline']} days left)
-- Estimated Time: {task['estimated_duration_minutes']} minutes ({task['estimated_duration_minutes']//60}h {task['estimated_duration_minutes']%60}m)
+- Deadline: {task['deadline']} ({days_until(task['deadline'])} days left)
+- Estimated Time: {minutes} minutes ({minutes//60}h {minutes%60}m)
 - Progress: {task['current_progress_percentage']}%
-"""
+""")
         
-        if medium_priority_tasks:
-            prompt += f"""
-### 🟡 MEDIUM PRIORITY ({len(medium_priority_tasks)} tasks)
-"""
-            for task in medium_priority_tasks:
-                prompt += f"""
+        medium = by_priority["medium"]
+        if medium:
+            parts.append(f"""
+### 🟡 MEDIUM PRIORITY ({len(medium)} tasks)
+""")
+            for task in medium:
+                minutes = task['estimated_duration_minutes']
+                parts.append(f"""
 **{task['task_title']}**
-- Deadline: {task['deadline']} ({task['days_until_deadline']} days)
-- Time needed: {task['estimated_duration_minutes']//60}h {task['estimated_duration_minutes']%60}m
+- Deadline: {task['deadline']} ({days_until(task['deadline'])} days)
+- Time needed: {minutes//60}h {minutes%60}m
 - Progress: {task['current_progress_percentage']}%
-"""
-        
-        if low_priority_tasks:
-            prompt += f"""
-### 🟢 LOW PRIORITY ({len(low_priority_tasks)} tasks)
-"""
-            for task in low_priority_tasks:
-                prompt += f"- {task['task_title']} (Due: {task['deadline']})\n"
+""")
         
-        prompt += f"""
+        low = by_priority["low"]
+        if low:
+            parts.append(f"""
+### 🟢 LOW PRIORITY ({len(low)} tasks)
+""")
+            for task in low:
+                parts.append(f"- {task['task_title']} (Due: {task['deadline']})\n")
+    
+    @staticmethod
+    def _render_grades(parts: List[str], grades: List[Dict[str, Any]]) -> None:
+        parts.append("""
 
 ## 📊 Past Performance
 
 ### Recent Grades
-"""
-        
-        for grade in grades[:5]:  # Show last 5 grades
+""")
+        for grade in grades:
             percentage = (grade['score'] / grade['max_score']) * 100
-            prompt += f"- {grade['course_id']} - {grade['assessment_name']}: {grade['score']}/{grade['max_score']} ({percentage:.0f}%) - Weight: {grade['weight_percentage']}%\n"
-        
-        prompt += f"""
+            parts.append(f"- {grade['course_id']} - {grade['assessment_name']}: {grade['score']}/{grade['max_score']} ({percentage:.0f}%) - Weight: {grade['weight_percentage']}%\n")
+    
+    @staticmethod
+    def _render_availability(parts: List[str], availability: Dict[str, Any]) -> None:
+        parts.append("""
 
 ## ⏰ Available Study Time
 
 ### Weekly Schedule
-"""
-        
+""")
         for day, slots in availability["weekly_schedule"].items():
             if slots:
                 time_slots = ", ".join([f"{slot['start']}-{slot['end']}" for slot in slots])
-                prompt += f"- **{day}**: {time_slots}\n"
+                parts.append(f"- **{day}**: {time_slots}\n")
             else:
-                prompt += f"- **{day}**: Not available\n"
-        
-        prompt += f"""
+                parts.append(f"- **{day}**: Not available\n")
+        parts.append(f"""
 - **Max Daily Study Hours**: {availability['max_daily_study_hours']} hours
-
+""")
+    
+    @staticmethod
+    def _render_behavior(parts: List[str], productivity: Dict[str, Any], historical: Dict[str, Any]) -> None:
+        parts.append(f"""
 ## 📈 Productivity Patterns
 - **Preferred Study Days**: {', '.join(productivity['preferred_study_days'])}
 - **Peak Focus Hours**: {', '.join(productivity['peak_focus_hours'])}
@@ -190,45 +303,179 @@ Be encouraging, practical, and data-driven in your recommendations."""
 - **Late Submission Rate**: {historical['late_submission_rate']*100:.0f}%
 - **Avg Daily Study Time**: {historical['average_daily_study_minutes']} minutes
 - **Most Delayed Course**: {historical['most_delayed_course']}
-
+""")
+    
+    @staticmethod
+    def _render_risks(parts: List[str], risks: List[Dict[str, Any]], workload: Dict[str, Any]) -> None:
+        parts.append("""
 ## ⚠️ Risk Analytics
 
 ### Course-Level Risks
-"""
-        
-        for risk in analytics["risk_per_course"]:
+""")
+        for risk in risks:
             emoji = "🔴" if risk["risk_level"] == "high" else "🟡" if risk["risk_level"] == "medium" else "🟢"
-            prompt += f"""
+            parts.append(f"""
 {emoji} **{risk['course_id']}** - {risk['risk_level'].upper()} ({risk['risk_score']}/100)
 - Reason: {risk['reason']}
-"""
+""")
         
-        workload = analytics["workload_forecast"]
         overload_warning = " ⚠️ OVERLOAD RISK!" if workload["overload_risk"] else ""
-        
-        prompt += f"""
+        parts.append(f"""
 ### Workload Forecast
 - **Current Week**: {workload['current_week_load_hours']} hours
 - **Next Week**: {workload['next_week_load_hours']} hours{overload_warning}
 
----
-
-## 🎯 Your Task
-
-Based on this comprehensive student data, create a personalized, actionable study plan that:
-
-1. **Prioritizes urgent and high-risk tasks** for the next 48-72 hours
-2. **Creates a detailed weekly schedule** matching the student's availability
-3. **Optimizes for peak productivity hours** and respects break patterns
-4. **Provides specific time allocations** for each task
-5. **Addresses high-risk courses** with targeted interventions
-6. **Prevents workload overload** with realistic scheduling
-7. **Includes study tips and strategies** tailored to the student's needs
-8. **Motivates the student** while being practical and achievable
+""")
+    
+    COMPACT_TASK_INSTRUCTIONS = """
+## Task
+Create a personalized, actionable study plan that:
+1. Prioritizes urgent and high-risk tasks for the next 48-72 hours
+2. Gives a detailed weekly schedule within the availability above
+3. Uses peak focus hours and the student's session/break lengths
+4. Allocates specific time to each task
+5. Targets high-risk courses
+6. Avoids overload with realistic scheduling
+7. Includes tailored study tips
+8. Is motivating yet practical
 
 Generate a complete study plan now."""
 
-        return prompt
+    @staticmethod
+    def format_compact_student_data_prompt(student_data: Dict[str, Any], now: Optional[datetime] = None) -> str:
+        """
+        Token-efficient variant of format_student_data_prompt
+        
+        Carries the same facts as pipe-separated tables with one header row
+        per section instead of emoji headings and a labelled bullet per field.
+        
+        Args:
+            student_data: Complete student data dictionary
+            now: Reference time for "days left" (defaults to the current time)
+            
+        Returns:
+            Formatted prompt string
+        """
+        now = now or datetime.now()
+        analytics = student_data["computed_analytics"]
+        
+        return StudyPlanPrompts._assemble([
+            (StudyPlanPrompts._compact_profile, (student_data["student_profile"],)),
+            (StudyPlanPrompts._compact_availability, (student_data["availability"],)),
+            (StudyPlanPrompts._compact_behavior,
+             (student_data["productivity_pattern"], student_data["historical_behavior"])),
+            (StudyPlanPrompts._compact_grades, (student_data["grades"][:5],)),
+            (StudyPlanPrompts._compact_courses,
+             (student_data["courses"], student_data["attendance"], analytics["risk_per_course"])),
+            (StudyPlanPrompts._compact_tasks, (student_data["tasks"], _day_anchor(now))),
+            (StudyPlanPrompts._compact_risks, (analytics["risk_per_course"], analytics["workload_forecast"])),
+        ], StudyPlanPrompts.COMPACT_TASK_INSTRUCTIONS)
+    
+    @staticmethod
+    def _compact_profile(parts: List[str], profile: Dict[str, Any]) -> None:
+        parts.append(
+            "# Student Analysis Request (tables: pipe-separated, first row names the columns)\n"
+            f"Student: {profile['name']} ({profile['student_id']}), {profile['major']}, {profile['university']}, "
+            f"year {profile['academic_year']}, {profile['semester']}\n"
+            f"Goals: {'; '.join(profile['goals'])}\n"
+        )
+    
+    @staticmethod
+    def _compact_courses(
+        parts: List[str],
+        courses: List[Dict[str, Any]],
+        attendance: Dict[str, Any],
+        risks: List[Dict[str, Any]]
+    ) -> None:
+        risk_by_course = StudyPlanPrompts._risk_by_course(risks)
+        parts.append("\n## Courses\n")
+        parts.append(_row("id", "name", "instructor", "credits", "difficulty/5", "importance", "attendance%", "risk/100"))
+        for course in courses:
+            risk = risk_by_course.get(course["course_id"])
+            parts.append(_row(
+                course["course_id"], course["course_name"], course["instructor"], course["credit_hours"],
+                course["difficulty_level"], course["importance_weight"],
+                attendance.get(course["course_id"], "N/A"),
+                f"{risk['risk_level']} {risk['risk_score']}" if risk else "-"
+            ))
+    
+    @staticmethod
+    def _compact_tasks(parts: List[str], tasks: List[Dict[str, Any]], anchor: int) -> None:
+        days_until = days_until_lookup(anchor)
+        parts.append(f"\n## Pending Tasks ({len(tasks)})\n")
+        parts.append(_row("priority", "title", "course", "type", "deadline", "days_left", "est_min", "progress%"))
+        for task in tasks:
+            parts.append(_row(
+                task["priority"], task["task_title"], task["course_id"], task["task_type"], task["deadline"],
+                days_until(task["deadline"]), task["estimated_duration_minutes"], task["current_progress_percentage"]
+            ))
+    
+    @staticmethod
+    def _compact_grades(parts: List[str], grades: List[Dict[str, Any]]) -> None:
+        parts.append("\n## Recent Grades\n")
+        parts.append(_row("course", "assessment", "score", "pct", "weight%"))
+        for grade in grades:
+            percentage = (grade["score"] / grade["max_score"]) * 100
+            parts.append(_row(
+                grade["course_id"], grade["assessment_name"], f"{grade['score']}/{grade['max_score']}",
+                f"{percentage:.0f}", grade["weight_percentage"]
+            ))
+    
+    @staticmethod
+    def _compact_availability(parts: List[str], availability: Dict[str, Any]) -> None:
+        parts.append(f"\n## Availability (max {availability['max_daily_study_hours']}h/day)\n")
+        parts.append(_row("day", "slots"))
+        for day, slots in availability["weekly_schedule"].items():
+            parts.append(_row(day, ", ".join(f"{slot['start']}-{slot['end']}" for slot in slots) or "none"))
+    
+    @staticmethod
+    def _compact_behavior(parts: List[str], productivity: Dict[str, Any], historical: Dict[str, Any]) -> None:
+        parts.append(
+            "\n## Habits\n"
+            f"preferred_days={','.join(productivity['preferred_study_days'])}; "
+            f"peak_hours={','.join(productivity['peak_focus_hours'])}; "
+            f"focus_session={productivity['average_focus_session_minutes']}m; "
+            f"break={productivity['average_break_minutes']}m; "
+            f"last_week={productivity['total_study_hours_last_week']}h; "
+            f"productivity={productivity['productivity_score']}/100\n"
+            f"missed_deadlines={historical['missed_deadlines_count']}; "
+            f"late_rate={historical['late_submission_rate']*100:.0f}%; "
+            f"avg_daily_study={historical['average_daily_study_minutes']}m; "
+            f"most_delayed={historical['most_delayed_course']}\n"
+        )
+    
+    @staticmethod
+    def _compact_risks(parts: List[str], risks: List[Dict[str, Any]], workload: Dict[str, Any]) -> None:
+        parts.append("\n## Risks\n")
+        parts.append(_row("course", "level", "score", "reason"))
+        for risk in risks:
+            parts.append(_row(risk["course_id"], risk["risk_level"], risk["risk_score"], risk["reason"]))
+        parts.append(
+            f"Workload: this week {workload['current_week_load_hours']}h, next week {workload['next_week_load_hours']}h"
+            + (" (OVERLOAD RISK)" if workload["overload_risk"] else "") + "\n"
+        )
+    
+    @staticmethod
+    def _risk_by_course(risks: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Index risks by course once instead of scanning the list per course (first entry wins)"""
+        risk_by_course: Dict[str, Dict[str, Any]] = {}
+        for risk in risks:
+            risk_by_course.setdefault(risk["course_id"], risk)
+        return risk_by_course
+    
+    @staticmethod
+    def format_prompt(student_data: Dict[str, Any], prompt_format: str = "markdown", now: Optional[datetime] = None) -> str:
+        """
+        Render the user prompt in one of PROMPT_FORMATS
+        
+        Raises:
+            ValueError: For an unknown format
+        """
+        if prompt_format == "markdown":
+            return StudyPlanPrompts.format_student_data_prompt(student_data, now)
+        if prompt_format == "compact":
+            return StudyPlanPrompts.format_compact_student_data_prompt(student_data, now)
+        raise ValueError(f"Unknown prompt format '{prompt_format}' (expected one of {', '.join(PROMPT_FORMATS)})")
     
     @staticmethod
     def format_quick_question_prompt(question: str, student_data: Dict[str, Any]) -> str:
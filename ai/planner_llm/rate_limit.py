@@ -0,0 +1,159 @@
+"""
+Client-side Rate Limiting for LLM Providers
+Token buckets for requests-per-minute and tokens-per-minute quotas
+"""
+
+import asyncio
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from planner_llm.deadline import DeadlineExceeded
+
+
+class TokenBucket:
+    """
+    Token bucket that refills continuously at `rate_per_minute`
+
+    Acquisitions reserve tokens immediately (the balance may go negative)
+    and return how long the caller must wait, so concurrent callers queue
+    in arrival order instead of racing for the next refill.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate_per_second = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate_per_second)
+        self._updated = now
+
+    def reserve(self, amount: float = 1.0) -> float:
+        """Reserve `amount` tokens and return the seconds to wait before using them"""
+        # A request larger than the bucket could never be satisfied; cap it
+        amount = min(amount, self.capacity)
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= amount
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate_per_second
+
+    def refund(self, amount: float) -> None:
+        """Return over-reserved tokens (e.g. when actual usage was lower)"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self.capacity, self._tokens + amount)
+
+    def drain(self, seconds: float) -> None:
+        """Push the balance down so nobody is admitted for `seconds`"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self._tokens, -seconds * self.rate_per_second)
+
+
+class ProviderRateLimiter:
+    """
+    Per-provider limiter combining a request bucket and a token bucket
+
+    Either limit may be None (unlimited). When the provider answers 429,
+    `pause` drains both buckets so queued callers wait out the Retry-After
+    window locally instead of hammering the endpoint.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None
+    ):
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+
+    def reserve(self, estimated_tokens: int) -> float:
+        """Reserve one request plus `estimated_tokens`; return the wait in seconds"""
+        wait = 0.0
+        if self.requests is not None:
+            wait = max(wait, self.requests.reserve(1))
+        if self.tokens is not None:
+            wait = max(wait, self.tokens.reserve(estimated_tokens))
+        return wait
+
+    def cancel(self, estimated_tokens: int) -> None:
+        """Give back a reservation that will not be used"""
+        if self.requests is not None:
+            self.requests.refund(1)
+        if self.tokens is not None:
+            self.tokens.refund(min(estimated_tokens, self.tokens.capacity))
+
+    def _reserve_within(self, estimated_tokens: int, max_wait: Optional[float]) -> float:
+        """Reserve, or give the reservation back and raise if the wait exceeds `max_wait`"""
+        wait = self.reserve(estimated_tokens)
+        if max_wait is not None and wait > max_wait:
+            self.cancel(estimated_tokens)
+            raise DeadlineExceeded(f"Rate limit wait of {wait:.1f}s exceeds the request deadline")
+        return wait
+
+    def acquire(self, estimated_tokens: int, max_wait: Optional[float] = None) -> None:
+        """
+        Blocking acquire
+
+        Raises:
+            DeadlineExceeded: If the wait would be longer than `max_wait` seconds
+        """
+        wait = self._reserve_within(estimated_tokens, max_wait)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def aacquire(self, estimated_tokens: int, max_wait: Optional[float] = None) -> None:
+        """Async acquire (does not block the event loop); raises like acquire"""
+        wait = self._reserve_within(estimated_tokens, max_wait)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def settle(self, estimated_tokens: int, actual_tokens: Optional[int]) -> None:
+        """Refund the difference once the real token usage is known"""
+        if self.tokens is not None and actual_tokens is not None and actual_tokens < estimated_tokens:
+            self.tokens.refund(estimated_tokens - actual_tokens)
+
+    def pause(self, seconds: float) -> None:
+        """Hold back all callers for `seconds` (provider asked us to slow down)"""
+        for bucket in (self.requests, self.tokens):
+            if bucket is not None:
+                bucket.drain(seconds)
+
+
+def estimate_request_tokens(messages: list, max_tokens: int) -> int:
+    """Rough prompt + completion token estimate (~4 characters per token)"""
+    prompt_chars = sum(len(str(message.get("content", ""))) for message in messages)
+    return prompt_chars // 4 + max_tokens
+
+
+_limiters: Dict[Tuple[str, Optional[float], Optional[float]], ProviderRateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(
+    provider_key: str,
+    requests_per_minute: Optional[float],
+    tokens_per_minute: Optional[float]
+) -> Optional[ProviderRateLimiter]:
+    """
+    Shared limiter for a provider endpoint (None when no limits are set)
+
+    Quotas are enforced per account and endpoint, so every client talking
+    to the same provider must draw from the same buckets.
+    """
+    if not requests_per_minute and not tokens_per_minute:
+        return None
+
+    key = (provider_key, requests_per_minute, tokens_per_minute)
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = ProviderRateLimiter(requests_per_minute, tokens_per_minute)
+            _limiters[key] = limiter
+    return limiter
@@ -0,0 +1,85 @@
+"""
+Retry Policy for LLM Requests
+Exponential backoff with full jitter that honors the provider's Retry-After
+"""
+
+import os
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 425, 429, 500, 502, 503, 504})
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header (delta-seconds or HTTP-date) into seconds
+
+    Groq and OpenAI also send fractional seconds ("1.5"), which is accepted.
+    """
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class RetryPolicy:
+    """Decides whether and how long to wait before retrying a request"""
+
+    def __init__(
+        self,
+        max_retries: Optional[int] = None,
+        base_delay: Optional[float] = None,
+        max_delay: Optional[float] = None,
+        max_retry_after: float = 60.0,
+        retry_statuses: frozenset = RETRYABLE_STATUS_CODES
+    ):
+        """
+        Initialize the retry policy
+
+        Args:
+            max_retries: Retries after the first attempt (0 disables; env LLM_MAX_RETRIES)
+            base_delay: Backoff for the first retry, doubled each attempt (env LLM_RETRY_BASE_DELAY)
+            max_delay: Cap on the computed backoff (env LLM_RETRY_MAX_DELAY)
+            max_retry_after: Give up instead of honoring a longer Retry-After
+            retry_statuses: HTTP status codes worth retrying
+        """
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv("LLM_MAX_RETRIES", "3"))
+        self.base_delay = base_delay if base_delay is not None else float(os.getenv("LLM_RETRY_BASE_DELAY", "0.5"))
+        self.max_delay = max_delay if max_delay is not None else float(os.getenv("LLM_RETRY_MAX_DELAY", "20"))
+        self.max_retry_after = max_retry_after
+        self.retry_statuses = retry_statuses
+
+    def should_retry_status(self, status_code: int, attempt: int) -> bool:
+        return attempt < self.max_retries and status_code in self.retry_statuses
+
+    def should_retry_error(self, attempt: int) -> bool:
+        """Network errors and timeouts are always worth another attempt"""
+        return attempt < self.max_retries
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> Optional[float]:
+        """
+        Seconds to sleep before retry number `attempt + 1`
+
+        Uses full jitter (uniform in [0, base * 2^attempt]) so synchronized
+        clients spread out. A Retry-After from the provider takes precedence;
+        returns None when it exceeds max_retry_after (not worth waiting).
+        """
+        if retry_after is not None:
+            if retry_after > self.max_retry_after:
+                return None
+            return retry_after + random.uniform(0, self.base_delay)
+
+        ceiling = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return random.uniform(0, ceiling)
@@ -0,0 +1,438 @@
+"""
+Multi-provider LLM Routing
+Failover, hedged requests and per-provider health across LLM clients
+"""
+
+import os
+import time
+import asyncio
+import threading
+import contextvars
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, Any, Optional, List, Iterator, AsyncIterator, Deque
+
+from planner_llm.llm_client import DeepSeekLLMClient, LLMClientError, create_llm_client
+
+
+class ProviderHealth:
+    """Rolling latency and error statistics for one provider"""
+
+    def __init__(
+        self,
+        window: int = 100,
+        failure_threshold: int = 3,
+        cooldown_seconds: float = 30.0,
+        max_error_rate: float = 0.5
+    ):
+        self.window = window
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.max_error_rate = max_error_rate
+
+        # Latencies are bucketed by max_tokens so short chat replies and
+        # 4000-token plans don't share one percentile
+        self._latencies: Dict[int, Deque[float]] = {}
+        self._outcomes: Deque[bool] = deque(maxlen=window)
+        self._consecutive_failures = 0
+        self._degraded_until = 0.0
+        self._lock = threading.Lock()
+
+    def record_success(self, latency: float, max_tokens: int) -> None:
+        with self._lock:
+            self._latencies.setdefault(max_tokens, deque(maxlen=self.window)).append(latency)
+            self._outcomes.append(True)
+            self._consecutive_failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._outcomes.append(False)
+            self._consecutive_failures += 1
+            if self._consecutive_failures >= self.failure_threshold:
+                # Back off exponentially while the provider keeps failing
+                excess = self._consecutive_failures - self.failure_threshold
+                cooldown = min(self.cooldown_seconds * (2 ** excess), 600.0)
+                self._degraded_until = time.monotonic() + cooldown
+
+    @property
+    def error_rate(self) -> float:
+        with self._lock:
+            if not self._outcomes:
+                return 0.0
+            return self._outcomes.count(False) / len(self._outcomes)
+
+    @property
+    def is_degraded(self) -> bool:
+        if time.monotonic() < self._degraded_until:
+            return True
+        return len(self._outcomes) >= 10 and self.error_rate > self.max_error_rate
+
+    def latency_percentile(self, percentile: float, max_tokens: int, min_samples: int = 20) -> Optional[float]:
+        """Latency at `percentile` (0-1) for this request size, None until enough samples"""
+        with self._lock:
+            samples = sorted(self._latencies.get(max_tokens, ()))
+        if len(samples) < min_samples:
+            return None
+        return samples[min(len(samples) - 1, int(percentile * len(samples)))]
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "degraded": self.is_degraded,
+            "error_rate": round(self.error_rate, 3),
+            "consecutive_failures": self._consecutive_failures,
+            "requests": len(self._outcomes),
+        }
+
+
+class RoutingLLMClient(DeepSeekLLMClient):
+    """
+    Routes requests across several DeepSeekLLMClient-compatible providers
+
+    - Providers are tried in preference order; degraded ones go last.
+    - A failed attempt fails over to the next provider.
+    - With hedging on, a duplicate goes to the next provider once the
+      current one runs past its latency percentile; the first success wins.
+
+    Drop-in replacement for a single client: generate_study_plan and the
+    streaming helpers all route through the overridden methods below.
+    """
+
+    def __init__(
+        self,
+        providers: List[DeepSeekLLMClient],
+        names: Optional[List[str]] = None,
+        hedge: bool = True,
+        hedge_percentile: float = 0.95,
+        hedge_delay: float = 10.0,
+        min_hedge_delay: float = 0.5,
+        max_workers: Optional[int] = None
+    ):
+        """
+        Initialize the router
+
+        Args:
+            providers: Clients in preference order
+            names: Unique display names per provider (defaults to "<prefix>/<model>")
+            hedge: Send a duplicate to the next provider when the first is slow
+            hedge_percentile: Latency percentile that triggers a hedge
+            hedge_delay: Hedge trigger used until enough latency samples exist
+            min_hedge_delay: Lower bound on the hedge trigger
+            max_workers: Threads this router may use for hedged blocking calls
+                         (env LLM_ROUTER_MAX_WORKERS, default 32)
+        """
+        if not providers:
+            raise ValueError("RoutingLLMClient needs at least one provider")
+
+        # Without an API key a client only returns mock plans; never route
+        # real traffic to it unless nothing else is configured
+        live = [p for p in providers if p.api_key]
+        self.providers = live or providers[:1]
+        self.names = names or [f"{p.ENV_PREFIX.lower()}/{p.model}" for p in providers]
+        if len(set(self.names)) != len(self.names):
+            raise ValueError(f"Provider names must be unique: {self.names}")
+        self.names = [self.names[providers.index(p)] for p in self.providers]
+        self.health = {name: ProviderHealth() for name in self.names}
+
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.hedge_delay = hedge_delay
+        self.min_hedge_delay = min_hedge_delay
+
+        primary = self.providers[0]
+        # Base client state mirrors the primary provider. Caching and
+        # coalescing stay off here because every provider already does both.
+        self.ENV_PREFIX = primary.ENV_PREFIX
+        super().__init__(
+            api_key=primary.api_key,
+            api_base_url=primary.api_base_url,
+            model=primary.model,
+            timeout=primary.timeout,
+            retry_policy=primary.retry_policy,
+            use_cache=False,
+            coalesce=False
+        )
+        self.api_key = primary.api_key  # A keyless primary keeps the router in mock mode
+        self.transport = primary.transport
+        self.circuit_breaker = primary.circuit_breaker
+        self.rate_limiter = primary.rate_limiter
+
+        self.max_workers = max_workers or int(os.getenv("LLM_ROUTER_MAX_WORKERS", "32"))
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+        print(f"🔀 LLM router: {' → '.join(self.names)}" + (" (hedged)" if hedge else ""))
+
+    def _pool(self) -> ThreadPoolExecutor:
+        """This router's hedging thread pool, created on first use"""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="llm-hedge")
+            return self._executor
+
+    def _ordered(self) -> List[int]:
+        """Provider indices, healthy first, each group in preference order"""
+        return sorted(
+            range(len(self.providers)),
+            key=lambda i: (self.health[self.names[i]].is_degraded, i)
+        )
+
+    def _hedge_after(self, index: int, max_tokens: int) -> float:
+        observed = self.health[self.names[index]].latency_percentile(self.hedge_percentile, max_tokens)
+        delay = observed if observed is not None else self.hedge_delay
+        return max(self.min_hedge_delay, delay)
+
+    def _record(self, index: int, result: Dict[str, Any], latency: float, max_tokens: int) -> Dict[str, Any]:
+        name = self.names[index]
+        if "error" in result:
+            self.health[name].record_failure()
+            print(f"⚠️  Provider {name} failed: {result['error']}")
+        else:
+            self.health[name].record_success(latency, max_tokens)
+            result["provider"] = name
+        return result
+
+    def _call(
+        self,
+        index: int,
+        messages: list,
+        temperature: float,
+        max_tokens: int,
+        use_cache: bool,
+        response_format: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        start = time.perf_counter()
+        result = self.providers[index].chat_completion(
+            messages, temperature=temperature, max_tokens=max_tokens, use_cache=use_cache,
+            response_format=response_format
+        )
+        return self._record(index, result, time.perf_counter() - start, max_tokens)
+
+    async def _acall(
+        self,
+        index: int,
+        messages: list,
+        temperature: float,
+        max_tokens: int,
+        use_cache: bool,
+        response_format: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        start = time.perf_counter()
+        result = await self.providers[index].achat_completion(
+            messages, temperature=temperature, max_tokens=max_tokens, use_cache=use_cache,
+            response_format=response_format
+        )
+        return self._record(index, result, time.perf_counter() - start, max_tokens)
+
+    def chat_completion(
+        self,
+        messages: list,
+        temperature: float = 0.7,
+        max_tokens: int = 4000,
+        stream: bool = False,
+        use_cache: bool = True,
+        response_format: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Route a blocking chat completion
+
+        Without hedging, providers are tried one after another on the calling
+        thread. Hedged calls run on this router's own thread pool, since the
+        caller has to wait on whichever attempt finishes first.
+        """
+        if stream:
+            return super().chat_completion(messages, temperature, max_tokens, stream=True, response_format=response_format)
+
+        queue = self._ordered()
+        last_error: Dict[str, Any] = self._error_response("No provider available")
+
+        if not self.hedge or len(queue) < 2:
+            for index in queue:
+                result = self._call(index, messages, temperature, max_tokens, use_cache, response_format)
+                if "error" not in result:
+                    return result
+                last_error = result
+            return last_error
+
+        pool = self._pool()
+        pending = {}
+
+        def launch():
+            index = queue.pop(0)
+            # Run in a copy of the caller's context so its deadline applies in the worker thread
+            context = contextvars.copy_context()
+            future = pool.submit(
+                context.run, self._call, index, messages, temperature, max_tokens, use_cache, response_format
+            )
+            pending[future] = index
+
+        launch()
+        while pending:
+            timeout = None
+            if self.hedge and queue and len(pending) < 2:
+                timeout = self._hedge_after(list(pending.values())[-1], max_tokens)
+
+            done, _ = wait(list(pending), timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                print(f"🏁 Hedging to {self.names[queue[0]]} after {timeout:.1f}s")
+                launch()
+                continue
+
+            for future in done:
+                pending.pop(future)
+                result = future.result()
+                if "error" not in result:
+                    # Slower duplicates finish in the background and only update health
+                    return result
+                last_error = result
+
+            if not pending and queue:
+                launch()
+
+        return last_error
+
+    async def achat_completion(
+        self,
+        messages: list,
+        temperature: float = 0.7,
+        max_tokens: int = 4000,
+        stream: bool = False,
+        use_cache: bool = True,
+        response_format: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Route an async chat completion; losing hedges are cancelled"""
+        if stream:
+            return await super().achat_completion(
+                messages, temperature, max_tokens, stream=True, response_format=response_format
+            )
+
+        queue = self._ordered()
+        pending: Dict[asyncio.Task, int] = {}
+        last_error: Dict[str, Any] = self._error_response("No provider available")
+
+        def launch():
+            index = queue.pop(0)
+            task = asyncio.ensure_future(
+                self._acall(index, messages, temperature, max_tokens, use_cache, response_format)
+            )
+            pending[task] = index
+
+        launch()
+        try:
+            while pending:
+                timeout = None
+                if self.hedge and queue and len(pending) < 2:
+                    timeout = self._hedge_after(list(pending.values())[-1], max_tokens)
+
+                done, _ = await asyncio.wait(list(pending), timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    print(f"🏁 Hedging to {self.names[queue[0]]} after {timeout:.1f}s")
+                    launch()
+                    continue
+
+                for task in done:
+                    pending.pop(task)
+                    result = task.result()
+                    if "error" not in result:
+                        return result
+                    last_error = result
+
+                if not pending and queue:
+                    launch()
+        finally:
+            for task in pending:
+                task.cancel()
+
+        return last_error
+
+    def stream_chat_completion(
+        self,
+        messages: list,
+        temperature: float = 0.7,
+        max_tokens: int = 4000,
+        response_format: Optional[Dict[str, Any]] = None
+    ) -> Iterator[str]:
+        """Stream from the first healthy provider, failing over before the first token"""
+        last_error: Optional[Exception] = None
+
+        for index in self._ordered():
+            started = False
+            start = time.perf_counter()
+            try:
+                for delta in self.providers[index].stream_chat_completion(
+                    messages, temperature, max_tokens, response_format
+                ):
+                    started = True
+                    yield delta
+            except LLMClientError as e:
+                self.health[self.names[index]].record_failure()
+                if started:
+                    raise
+                last_error = e
+                continue
+            self.health[self.names[index]].record_success(time.perf_counter() - start, max_tokens)
+            return
+
+        raise last_error or LLMClientError("No provider available")
+
+    async def astream_chat_completion(
+        self,
+        messages: list,
+        temperature: float = 0.7,
+        max_tokens: int = 4000,
+        response_format: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[str]:
+        """Async version of stream_chat_completion"""
+        last_error: Optional[Exception] = None
+
+        for index in self._ordered():
+            started = False
+            start = time.perf_counter()
+            try:
+                async for delta in self.providers[index].astream_chat_completion(
+                    messages, temperature, max_tokens, response_format
+                ):
+                    started = True
+                    yield delta
+            except LLMClientError as e:
+                self.health[self.names[index]].record_failure()
+                if started:
+                    raise
+                last_error = e
+                continue
+            self.health[self.names[index]].record_success(time.perf_counter() - start, max_tokens)
+            return
+
+        raise last_error or LLMClientError("No provider available")
+
+    def health_report(self) -> Dict[str, Dict[str, Any]]:
+        """Current health of every provider, for status endpoints"""
+        return {name: self.health[name].snapshot() for name in self.names}
+
+    def close(self) -> None:
+        with self._executor_lock:
+            if self._executor is not None:
+                # Losing hedges still running are left to finish on their own
+                self._executor.shutdown(wait=False)
+                self._executor = None
+        for provider in self.providers:
+            provider.close()
+
+    async def aclose(self) -> None:
+        for provider in self.providers:
+            await provider.aclose()
+
+
+def create_routing_client(provider_names: List[str], **router_options) -> RoutingLLMClient:
+    """
+    Build a router from provider names ('groq', 'deepseek', 'openai')
+
+    Each provider is configured from its usual environment variables.
+    Names are normalized like create_llm_client does, and repeats are dropped.
+    """
+    names: List[str] = []
+    for name in provider_names:
+        name = name.strip().lower()
+        if name and name not in names:
+            names.append(name)
+    providers = [create_llm_client(name) for name in names]
+    return RoutingLLMClient(providers, names=names, **router_options)
@@ -0,0 +1,175 @@
+"""
+HTTP Transport for LLM Clients
+Shared keep-alive connection pools (sync and async) reused by every LLM client
+"""
+
+import os
+import asyncio
+import threading
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+import httpx
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 support inside httpx)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+DEFAULT_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "100"))
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "20"))
+DEFAULT_KEEPALIVE_EXPIRY = float(os.getenv("LLM_KEEPALIVE_EXPIRY", "30"))
+
+
+class LLMTransport:
+    """
+    Connection pool for a single provider endpoint.
+
+    The sync client is shared by all threads; async clients are created once
+    per event loop because httpx connections are bound to the loop that
+    opened them.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+        http2: Optional[bool] = None
+    ):
+        """
+        Initialize the transport
+
+        Args:
+            base_url: Provider base URL (e.g. https://api.groq.com/openai/v1)
+            max_connections: Upper bound on open connections in the pool
+            max_keepalive_connections: Idle connections kept alive for reuse
+            keepalive_expiry: Seconds an idle connection stays in the pool
+            http2: Force HTTP/2 on/off; None enables it for HTTPS when h2 is installed
+        """
+        self.base_url = base_url.rstrip("/")
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        self.http2 = self._resolve_http2(self.base_url, http2)
+
+        self._lock = threading.Lock()
+        self._sync_client: Optional[httpx.Client] = None
+        self._async_clients: Dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+
+    @staticmethod
+    def _resolve_http2(base_url: str, http2: Optional[bool]) -> bool:
+        """Decide whether to negotiate HTTP/2 (falls back to 1.1 via ALPN)"""
+        if http2 is None:
+            http2 = os.getenv("LLM_HTTP2", "auto").lower()
+            if http2 in ("0", "false", "no", "off"):
+                return False
+            if http2 in ("1", "true", "yes", "on"):
+                http2 = True
+            else:
+                return HTTP2_AVAILABLE and urlparse(base_url).scheme == "https"
+
+        if http2 and not HTTP2_AVAILABLE:
+            print("⚠️  Warning: HTTP/2 requested but 'h2' is not installed. Using HTTP/1.1.")
+            return False
+        return bool(http2)
+
+    @property
+    def client(self) -> httpx.Client:
+        """Shared blocking client"""
+        if self._sync_client is None or self._sync_client.is_closed:
+            with self._lock:
+                if self._sync_client is None or self._sync_client.is_closed:
+                    self._sync_client = httpx.Client(
+                        limits=self.limits,
+                        http2=self.http2
+                    )
+        return self._sync_client
+
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        """Async client bound to the currently running event loop"""
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+
+        if client is None or client.is_closed:
+            with self._lock:
+                # Drop clients whose loops are gone so they don't accumulate
+                for stale in [l for l in self._async_clients if l.is_closed()]:
+                    del self._async_clients[stale]
+
+                client = httpx.AsyncClient(limits=self.limits, http2=self.http2)
+                self._async_clients[loop] = client
+
+        return client
+
+    def close(self) -> None:
+        """Close the blocking client"""
+        with self._lock:
+            if self._sync_client is not None:
+                self._sync_client.close()
+                self._sync_client = None
+
+    async def aclose(self) -> None:
+        """Close the async client of the current loop and the blocking client"""
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.pop(loop, None)
+        if client is not None:
+            await client.aclose()
+        self.close()
+
+
+_TransportKey = Tuple[str, int, int, float, Optional[bool]]
+_transports: Dict[_TransportKey, LLMTransport] = {}
+_transports_lock = threading.Lock()
+
+
+def get_transport(
+    base_url: str,
+    max_connections: int = DEFAULT_MAX_CONNECTIONS,
+    max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+    keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+    http2: Optional[bool] = None
+) -> LLMTransport:
+    """
+    Get the process-wide transport for an endpoint
+
+    Clients that talk to the same base URL with the same pool settings share
+    one pool, so connections (and TLS sessions) are reused across instances.
+    """
+    key = (base_url.rstrip("/"), max_connections, max_keepalive_connections, keepalive_expiry, http2)
+
+    with _transports_lock:
+        transport = _transports.get(key)
+        if transport is None:
+            transport = LLMTransport(
+                base_url,
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+                http2=http2
+            )
+            _transports[key] = transport
+
+    return transport
+
+
+def close_all_transports() -> None:
+    """Close every shared blocking client (call on process shutdown)"""
+    with _transports_lock:
+        transports = list(_transports.values())
+    for transport in transports:
+        transport.close()
+
+
+async def aclose_all_transports() -> None:
+    """Close every shared client opened on the current event loop"""
+    with _transports_lock:
+        transports = list(_transports.values())
+    for transport in transports:
+        await transport.aclose()
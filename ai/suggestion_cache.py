@@ -0,0 +1,162 @@
+"""
+Precomputed Quick-Suggestion Answers
+Generates answers to the suggestion chips in the background whenever a student's context changes
+
+The suggestion prompts are known as soon as the context is, so their
+answers can be produced before the student taps a chip. Entries are keyed
+by a fingerprint of the context (plus today's date, since answers talk
+about "due tomorrow"), so any task change invalidates them automatically.
+"""
+
+import os
+import asyncio
+import threading
+import contextvars
+from datetime import date
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from chat_context import context_fingerprint
+from planner_llm.cache import LRUTTLCache
+from planner_llm.metrics import Counter, registry
+
+suggestion_cache_lookups = registry.register(Counter(
+    "chat_suggestion_cache_lookups_total",
+    "Chat messages looked up in the precomputed suggestion answers, by result (hit, miss)",
+    ("result",)
+))
+
+
+def _normalize_prompt(prompt: str) -> str:
+    return " ".join(prompt.lower().split())
+
+
+class SuggestionPrecomputer:
+    """
+    Background cache of answers to the current quick-suggestion prompts
+
+    `schedule(context)` starts (at most one) precomputation per context
+    fingerprint on the running event loop; `get(message, context)` returns
+    a finished answer if the message is one of that context's suggestions.
+    """
+
+    def __init__(
+        self,
+        generate: Callable[[str, Dict[str, Any]], Awaitable[Optional[Dict[str, Any]]]],
+        suggestions: Callable[[Optional[Dict[str, Any]]], List[str]],
+        max_entries: int = 512,
+        ttl_seconds: Optional[float] = None,
+        concurrency: int = 2
+    ):
+        """
+        Initialize the precomputer
+
+        Args:
+            generate: Coroutine producing a chat result for (prompt, context), or None to skip the prompt
+            suggestions: Returns the suggestion prompts for a context
+            max_entries: Cached answers kept (LRU eviction)
+            ttl_seconds: Answer lifetime (env CHAT_PRECOMPUTE_TTL)
+            concurrency: Prompts generated at once per context
+        """
+        self.generate = generate
+        self.suggestions = suggestions
+        self.concurrency = concurrency
+        self.enabled = os.getenv("CHAT_PRECOMPUTE", "true").lower() not in ("0", "false", "no", "off")
+        ttl = ttl_seconds if ttl_seconds is not None else float(os.getenv("CHAT_PRECOMPUTE_TTL", "3600"))
+
+        self._answers = LRUTTLCache(max_entries, ttl)
+        self._completed = LRUTTLCache(max_entries, ttl)
+        self._in_progress: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _fingerprint(context: Dict[str, Any]) -> str:
+        return f"{date.today().isoformat()}|{context_fingerprint(context)}"
+
+    def get(self, message: str, context: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Precomputed answer for a suggestion prompt under this exact context"""
+        if not self.enabled or not context:
+            return None
+        result = self._answers.get(f"{self._fingerprint(context)}|{_normalize_prompt(message)}")
+        suggestion_cache_lookups.inc(result="miss" if result is None else "hit")
+        return dict(result) if result is not None else None
+
+    def schedule(self, context: Optional[Dict[str, Any]]) -> bool:
+        """
+        Start precomputing answers for a context in the background
+
+        Must be called from a running event loop. Returns False when the
+        context is already done or in progress (or precomputation is off).
+        """
+        if not self.enabled or not context:
+            return False
+
+        fingerprint = self._fingerprint(context)
+        with self._lock:
+            if fingerprint in self._in_progress or self._completed.get(fingerprint):
+                return False
+            self._in_progress.add(fingerprint)
+
+        # Start from an empty context: the task outlives the request that
+        # scheduled it and must not inherit its deadline
+        loop = asyncio.get_running_loop()
+        task = contextvars.Context().run(loop.create_task, self._run(fingerprint, context))
+        # Keep a reference so the task is not garbage-collected mid-flight
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return True
+
+    async def precompute(self, context: Dict[str, Any]) -> int:
+        """Generate and cache answers for a context now; returns how many were stored"""
+        fingerprint = self._fingerprint(context)
+        with self._lock:
+            self._in_progress.add(fingerprint)
+        return await self._run(fingerprint, context)
+
+    async def _run(self, fingerprint: str, context: Dict[str, Any]) -> int:
+        semaphore = asyncio.Semaphore(self.concurrency)
+        stored = failed = 0
+
+        async def answer(prompt: str) -> None:
+            nonlocal stored, failed
+            async with semaphore:
+                try:
+                    result = await self.generate(prompt, context)
+                except Exception as e:
+                    print(f"⚠️  Precomputing '{prompt}' failed: {e}")
+                    failed += 1
+                    return
+            if result is None:
+                return  # Skipped on purpose
+            if result.get("success"):
+                self._answers.set(f"{fingerprint}|{_normalize_prompt(prompt)}", result)
+                stored += 1
+            else:
+                failed += 1
+
+        try:
+            await asyncio.gather(*(answer(prompt) for prompt in self.suggestions(context)))
+            # Only a clean run is final; after a failure or timeout the next schedule() retries
+            if not failed:
+                self._completed.set(fingerprint, True)
+            if stored:
+                print(f"🧮 Precomputed {stored} suggestion answer(s)")
+        finally:
+            with self._lock:
+                self._in_progress.discard(fingerprint)
+        return stored
+
+    async def aclose(self) -> None:
+        """Cancel precomputations still running (e.g. on shutdown)"""
+        for task in list(self._tasks):
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "answers": len(self._answers),
+                "contexts": len(self._completed),
+                "in_progress": len(self._in_progress),
+            }
@@ -0,0 +1,76 @@
+"""
+Tests for the vectorized cohort generator (data/bulk_generator.py)
+"""
+
+import sys
+import json
+from datetime import date, timedelta
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent))
+
+import pytest
+
+from data.bulk_generator import BulkCohort
+from data.data_generator import StudentDataGenerator
+
+TODAY = date(2026, 3, 1)
+
+
+def _shape(value):
+    """Nested keys and value types of a record (list contents are checked separately)"""
+    if isinstance(value, dict):
+        return {key: _shape(item) for key, item in value.items()}
+    return type(value).__name__
+
+
+def test_same_seed_gives_the_same_cohort():
+    first = list(BulkCohort(30, seed=7, today=TODAY))
+    assert first == list(BulkCohort(30, seed=7, today=TODAY))
+    assert first != list(BulkCohort(30, seed=8, today=TODAY))
+
+
+def test_records_match_the_single_student_generator():
+    record = BulkCohort(5, seed=1, today=TODAY)[0]
+    expected = StudentDataGenerator.generate_complete_student_data()
+    assert set(record) == set(expected)
+    for key in ("student_profile", "availability", "productivity_pattern", "historical_behavior"):
+        assert _shape(record[key]) == _shape(expected[key])
+    for key in ("courses", "tasks", "grades"):
+        assert record[key] and set(record[key][0]) == set(expected[key][0])
+    slots = [slot for day in record["availability"]["weekly_schedule"].values() for slot in day]
+    assert slots and all(set(slot) == {"start", "end"} for slot in slots)
+    assert set(record["attendance"]) == {course["course_id"] for course in record["courses"]}
+    json.dumps(record)  # Plain Python values only
+
+
+def test_records_are_consistent_within_a_student():
+    for record in BulkCohort(50, seed=3, today=TODAY):
+        course_ids = {course["course_id"] for course in record["courses"]}
+        assert {task["course_id"] for task in record["tasks"]} <= course_ids
+        assert {grade["course_id"] for grade in record["grades"]} <= course_ids
+        for task in record["tasks"]:
+            assert date.fromisoformat(task["deadline"]) >= TODAY
+        for grade in record["grades"]:
+            assert TODAY - timedelta(days=365) <= date.fromisoformat(grade["date"]) <= TODAY
+
+
+def test_indexing_and_ranges():
+    cohort = BulkCohort(12, seed=5, first_id=100, today=TODAY)
+    records = list(cohort)
+    assert len(cohort) == len(records) == 12
+    assert [record["student_profile"]["student_id"] for record in records[:2]] == ["S-2026-0100", "S-2026-0101"]
+    assert cohort[-1] == records[-1]
+    assert cohort[4] == cohort.record(4) == records[4]
+    assert list(cohort.records(3, 7)) == records[3:7]
+    assert list(cohort.records(10, 50)) == records[10:]
+    with pytest.raises(IndexError):
+        cohort[12]
+
+
+def test_generate_cohort_returns_a_bulk_cohort():
+    cohort = StudentDataGenerator.generate_cohort(3, seed=2, first_id=5, today=TODAY)
+    assert isinstance(cohort, BulkCohort)
+    assert cohort.student_id(0) == "S-2026-0005"
+    assert list(cohort) == list(BulkCohort(3, seed=2, first_id=5, today=TODAY))
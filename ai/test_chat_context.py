@@ -0,0 +1,89 @@
+"""
+Tests for message-relevant student context selection (chat_context.py)
+"""
+
+import sys
+from datetime import date
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent))
+
+from chat_context import StudentContextIndex, context_fingerprint, select_context_items, tokenize
+
+TODAY = date(2026, 3, 2)
+
+PLANNER_CONTEXT = {
+    "courses": [
+        {"course_id": "ML301", "course_name": "Machine Learning", "instructor": "Dr. Ada", "difficulty_level": 4},
+        {"course_id": "HIS101", "course_name": "World History"},
+    ],
+    "tasks": [
+        {"task_title": "Neural network assignment", "course_name": "Machine Learning", "course_id": "ML301",
+         "task_type": "assignment", "priority": "high", "deadline": "2026-03-04", "current_progress_percentage": 20},
+        {"task_title": "Essay on the Renaissance", "course_name": "World History", "course_id": "HIS101",
+         "task_type": "assignment", "priority": "low", "deadline": "2026-03-30", "current_progress_percentage": None},
+        {"task_title": "Midterm review", "course_name": "World History", "course_id": "HIS101",
+         "task_type": "exam", "priority": "medium", "deadline": "2026-03-02", "current_progress_percentage": 0},
+        {"task_title": "Finished quiz", "course_name": "Machine Learning", "priority": "high",
+         "deadline": "2026-03-02", "is_completed": True},
+        {"task_title": "Done reading", "course_name": "World History", "priority": "high",
+         "deadline": "2026-03-02", "current_progress_percentage": 100},
+    ],
+    "grades": [
+        {"course_id": "ML301", "assessment_name": "Quiz 1", "assessment_type": "quiz", "score": 8, "max_score": 10},
+    ],
+    "computed_analytics": {
+        "risk_per_course": [{"course_id": "HIS101", "risk_level": "high", "reason": "missed lectures"}],
+    },
+}
+
+
+def test_tokenize_folds_synonyms_plurals_and_stopwords():
+    assert tokenize("What are my finals and homeworks?") == ["exam", "homework"]
+    assert tokenize("my tests") == ["exam"]
+    assert tokenize("AI401 classes") == ["ai", "401", "course"]
+
+
+def test_completed_and_null_progress_tasks():
+    index = StudentContextIndex(PLANNER_CONTEXT)
+    titles = [item.text for item in index.items if item.kind == "task"]
+    assert len(titles) == 3
+    assert not any("Finished quiz" in title or "Done reading" in title for title in titles)
+    # A null progress is an open task, rendered without a percentage
+    assert "Task [low]: Essay on the Renaissance (World History), due 2026-03-30" in titles
+
+
+def test_keyword_match_ranks_first():
+    lines = select_context_items(PLANNER_CONTEXT, "How is my ML grade?", k=3, today=TODAY)
+    assert lines[0].startswith("Grade: Quiz 1 in Machine Learning")
+
+
+def test_acronyms_and_course_codes_match():
+    for query in ("ml homework", "ML301 help"):
+        lines = select_context_items(PLANNER_CONTEXT, query, k=1, today=TODAY)
+        assert "Neural network assignment" in lines[0]
+
+
+def test_generic_question_gets_the_most_pressing_tasks():
+    lines = select_context_items(PLANNER_CONTEXT, "what now?", k=2, today=TODAY)
+    assert [line.split(":")[1].split(" (")[0].strip() for line in lines] == [
+        "Midterm review", "Neural network assignment"
+    ]
+
+
+def test_selection_is_capped_at_k():
+    assert len(select_context_items(PLANNER_CONTEXT, "history essay risk grade course", k=2, today=TODAY)) == 2
+
+
+def test_app_payload_shape_is_accepted():
+    context = {"tasks": [{"title": "Lab report", "courseName": "Chemistry", "priority": "urgent", "deadline": "2026-03-02T23:59:00Z"}]}
+    lines = select_context_items(context, "chemistry", k=3, today=TODAY)
+    assert lines == ["Task [urgent]: Lab report (Chemistry), due 2026-03-02"]
+
+
+def test_fingerprint_ignores_key_order_but_not_values():
+    reordered = dict(reversed(list(PLANNER_CONTEXT.items())))
+    assert context_fingerprint(reordered) == context_fingerprint(PLANNER_CONTEXT)
+    changed = {**PLANNER_CONTEXT, "tasks": PLANNER_CONTEXT["tasks"][1:]}
+    assert context_fingerprint(changed) != context_fingerprint(PLANNER_CONTEXT)
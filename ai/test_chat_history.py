@@ -0,0 +1,131 @@
+"""
+Tests for token-budgeted chat history (chat_history.py)
+"""
+
+import sys
+import asyncio
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent))
+
+from chat_history import HistoryCompactor, estimate_message_tokens, estimate_tokens
+from conversation_store import ConversationStore
+
+
+class MockModeClient:
+    """A client without an API key: summaries are extractive"""
+
+    api_key = None
+
+
+class SummaryClient:
+    """Records summary requests and answers with a fixed summary"""
+
+    api_key = "test"
+
+    def __init__(self, summary: str = "Student is behind on Calculus."):
+        self.summary = summary
+        self.requests = []
+
+    def chat_completion(self, messages, temperature, max_tokens):
+        self.requests.append(messages)
+        return {"choices": [{"message": {"content": self.summary}}]}
+
+    async def achat_completion(self, messages, temperature, max_tokens):
+        return self.chat_completion(messages, temperature, max_tokens)
+
+
+def _history(turns: int, words: int = 40) -> list:
+    return [
+        {"role": "user" if i % 2 == 0 else "assistant", "content": f"Turn {i}. " + "word " * words}
+        for i in range(turns)
+    ]
+
+
+def _tokens(messages: list) -> int:
+    return sum(estimate_message_tokens(message) for message in messages)
+
+
+def test_history_within_budget_is_unchanged():
+    history = _history(4)
+    compactor = HistoryCompactor(MockModeClient(), budget_tokens=_tokens(history))
+    assert compactor.compact(history) == history
+
+
+def test_compacted_history_fits_the_budget():
+    history = _history(40)
+    for budget in (150, 400, 1000):
+        compactor = HistoryCompactor(MockModeClient(), budget_tokens=budget, summary_max_tokens=60)
+        compacted = compactor.compact(history)
+        assert _tokens(compacted) <= budget
+        assert compacted[0]["role"] == "system"
+        assert compacted[0]["content"].startswith("Summary of the earlier conversation")
+        # The newest turns are kept verbatim, in order
+        assert compacted[1:] == history[-(len(compacted) - 1):]
+
+
+def test_summary_at_its_length_cap_still_fits_the_budget():
+    # Short turns pack the window tightly, so the summary header has to be budgeted too
+    history = _history(100, words=1)
+    client = SummaryClient(summary="x" * 60 * 4)
+    compactor = HistoryCompactor(client, store=ConversationStore(), budget_tokens=400, summary_max_tokens=60)
+    compacted = compactor.compact(history, conversation_id="c1")
+    assert client.requests
+    assert _tokens(compacted) <= 400
+
+
+def test_extractive_summary_keeps_the_newest_folded_turns():
+    history = _history(40)
+    compactor = HistoryCompactor(MockModeClient(), budget_tokens=200, summary_max_tokens=30)
+    summary = compactor.compact(history)[0]["content"]
+    assert estimate_tokens(summary.split("\n", 1)[1]) <= 30
+    assert "Turn 0" not in summary
+
+
+def test_stored_summary_only_folds_new_turns():
+    store = ConversationStore()
+    client = SummaryClient()
+    compactor = HistoryCompactor(client, store=store, budget_tokens=300, summary_max_tokens=50)
+    history = _history(20)
+    store.append("c1", *history)
+
+    first = compactor.compact(store.get("c1"), conversation_id="c1")
+    assert first[0]["content"].endswith(client.summary)
+    assert len(client.requests) == 1
+    assert store.get_summary("c1")["summary"] == client.summary
+
+    # Same history again: the stored summary already covers the folded turns
+    assert compactor.compact(store.get("c1"), conversation_id="c1") == first
+    assert len(client.requests) == 1
+
+    # Two new turns push two more out of the window; only those are summarized
+    store.append("c1", *_history(2))
+    compactor.compact(store.get("c1"), conversation_id="c1")
+    assert len(client.requests) == 2
+    request = client.requests[1][1]["content"]
+    assert request.startswith(f"Existing summary:\n{client.summary}")
+    assert "Turn 0." not in request
+
+
+def test_client_supplied_history_never_calls_the_llm():
+    client = SummaryClient()
+    compactor = HistoryCompactor(client, budget_tokens=200)
+    compacted = compactor.compact(_history(20))
+    assert client.requests == []
+    assert compacted[0]["role"] == "system"
+
+
+def test_failed_summary_falls_back_to_extractive():
+    client = SummaryClient(summary="")
+    store = ConversationStore()
+    compactor = HistoryCompactor(client, store=store, budget_tokens=200, summary_max_tokens=40)
+    compacted = compactor.compact(_history(20), conversation_id="c1")
+    assert "Student: Turn" in compacted[0]["content"] or "Assistant: Turn" in compacted[0]["content"]
+
+
+def test_async_compaction_matches_sync():
+    history = _history(30)
+    compactor = HistoryCompactor(MockModeClient(), budget_tokens=250, summary_max_tokens=40)
+    assert asyncio.run(compactor.acompact(history)) == compactor.compact(history)
+    assert asyncio.run(compactor.acompact([])) == []
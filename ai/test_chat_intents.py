@@ -0,0 +1,85 @@
+"""
+Tests for deterministic chat intents (chat_intents.py)
+"""
+
+import sys
+from datetime import date
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent))
+
+import pytest
+
+from chat_intents import answer_intent, detect_intent
+
+TODAY = date(2026, 3, 2)
+
+CONTEXT = {
+    "tasks": [
+        {"title": "Lab report", "courseName": "Chemistry", "priority": "urgent", "deadline": "2026-03-03",
+         "estimated_duration_minutes": 120, "current_progress_percentage": 50},
+        {"title": "Reading notes", "courseName": "History", "priority": "low", "deadline": "2026-03-20"},
+        {"title": "Problem set", "courseName": "Calculus", "priority": "medium", "deadline": "2026-03-03"},
+        {"title": "Old quiz", "courseName": "Calculus", "priority": "high", "deadline": "2026-02-20",
+         "is_completed": True},
+        {"title": "Untracked", "courseName": "Art", "priority": "high", "deadline": "2026-02-25",
+         "current_progress_percentage": None},
+    ]
+}
+
+
+@pytest.mark.parametrize("message, intent", [
+    ("What urgent tasks should I do first?", "urgent_first"),
+    ("which tasks are most urgent", "urgent_first"),
+    ("What’s urgent?", "urgent_first"),
+    ("Help me prioritize my tasks", "prioritize"),
+    ("Prioritise my tasks for me!", "prioritize"),
+    ("what are my top priorities", "prioritize"),
+    ("What should I study now?", "study_now"),
+    ("what's next", "study_now"),
+    ("Help me prepare for my deadline", "next_deadline"),
+    ("When is my next deadline?", "next_deadline"),
+])
+def test_structured_questions_are_recognized(message, intent):
+    assert detect_intent(message).name == intent
+
+
+@pytest.mark.parametrize("message", [
+    "I'm feeling overwhelmed",
+    "What should I study now for my chemistry exam on Friday?",
+    "Can you explain what urgent means?",
+    "help me prioritize",
+    "",
+])
+def test_other_messages_go_to_the_llm(message):
+    assert detect_intent(message) is None
+
+
+def test_urgent_first_orders_by_pressure():
+    answer = answer_intent("What urgent tasks should I do first?", CONTEXT, TODAY)
+    assert answer["intent"] == "urgent_first"
+    lines = answer["message"].splitlines()
+    assert lines[0] == "You have 3 urgent tasks. Do them in this order:"
+    assert lines[1].startswith("1. **Untracked** (Art) - overdue by 5 days")
+    assert "Old quiz" not in answer["message"]
+
+
+def test_study_now_suggests_sessions_for_long_tasks():
+    context = {"tasks": [{**CONTEXT["tasks"][0], "current_progress_percentage": 0}]}
+    answer = answer_intent("what should i study now", context, TODAY)["message"]
+    assert answer.startswith("Study this now: **Lab report** (Chemistry) - due tomorrow, urgent priority, ~2.0h left")
+    assert "45-minute sessions" in answer
+
+
+def test_next_deadline_skips_overdue_and_lists_same_day_tasks():
+    answer = answer_intent("When is my next deadline?", CONTEXT, TODAY)["message"]
+    assert answer.startswith("Your next deadline is **Lab report**")
+    assert "Plan about 60 minutes a day" in answer
+    assert "Also due the same day:\n1. **Problem set**" in answer
+
+
+def test_no_answer_without_context_or_open_tasks():
+    assert answer_intent("Help me prioritize my tasks", None, TODAY) is None
+    done = {"tasks": [{"title": "Done", "is_completed": True}]}
+    assert answer_intent("Help me prioritize my tasks", done, TODAY) is None
@@ -0,0 +1,190 @@
+"""
+Tests for the per-provider circuit breaker and request deadlines
+(planner_llm/circuit_breaker.py, planner_llm/deadline.py)
+"""
+
+import sys
+import time
+import asyncio
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent))
+
+import pytest
+
+from planner_llm.circuit_breaker import CircuitBreaker, CircuitOpenError
+from planner_llm.deadline import DeadlineExceeded, bounded_timeout, deadline_scope, remaining
+
+
+def _open_breaker(clock, **options) -> CircuitBreaker:
+    breaker = CircuitBreaker("test", error_threshold=0.5, min_requests=4, reset_timeout=30, **options)
+    for _ in range(4):
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    return breaker
+
+
+def test_stays_closed_below_min_requests_and_threshold(clock):
+    breaker = CircuitBreaker("test", error_threshold=0.5, min_requests=4, reset_timeout=30)
+    for _ in range(3):
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    breaker = CircuitBreaker("test", error_threshold=0.5, min_requests=4, reset_timeout=30)
+    for outcome in (True, True, True, False, True, False):
+        breaker.record_success() if outcome else breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.snapshot() == {"state": "closed", "recent_failures": 2, "recent_requests": 6}
+
+
+def test_opens_at_error_threshold_and_rejects_calls(clock):
+    breaker = _open_breaker(clock)
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_half_open_after_reset_timeout_admits_one_probe(clock):
+    breaker = _open_breaker(clock)
+    clock[0] += 29
+    assert breaker.state == CircuitBreaker.OPEN
+    clock[0] += 1
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+    assert breaker.before_call() is not None
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_probe_success_closes_and_failure_reopens(clock):
+    breaker = _open_breaker(clock)
+    clock[0] += 30
+    breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.before_call() is None
+
+    breaker = _open_breaker(clock)
+    clock[0] += 30
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_released_probe_frees_the_slot(clock):
+    breaker = _open_breaker(clock)
+    clock[0] += 30
+    probe = breaker.before_call()
+    breaker.release(probe)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.before_call() is not None
+
+
+def test_stale_probe_token_is_ignored(clock):
+    breaker = _open_breaker(clock)
+    clock[0] += 30
+    stale = breaker.before_call()
+    breaker.record_failure()  # Another path re-opened the circuit
+    clock[0] += 30
+    breaker.before_call()
+    breaker.release(stale)
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_abandoned_probe_times_out_back_to_open(clock):
+    breaker = _open_breaker(clock, probe_timeout=10)
+    clock[0] += 30
+    breaker.before_call()
+    clock[0] += 9
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    clock[0] += 1
+    assert breaker.state == CircuitBreaker.OPEN
+    # ...and probes again after the next reset timeout
+    clock[0] += 30
+    assert breaker.before_call() is not None
+
+
+def test_cancelled_probe_does_not_lock_the_breaker():
+    pytest.importorskip("uvicorn")
+    from mock_provider import MockProviderConfig, MockProviderServer
+    from planner_llm.llm_client import OpenAICompatibleClient
+
+    with MockProviderServer(MockProviderConfig(latency="fixed:1")) as server:
+        client = OpenAICompatibleClient(api_key="test", api_base_url=server.base_url, use_cache=False, coalesce=False)
+        breaker = CircuitBreaker("mock", error_threshold=0.5, min_requests=1, reset_timeout=0.01)
+        client.circuit_breaker = breaker
+        breaker.record_failure()
+        time.sleep(0.02)
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+
+        async def cancel_probe():
+            probe = asyncio.ensure_future(client.achat_completion([{"role": "user", "content": "hi"}]))
+            await asyncio.sleep(0.2)
+            probe.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await probe
+            await client.aclose()
+
+        asyncio.run(cancel_probe())
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert breaker.before_call() is not None
+
+
+def test_short_caller_deadline_does_not_open_the_circuit():
+    pytest.importorskip("uvicorn")
+    from mock_provider import MockProviderConfig, MockProviderServer
+    from planner_llm.llm_client import OpenAICompatibleClient
+
+    messages = [{"role": "user", "content": "hi"}]
+    with MockProviderServer(MockProviderConfig(latency="fixed:1")) as server:
+        client = OpenAICompatibleClient(api_key="test", api_base_url=server.base_url, use_cache=False, coalesce=False)
+        breaker = CircuitBreaker("mock", error_threshold=0.5, min_requests=1, reset_timeout=30)
+        client.circuit_breaker = breaker
+
+        # Clamped httpx timeout (sync) and cancelled attempt (async)
+        with deadline_scope(0.2):
+            assert not client.chat_completion(messages)["success"]
+
+        async def short_call():
+            with deadline_scope(0.2):
+                result = await client.achat_completion(messages)
+            await client.aclose()
+            return result
+
+        assert not asyncio.run(short_call())["success"]
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert breaker.snapshot()["recent_failures"] == 0
+
+
+def test_deadline_scopes_nest_and_only_shorten():
+    assert remaining() is None
+    with deadline_scope(10):
+        with deadline_scope(60):
+            assert remaining() <= 10
+        with deadline_scope(1):
+            assert remaining() <= 1
+            assert bounded_timeout(60) <= 1
+        assert 1 < remaining() <= 10
+    assert remaining() is None
+    assert bounded_timeout(60) == 60
+
+
+def test_spent_deadline_raises():
+    with deadline_scope(0.01):
+        time.sleep(0.02)
+        with pytest.raises(DeadlineExceeded):
+            bounded_timeout(60)
+
+
+def test_deadline_follows_asyncio_tasks():
+    async def child():
+        return remaining()
+
+    async def main():
+        with deadline_scope(5):
+            return await asyncio.ensure_future(child())
+
+    assert 0 < asyncio.run(main()) <= 5
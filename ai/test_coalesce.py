@@ -0,0 +1,137 @@
+"""
+Tests for single-flight coalescing of identical LLM requests (planner_llm/coalesce.py)
+"""
+
+import sys
+import time
+import asyncio
+import threading
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent))
+
+import pytest
+
+from planner_llm.coalesce import SingleFlight
+
+
+def _wait_for(condition, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.005)
+
+
+def _run_threads(flight: SingleFlight, fn, waiters: int):
+    """Start a leader and `waiters` followers on one key; returns (results, errors)"""
+    results, errors = [], []
+
+    def call():
+        try:
+            results.append(flight.do("key", fn))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(waiters + 1)]
+    for thread in threads:
+        thread.start()
+    return threads, results, errors
+
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def fn():
+        calls.append(1)
+        release.wait(5)
+        return {"choices": ["plan"]}
+
+    threads, results, errors = _run_threads(flight, fn, waiters=4)
+    _wait_for(lambda: flight.stats()["coalesced"] == 4)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert errors == []
+    assert results == [{"choices": ["plan"]}] * 5
+    # Every caller gets its own copy
+    assert len({id(result) for result in results}) == 5
+    assert flight.stats() == {"calls": 1, "coalesced": 4, "in_flight": 0}
+
+
+def test_leader_error_reaches_every_waiter():
+    flight = SingleFlight()
+    release = threading.Event()
+    error = RuntimeError("provider down")
+
+    def fn():
+        release.wait(5)
+        raise error
+
+    threads, results, errors = _run_threads(flight, fn, waiters=3)
+    _wait_for(lambda: flight.stats()["coalesced"] == 3)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert results == []
+    assert errors == [error] * 4
+
+
+def test_failed_call_is_not_remembered():
+    flight = SingleFlight()
+
+    def fail():
+        raise ValueError("bad")
+
+    with pytest.raises(ValueError):
+        flight.do("key", fail)
+    assert flight.do("key", lambda: "ok") == "ok"
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_async_error_propagates_to_all_waiters():
+    flight = SingleFlight()
+    calls = []
+
+    async def factory():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        raise RuntimeError("provider down")
+
+    async def main():
+        results = await asyncio.gather(
+            *(flight.ado("key", factory) for _ in range(5)),
+            return_exceptions=True
+        )
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert len(calls) == 1
+        assert flight.stats()["in_flight"] == 0
+        # The next request is a fresh call
+        assert await flight.ado("key", lambda: asyncio.sleep(0, result="ok")) == "ok"
+
+    asyncio.run(main())
+
+
+def test_cancelled_caller_does_not_cancel_the_shared_call():
+    flight = SingleFlight()
+
+    async def factory():
+        await asyncio.sleep(0.05)
+        return {"choices": ["plan"]}
+
+    async def main():
+        leader = asyncio.ensure_future(flight.ado("key", factory))
+        follower = asyncio.ensure_future(flight.ado("key", factory))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        assert await follower == {"choices": ["plan"]}
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        assert flight.stats() == {"calls": 1, "coalesced": 1, "in_flight": 0}
+
+    asyncio.run(main())
@@ -0,0 +1,63 @@
+"""
+Tests for the cohort plan generation CLI (ai_service.py --cohort)
+"""
+
+import sys
+from datetime import date
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent))
+
+import pytest
+
+from ai_service import UpGradeAIService, main
+from data.cohort_shards import write_cohort_shards
+
+
+@pytest.fixture
+def shards(tmp_path, monkeypatch):
+    # Mock mode: plans are generated locally without an API key
+    monkeypatch.setenv("LLM_PROVIDER", "deepseek")
+    monkeypatch.delenv("DEEPSEEK_API_KEY", raising=False)
+    directory = tmp_path / "cohort"
+    write_cohort_shards(6, str(directory), shard_size=4, seed=2, workers=1, today=date(2026, 3, 1))
+    return directory
+
+
+def _run(monkeypatch, *args):
+    monkeypatch.setattr(sys, "argv", ["ai_service.py", *args])
+    return main()
+
+
+def test_cohort_from_a_shard_directory(shards, tmp_path, monkeypatch):
+    output_dir = str(tmp_path / "output")
+    summary = _run(monkeypatch, "--cohort", str(shards), "--output-dir", output_dir, "--concurrency", "3")
+    assert (summary["queued"], summary["generated"], summary["failed"]) == (6, 6, 0)
+    assert summary["failed_ids"] == []
+
+    again = _run(monkeypatch, "--cohort", str(shards), "--output-dir", output_dir)
+    assert (again["generated"], again["skipped"]) == (0, 6)
+
+    export_dir = tmp_path / "plans"
+    assert _run(monkeypatch, "--output-dir", output_dir, "--export-plans", str(export_dir)) == 6
+    assert len(list(export_dir.glob("study_plan_S-2026-*.md"))) == 6
+
+
+def test_failed_students_are_reported_and_fail_the_run(shards, tmp_path, monkeypatch):
+    generate = UpGradeAIService.agenerate_study_plan
+
+    async def flaky(self, student_data, **kwargs):
+        if student_data["student_profile"]["student_id"] == "S-2026-0004":
+            raise RuntimeError("provider down")
+        return await generate(self, student_data, **kwargs)
+
+    monkeypatch.setattr(UpGradeAIService, "agenerate_study_plan", flaky)
+    with pytest.raises(SystemExit) as exit_info:
+        _run(monkeypatch, "--cohort", str(shards), "--output-dir", str(tmp_path / "output"))
+    assert exit_info.value.code == 1
+
+    # The failed student is retried on the next run; the others are not redone
+    monkeypatch.setattr(UpGradeAIService, "agenerate_study_plan", generate)
+    summary = _run(monkeypatch, "--cohort", str(shards), "--output-dir", str(tmp_path / "output"))
+    assert (summary["generated"], summary["skipped"], summary["failed"]) == (1, 5, 0)
@@ -0,0 +1,79 @@
+"""
+Tests for sharded cohort files (data/cohort_shards.py)
+"""
+
+import sys
+import json
+from datetime import date
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent))
+
+import pytest
+
+from data.bulk_generator import BulkCohort
+from data.cohort_shards import (
+    MANIFEST_NAME, iter_cohort_records, shard_seed, write_cohort_shards, write_jsonl, write_parquet
+)
+from data.student_index import IndexedStudentFile
+
+TODAY = date(2026, 3, 1)
+
+
+def _ids(records):
+    return [record["student_profile"]["student_id"] for record in records]
+
+
+def test_shards_round_trip_in_order(tmp_path):
+    manifest = write_cohort_shards(20, str(tmp_path), shard_size=7, seed=11, workers=2, today=TODAY)
+
+    assert (manifest["format"], manifest["seed"], manifest["num_students"]) == ("jsonl", 11, 20)
+    assert manifest["generated_for"] == "2026-03-01"
+    assert [(shard["file"], shard["first_id"], shard["count"]) for shard in manifest["shards"]] == [
+        ("students-00000.jsonl", 0, 7), ("students-00001.jsonl", 7, 7), ("students-00002.jsonl", 14, 6)
+    ]
+    assert [shard["seed"] for shard in manifest["shards"]] == [shard_seed(11, index) for index in range(3)]
+    with open(tmp_path / MANIFEST_NAME, 'r', encoding='utf-8') as f:
+        assert json.load(f) == manifest
+
+    records = list(iter_cohort_records(str(tmp_path)))
+    assert _ids(records) == [f"S-2026-{i:04d}" for i in range(20)]
+    # Each shard is exactly the bulk cohort its manifest entry describes
+    shard = manifest["shards"][1]
+    expected = BulkCohort(shard["count"], seed=shard["seed"], first_id=shard["first_id"], today=TODAY, id_width=4)
+    assert records[7:14] == list(expected)
+    assert list(iter_cohort_records(str(tmp_path / "students-00002.jsonl"))) == records[14:]
+
+
+def test_same_seed_gives_the_same_shards_for_any_worker_count(tmp_path):
+    write_cohort_shards(10, str(tmp_path / "a"), shard_size=4, seed=3, workers=1, today=TODAY)
+    write_cohort_shards(10, str(tmp_path / "b"), shard_size=4, seed=3, workers=3, today=TODAY)
+    for name in ("students-00000.jsonl", "students-00001.jsonl", "students-00002.jsonl"):
+        assert (tmp_path / "a" / name).read_bytes() == (tmp_path / "b" / name).read_bytes()
+
+
+def test_jsonl_shards_are_indexed(tmp_path):
+    write_cohort_shards(9, str(tmp_path), shard_size=5, seed=4, workers=1, today=TODAY)
+    with IndexedStudentFile(str(tmp_path / "students-00001.jsonl")) as students:
+        assert len(students) == 4
+        assert students["S-2026-0007"]["student_profile"]["student_id"] == "S-2026-0007"
+        assert "S-2026-0002" not in students
+
+
+def test_parquet_round_trip_matches_jsonl(tmp_path):
+    pytest.importorskip("pyarrow")
+    records = list(BulkCohort(25, seed=9, today=TODAY))
+    assert write_jsonl(records, tmp_path / "cohort.jsonl") == 25
+    assert write_parquet(records, tmp_path / "cohort.parquet", row_group_size=10) == 25
+
+    assert list(iter_cohort_records(str(tmp_path / "cohort.parquet"))) == records
+    assert list(iter_cohort_records(str(tmp_path / "cohort.jsonl"))) == records
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+@pytest.mark.parametrize("options", [{"fmt": "csv"}, {"shard_size": 0}])
+def test_invalid_options_are_rejected(tmp_path, options):
+    with pytest.raises(ValueError):
+        write_cohort_shards(5, str(tmp_path), **options)
+    assert not (tmp_path / MANIFEST_NAME).exists()
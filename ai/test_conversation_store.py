@@ -0,0 +1,103 @@
+"""
+Tests for server-side chat history (conversation_store.py)
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent))
+
+import pytest
+
+from conversation_store import ConversationStore
+
+
+def _message(i: int) -> dict:
+    return {"role": "user" if i % 2 == 0 else "assistant", "content": f"message {i}"}
+
+
+def test_append_and_get_round_trip():
+    store = ConversationStore()
+    store.append("c1", _message(0), {**_message(1), "extra": "dropped"})
+    assert store.get("c1") == [_message(0), _message(1)]
+    assert store.get("unknown") == []
+
+
+def test_get_returns_a_copy():
+    store = ConversationStore()
+    store.append("c1", _message(0))
+    store.get("c1")[0]["content"] = "changed"
+    assert store.get("c1") == [_message(0)]
+
+
+def test_only_the_newest_messages_are_kept():
+    store = ConversationStore(max_messages=3)
+    store.append("c1", *[_message(i) for i in range(5)])
+    assert store.get("c1") == [_message(2), _message(3), _message(4)]
+
+
+def test_lru_eviction_without_disk_forgets_the_conversation():
+    store = ConversationStore(max_conversations=2)
+    store.append("a", _message(0))
+    store.append("b", _message(0))
+    store.get("a")  # "b" is now the least recently used
+    store.append("c", _message(0))
+    assert store.get("b") == []
+    assert store.get("a") == [_message(0)]
+    assert store.stats()["memory_conversations"] == 2
+
+
+def test_evicted_conversation_is_reloaded_from_sqlite(tmp_path):
+    store = ConversationStore(max_conversations=1, db_path=str(tmp_path / "chat.db"))
+    store.append("a", _message(0))
+    store.set_summary("a", {"text": "older turns", "covered": 4})
+    store.append("b", _message(0))
+    assert "a" not in store._memory
+
+    assert store.get("a") == [_message(0)]
+    assert "a" in store._memory
+    assert store.get_summary("a") == {"text": "older turns", "covered": 4}
+    # New messages extend the reloaded history
+    store.append("a", _message(1))
+    assert store.get("a") == [_message(0), _message(1)]
+    store.close()
+
+
+def test_conversations_survive_a_restart(tmp_path):
+    path = str(tmp_path / "chat.db")
+    first = ConversationStore(db_path=path)
+    first.append("a", _message(0), _message(1))
+    first.close()
+
+    second = ConversationStore(db_path=path)
+    assert second.get("a") == [_message(0), _message(1)]
+    second.close()
+
+
+def test_idle_conversations_expire_in_both_tiers(tmp_path, clock):
+    store = ConversationStore(ttl_seconds=60, db_path=str(tmp_path / "chat.db"))
+    store.append("old", _message(0))
+    clock[0] += 30
+    store.append("new", _message(0))
+    clock[0] += 40
+
+    assert store.get("old") == []
+    assert store.disk.get("old") is None
+    assert store.get("new") == [_message(0)]
+
+    clock[0] += 100
+    assert store.purge_expired() == 1
+    assert store.stats()["memory_conversations"] == 0
+    store.close()
+
+
+def test_delete_removes_messages_and_summary(tmp_path):
+    store = ConversationStore(db_path=str(tmp_path / "chat.db"))
+    store.append("a", _message(0))
+    store.set_summary("a", {"text": "summary"})
+    store.delete("a")
+    assert store.get("a") == []
+    assert store.get_summary("a") is None
+    assert store.disk.get_summary("a") is None
+    store.close()
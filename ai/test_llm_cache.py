@@ -0,0 +1,113 @@
+"""
+Tests for the two-tier LLM completion cache (planner_llm/cache.py)
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent))
+
+import pytest
+
+from planner_llm.cache import CompletionCache, LRUTTLCache, SQLiteCacheTier, make_cache_key
+
+
+RESPONSE = {"choices": [{"message": {"role": "assistant", "content": "Study calculus first."}}]}
+
+
+def test_memory_entries_expire_after_ttl(clock):
+    cache = LRUTTLCache(max_entries=10, ttl_seconds=60)
+    cache.set("a", 1)
+    clock[0] += 59
+    assert cache.get("a") == 1
+    clock[0] += 2
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_per_entry_ttl_overrides_default(clock):
+    cache = LRUTTLCache(max_entries=10, ttl_seconds=60)
+    cache.set("short", 1, ttl_seconds=5)
+    cache.set("long", 2)
+    clock[0] += 10
+    assert cache.get("short") is None
+    assert cache.get("long") == 2
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = LRUTTLCache(max_entries=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # "b" is now the least recently used
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_disk_tier_expires_and_purges(tmp_path, clock):
+    tier = SQLiteCacheTier(str(tmp_path / "cache.db"), ttl_seconds=100)
+    tier.set("a", {"x": 1})
+    tier.set("b", {"x": 2}, ttl_seconds=10)
+    clock[0] += 50
+    assert tier.get("a") == {"x": 1}
+    assert tier.get("b") is None
+    clock[0] += 100
+    assert tier.purge_expired() == 1
+    assert tier.get("a") is None
+    tier.close()
+
+
+def test_disk_hit_is_promoted_to_memory(tmp_path):
+    path = str(tmp_path / "cache.db")
+    first = CompletionCache(disk_path=path)
+    first.set("k", RESPONSE)
+    first.disk.close()
+
+    # A fresh process only has the disk tier
+    second = CompletionCache(disk_path=path)
+    assert second.get("k") == RESPONSE
+    assert len(second.memory) == 1
+    assert second.get("k") == RESPONSE
+    stats = second.stats()
+    assert (stats["disk_hits"], stats["memory_hits"], stats["misses"]) == (1, 1, 0)
+    second.disk.close()
+
+
+def test_memory_eviction_falls_back_to_disk(tmp_path):
+    cache = CompletionCache(max_entries=1, disk_path=str(tmp_path / "cache.db"))
+    cache.set("a", RESPONSE)
+    cache.set("b", RESPONSE)
+    assert cache.memory.get("a") is None
+    assert cache.get("a") == RESPONSE
+    assert cache.stats()["disk_hits"] == 1
+    cache.disk.close()
+
+
+def test_cached_responses_are_copies():
+    cache = CompletionCache()
+    cache.set("k", RESPONSE)
+    cache.get("k")["choices"].clear()
+    assert cache.get("k") == RESPONSE
+
+
+def test_errors_and_hot_requests_are_not_cached():
+    cache = CompletionCache(max_temperature=0.5)
+    cache.set("error", {"error": "rate limited"})
+    cache.set("empty", {"choices": []})
+    assert cache.get("error") is None
+    assert cache.get("empty") is None
+    assert cache.is_cacheable(0.5)
+    assert not cache.is_cacheable(0.9)
+    assert not cache.is_cacheable(0.2, stream=True)
+    assert cache.stats()["bypassed"] == 2
+
+
+def test_cache_key_ignores_cosmetic_differences():
+    base = make_cache_key("m", [{"role": "user", "content": "Plan my  week"}], 0.3, 100)
+    assert base == make_cache_key("m", [{"role": "user", "content": " Plan my week ", "name": "x"}], 0.3, 100)
+    assert base != make_cache_key("m", [{"role": "user", "content": "Plan my week"}], 0.7, 100)
+    assert base != make_cache_key("m", [{"role": "user", "content": "Plan my week"}], 0.3, 100,
+                                  response_format={"type": "json_object"})
@@ -0,0 +1,91 @@
+"""
+Tests for the OpenAI-compatible mock provider (mock_provider.py) and the
+LLM client's behavior against it
+"""
+
+import sys
+import json
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent))
+
+import pytest
+
+pytest.importorskip("uvicorn")
+from fastapi.testclient import TestClient
+
+from mock_provider import LatencyDistribution, MockProviderConfig, MockProviderServer, create_app
+from planner_llm.llm_client import OpenAICompatibleClient
+from planner_llm.retry import RetryPolicy
+
+MESSAGES = [{"role": "user", "content": "Plan my week"}]
+
+
+def _client(config: MockProviderConfig) -> TestClient:
+    return TestClient(create_app(config))
+
+
+def test_completion_shape_and_usage():
+    client = _client(MockProviderConfig(latency="fixed:0", tokens_per_second=0, completion_tokens=5, seed=1))
+    response = client.post("/v1/chat/completions", json={"messages": MESSAGES, "max_tokens": 3})
+    assert response.status_code == 200
+    body = response.json()
+    assert len(body["choices"][0]["message"]["content"].split()) == 3
+    assert body["usage"]["completion_tokens"] == 3
+    assert body["usage"]["total_tokens"] == body["usage"]["prompt_tokens"] + 3
+    assert client.get("/stats").json()["completed"] == 1
+
+
+def test_stream_ends_with_usage_and_done():
+    client = _client(MockProviderConfig(latency="fixed:0", tokens_per_second=0, completion_tokens=4))
+    response = client.post("/chat/completions", json={"messages": MESSAGES, "stream": True})
+    frames = [line[len("data: "):] for line in response.text.splitlines() if line.startswith("data: ")]
+    assert frames[-1] == "[DONE]"
+    chunks = [json.loads(frame) for frame in frames[:-1]]
+    text = "".join(chunk["choices"][0]["delta"].get("content", "") for chunk in chunks)
+    assert len(text.split()) == 4
+    assert chunks[-1]["usage"]["completion_tokens"] == 4
+    assert client.get("/stats").json()["streamed"] == 1
+
+
+def test_requests_per_minute_limit_sends_retry_after():
+    client = _client(MockProviderConfig(latency="fixed:0", tokens_per_second=0, requests_per_minute=2, retry_after=1.5))
+    statuses = [client.post("/v1/chat/completions", json={"messages": MESSAGES}) for _ in range(3)]
+    assert [response.status_code for response in statuses] == [200, 200, 429]
+    assert statuses[2].headers["retry-after"] == "1.5"
+    assert client.get("/stats").json()["rate_limited"] == 1
+
+
+def test_injected_server_errors():
+    client = _client(MockProviderConfig(latency="fixed:0", error_rate=1.0))
+    response = client.post("/v1/chat/completions", json={"messages": MESSAGES})
+    assert response.status_code == 500
+    assert client.get("/stats").json()["errors"] == 1
+
+
+@pytest.mark.parametrize("spec", ["fixed:0.3", "uniform:0.1:0.2", "normal:0.1:0.5", "lognormal:0.2:0.5"])
+def test_latency_samples_are_non_negative(spec):
+    latency = LatencyDistribution(spec)
+    samples = [latency.sample() for _ in range(100)]
+    assert all(sample >= 0 for sample in samples)
+    if spec.startswith("uniform"):
+        assert all(0.1 <= sample <= 0.2 for sample in samples)
+
+
+def test_client_retries_through_injected_rate_limits():
+    config = MockProviderConfig(latency="fixed:0", tokens_per_second=0, rate_limit_rate=0.5, retry_after=0, seed=7)
+    with MockProviderServer(config) as server:
+        client = OpenAICompatibleClient(
+            api_key="test",
+            api_base_url=server.base_url,
+            use_cache=False,
+            coalesce=False,
+            retry_policy=RetryPolicy(max_retries=10, base_delay=0.01)
+        )
+        for _ in range(5):
+            assert client.chat_completion(MESSAGES)["choices"]
+        client.close()
+        counts = server.stats.counts
+    assert counts["completed"] == 5
+    assert counts["requests"] == counts["completed"] + counts["rate_limited"]
@@ -0,0 +1,104 @@
+"""
+Tests for reusing stored plans for unchanged student data (plan_cache.py)
+"""
+
+import sys
+import copy
+from datetime import date
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent))
+
+import pytest
+
+from plan_cache import days_left_by_deadline, plan_cache_for, plan_fingerprint
+from plan_store import close_plan_stores
+
+STUDENT = {
+    "student_profile": {"student_id": "S-1", "name": "Ana Silva"},
+    "tasks": [
+        {"task_id": "T1", "deadline": "2026-03-10", "current_progress_percentage": 0},
+        {"task_id": "T2", "deadline": "2026-03-10", "current_progress_percentage": 50},
+        {"task_id": "T3", "deadline": "2026-03-20", "current_progress_percentage": 10},
+    ],
+}
+SETTINGS = {"model": "m", "prompt_format": "markdown", "output_format": "markdown"}
+MONDAY, TUESDAY = date(2026, 3, 2), date(2026, 3, 3)
+
+
+@pytest.fixture(autouse=True)
+def _close_stores():
+    yield
+    close_plan_stores()
+
+
+def test_days_left_follow_the_reference_date():
+    assert days_left_by_deadline(STUDENT, MONDAY) == {"2026-03-10": 8, "2026-03-20": 18}
+    assert days_left_by_deadline({"tasks": [{"deadline": "next week"}]}, MONDAY) == {"next week": None}
+    assert days_left_by_deadline({"tasks": []}, MONDAY) == {}
+
+
+def test_fingerprint_ignores_key_order():
+    reordered = {"tasks": STUDENT["tasks"], "student_profile": dict(reversed(list(STUDENT["student_profile"].items())))}
+    assert plan_fingerprint(reordered, MONDAY, **SETTINGS) == plan_fingerprint(STUDENT, MONDAY, **SETTINGS)
+
+
+def test_fingerprint_changes_with_data_and_settings():
+    base = plan_fingerprint(STUDENT, MONDAY, **SETTINGS)
+    changed = copy.deepcopy(STUDENT)
+    changed["tasks"][0]["current_progress_percentage"] = 40
+    assert plan_fingerprint(changed, MONDAY, **SETTINGS) != base
+    assert plan_fingerprint(STUDENT, MONDAY, **{**SETTINGS, "model": "other"}) != base
+    assert plan_fingerprint(STUDENT, MONDAY, **{**SETTINGS, "output_format": "json"}) != base
+
+
+def test_student_without_deadlines_keeps_the_plan_across_days():
+    student = {**STUDENT, "tasks": [{"task_id": "T1", "deadline": None}]}
+    assert plan_fingerprint(student, MONDAY, **SETTINGS) == plan_fingerprint(student, TUESDAY, **SETTINGS)
+    student = {**STUDENT, "tasks": []}
+    assert plan_fingerprint(student, MONDAY, **SETTINGS) == plan_fingerprint(student, TUESDAY, **SETTINGS)
+
+
+def test_moving_countdown_invalidates_the_plan():
+    assert plan_fingerprint(STUDENT, MONDAY, **SETTINGS) != plan_fingerprint(STUDENT, TUESDAY, **SETTINGS)
+
+
+@pytest.mark.parametrize("backend", ["sqlite", "files"])
+def test_cache_round_trip_per_store_backend(tmp_path, monkeypatch, backend):
+    monkeypatch.setenv("PLANNER_PLAN_STORE", backend)
+    cache = plan_cache_for(str(tmp_path))
+    fingerprint = plan_fingerprint(STUDENT, MONDAY, **SETTINGS)
+    assert cache.get(fingerprint) is None
+    cache.set(fingerprint, {"success": True, "study_plan": "v1"})
+    cache.set(fingerprint, {"success": True, "study_plan": "v2"})
+    close_plan_stores()
+
+    assert plan_cache_for(str(tmp_path)).get(fingerprint) == {"success": True, "study_plan": "v2"}
+
+
+def test_cache_can_be_disabled(tmp_path, monkeypatch):
+    monkeypatch.setenv("PLANNER_PLAN_CACHE", "off")
+    assert plan_cache_for(str(tmp_path)) is None
+
+
+def test_unchanged_student_is_served_without_an_llm_call(tmp_path, monkeypatch):
+    pytest.importorskip("uvicorn")
+    from ai_service import UpGradeAIService
+    from data.data_generator import StudentDataGenerator
+    from mock_provider import MockProviderConfig, MockProviderServer
+
+    monkeypatch.setenv("LLM_CACHE", "false")
+    monkeypatch.setenv("PLANNER_PLAN_STORE", "sqlite")
+    student = StudentDataGenerator.generate_complete_student_data()
+    with MockProviderServer(MockProviderConfig(latency="fixed:0", tokens_per_second=0)) as server:
+        service = UpGradeAIService(api_key="test", api_base_url=server.base_url, provider="openai")
+        first = service.generate_study_plan(student, output_dir=str(tmp_path))
+        second = service.generate_study_plan(student, output_dir=str(tmp_path))
+        refreshed = service.generate_study_plan(student, output_dir=str(tmp_path), force_refresh=True)
+        requests = server.stats.counts["requests"]
+
+    assert first["success"] and not first.get("cached")
+    assert second["cached"] and second["study_plan"] == first["study_plan"]
+    assert not refreshed.get("cached")
+    assert requests == 2
@@ -0,0 +1,106 @@
+"""
+Tests for structured JSON study plans and the streaming day parser (planner_llm/formatter.py)
+"""
+
+import sys
+import json
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent))
+
+import pytest
+
+from planner_llm.formatter import PlanFormatError, StudyPlanStreamParser, parse_study_plan
+
+PLAN = {
+    "summary": "Catch up on {Calculus} \"first\", then [History].",
+    "meta": {"days": [{"date": "not a plan day", "slots": []}]},
+    "days": [
+        {
+            "date": "2026-03-02",
+            "day": "Monday",
+            "focus": "Calculus",
+            "slots": [
+                {"start": "09:00", "end": "10:30", "task_ids": ["T1"], "activity": "Problem set \\ part {1}",
+                 "notes": "Use the \"]\" trick"},
+                {"start": "11:00", "end": "11:45", "task_ids": [], "activity": "Review"},
+            ],
+        },
+        {
+            "date": "2026-03-03",
+            "day": "Tuesday",
+            "focus": "History, {essay}",
+            "slots": [{"start": "14:00", "end": "16:00", "task_ids": ["T2"], "activity": "Essay draft ✍️"}],
+        },
+        {"date": "2026-03-04", "slots": []},
+    ],
+    "tips": ["Sleep well"],
+    "risk_alerts": [],
+}
+TEXT = "```json\n" + json.dumps(PLAN, ensure_ascii=False, indent=1) + "\n```"
+KNOWN_TASKS = {"T1", "T2"}
+
+
+def _feed(chunks):
+    parser = StudyPlanStreamParser(KNOWN_TASKS)
+    days = []
+    for chunk in chunks:
+        days += parser.feed(chunk)
+    return parser, days
+
+
+def _dates(days):
+    return [day.date for day in days]
+
+
+def test_whole_reply_parses():
+    plan = parse_study_plan(TEXT, KNOWN_TASKS)
+    assert _dates(plan.days) == ["2026-03-02", "2026-03-03", "2026-03-04"]
+    assert plan.days[0].slots[0].activity == "Problem set \\ part {1}"
+    assert plan.tips == ["Sleep well"]
+    assert plan.to_dict()["days"][1]["focus"] == "History, {essay}"
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, len(TEXT)])
+def test_fixed_size_chunks_emit_every_day_once(size):
+    parser, days = _feed(TEXT[i:i + size] for i in range(0, len(TEXT), size))
+    assert _dates(days) == ["2026-03-02", "2026-03-03", "2026-03-04"]
+    assert [day.to_dict() for day in days] == [day.to_dict() for day in parser.close().days]
+
+
+def test_every_split_point_gives_the_same_days():
+    expected = [day.to_dict() for day in parse_study_plan(TEXT, KNOWN_TASKS).days]
+    for split in range(len(TEXT) + 1):
+        _, days = _feed([TEXT[:split], TEXT[split:]])
+        assert [day.to_dict() for day in days] == expected, f"split at {split}"
+
+
+def test_day_is_emitted_as_soon_as_it_closes():
+    first_day_end = TEXT.index('"2026-03-03"')
+    first_day_end = TEXT.rindex("}", 0, first_day_end) + 1
+    parser = StudyPlanStreamParser(KNOWN_TASKS)
+    assert parser.feed(TEXT[:first_day_end - 1]) == []
+    assert _dates(parser.feed(TEXT[first_day_end - 1:first_day_end])) == ["2026-03-02"]
+    assert parser.days_emitted == 1
+
+
+def test_unknown_task_ids_are_dropped():
+    text = TEXT.replace('"T2"', '"T99"')
+    _, days = _feed([text])
+    assert days[1].slots[0].task_ids == []
+
+
+def test_malformed_day_raises_when_it_completes():
+    text = TEXT.replace('"start": "14:00"', '"start": "2pm"')
+    parser = StudyPlanStreamParser(KNOWN_TASKS)
+    cut = text.index('"2026-03-04"')
+    with pytest.raises(PlanFormatError, match="day 2"):
+        parser.feed(text[:cut])
+
+
+def test_reply_without_json_is_rejected():
+    with pytest.raises(PlanFormatError):
+        parse_study_plan("Sorry, I can't help with that.")
+    with pytest.raises(PlanFormatError):
+        parse_study_plan('{"summary": "no days"}')
@@ -0,0 +1,137 @@
+"""
+Tests for indexed study plan storage (plan_store.py) and resumable cohort runs
+"""
+
+import sys
+import json
+import asyncio
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent))
+
+import pytest
+
+from plan_store import (
+    FilePlanStore, PlanStore, SQLitePlanStore, StoredPlan, close_plan_stores, plan_store_for, register_plan_store
+)
+
+
+def _plan(student_id: str, generated_at: float, text: str = "plan") -> StoredPlan:
+    return StoredPlan(student_id, f"Student {student_id}", generated_at, {"success": True, "study_plan": text})
+
+
+@pytest.fixture(autouse=True)
+def _close_stores():
+    yield
+    close_plan_stores()
+
+
+def test_plan_store_is_abstract():
+    with pytest.raises(TypeError):
+        PlanStore()
+
+    class Incomplete(PlanStore):
+        def put(self, plan):
+            pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_sqlite_round_trip_latest_and_history(tmp_path):
+    store = SQLitePlanStore(str(tmp_path / "plans.db"))
+    store.put(_plan("S-1", 100, "first"))
+    store.put(_plan("S-1", 300, "third"))
+    store.put(_plan("S-1", 200, "second"))
+    store.put(_plan("S-2", 150))
+
+    assert store.latest("S-1").study_plan == "third"
+    assert [plan.study_plan for plan in store.history("S-1")] == ["third", "second", "first"]
+    assert [plan.study_plan for plan in store.history("S-1", limit=1)] == ["third"]
+    assert store.latest("S-3") is None
+    assert store.student_ids() == {"S-1", "S-2"}
+    assert [(plan.student_id, plan.study_plan) for plan in store.latest_plans()] == [("S-1", "third"), ("S-2", "plan")]
+    store.close()
+
+
+def test_sqlite_batches_until_flush_and_survives_reopen(tmp_path):
+    path = str(tmp_path / "plans.db")
+    store = SQLitePlanStore(path, batch_size=3, flush_interval=3600)
+    store.put(_plan("S-1", 1))
+    store.put(_plan("S-2", 2))
+    other = SQLitePlanStore(path)
+    assert other.student_ids() == set()  # Still buffered in the first store
+
+    store.put(_plan("S-3", 3))  # Third plan fills the batch
+    assert other.student_ids() == {"S-1", "S-2", "S-3"}
+    store.put(_plan("S-4", 4))
+    store.close()  # Closing commits the rest
+    assert other.student_ids() == {"S-1", "S-2", "S-3", "S-4"}
+    other.close()
+
+
+def test_file_store_round_trip(tmp_path):
+    store = FilePlanStore(str(tmp_path))
+    store.put(_plan("S-1", 100, "old"))
+    store.put(_plan("S-1", 200, "new"))
+    assert store.latest("S-1").study_plan == "new"
+    assert [plan.study_plan for plan in store.history("S-1")] == ["new"]
+    assert store.student_ids() == {"S-1"}
+    assert (tmp_path / "study_plan_S-1.md").read_text(encoding="utf-8").startswith("# Study Plan for Student S-1")
+
+
+def test_export_writes_the_legacy_layout(tmp_path):
+    store = SQLitePlanStore(str(tmp_path / "plans.db"))
+    store.put(_plan("S-1", 1, "old"))
+    store.put(_plan("S-1", 2, "new"))
+    store.put(_plan("S-2", 1))
+    assert store.export(str(tmp_path / "export")) == 2
+
+    exported = FilePlanStore(str(tmp_path / "export"))
+    assert exported.student_ids() == {"S-1", "S-2"}
+    with open(tmp_path / "export" / "response_S-1.json", encoding="utf-8") as f:
+        assert json.load(f)["study_plan"] == "new"
+    store.close()
+
+
+def test_backend_selection(tmp_path, monkeypatch):
+    monkeypatch.setenv("PLANNER_PLAN_STORE", "files")
+    assert isinstance(plan_store_for(str(tmp_path)), FilePlanStore)
+    assert isinstance(plan_store_for(str(tmp_path), backend="sqlite"), SQLitePlanStore)
+    assert plan_store_for(str(tmp_path), backend="sqlite") is plan_store_for(str(tmp_path), backend="SQLite")
+    with pytest.raises(ValueError):
+        plan_store_for(str(tmp_path), backend="cassandra")
+
+    register_plan_store("memory-test", lambda output_dir: FilePlanStore(output_dir))
+    assert isinstance(plan_store_for(str(tmp_path), backend="memory-test"), FilePlanStore)
+
+
+def test_cohort_run_resumes_from_the_store(tmp_path, monkeypatch):
+    from ai_service import UpGradeAIService
+    from data.data_generator import StudentDataGenerator
+
+    # Mock mode: plans are generated locally without an API key
+    monkeypatch.delenv("DEEPSEEK_API_KEY", raising=False)
+    monkeypatch.setenv("PLANNER_PLAN_STORE", "sqlite")
+    students = StudentDataGenerator.generate_cohort(4, seed=1)
+    source = tmp_path / "cohort.jsonl"
+    with open(source, "w", encoding="utf-8") as f:
+        for student in students:
+            f.write(json.dumps(student) + "\n")
+    output_dir = str(tmp_path / "output")
+
+    # An earlier, interrupted run already stored one student
+    first_id = students[0]["student_profile"]["student_id"]
+    plan_store_for(output_dir).put(_plan(first_id, 1))
+
+    service = UpGradeAIService(provider="deepseek")
+    summary = asyncio.run(service.agenerate_cohort(str(source), output_dir=output_dir, concurrency=2))
+    assert (summary["generated"], summary["skipped"], summary["failed"]) == (3, 1, 0)
+
+    again = asyncio.run(service.agenerate_cohort(str(source), output_dir=output_dir, concurrency=2))
+    assert (again["generated"], again["skipped"]) == (0, 4)
+
+    forced = asyncio.run(service.agenerate_cohort(str(source), output_dir=output_dir, concurrency=2, force=True))
+    assert forced["generated"] == 4
+    assert len(plan_store_for(output_dir).history(first_id)) == 2
@@ -0,0 +1,142 @@
+"""
+Tests for LLM retry backoff and client-side rate limiting
+(planner_llm/retry.py, planner_llm/rate_limit.py)
+"""
+
+import sys
+import time
+from email.utils import formatdate
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent))
+
+import pytest
+
+from planner_llm.deadline import DeadlineExceeded, deadline_scope
+from planner_llm.rate_limit import ProviderRateLimiter, TokenBucket
+from planner_llm.retry import RetryPolicy, parse_retry_after
+
+
+def test_retry_after_delta_seconds():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("1.5") == 1.5
+    assert parse_retry_after("-2") == 0.0
+
+
+def test_retry_after_http_date():
+    seconds = parse_retry_after(formatdate(time.time() + 30, usegmt=True))
+    assert 28 <= seconds <= 30
+    assert parse_retry_after(formatdate(time.time() - 30, usegmt=True)) == 0.0
+
+
+@pytest.mark.parametrize("value", [None, "", "soon", "Mon, 99 Foo"])
+def test_unparseable_retry_after_is_ignored(value):
+    assert parse_retry_after(value) is None
+
+
+def test_backoff_jitter_stays_within_exponential_ceiling():
+    policy = RetryPolicy(max_retries=5, base_delay=0.5, max_delay=4.0)
+    for attempt, ceiling in enumerate([0.5, 1.0, 2.0, 4.0, 4.0, 4.0]):
+        delays = [policy.backoff(attempt) for _ in range(200)]
+        assert all(0 <= delay <= ceiling for delay in delays)
+        # Full jitter: delays spread over the whole range, not clustered at the ceiling
+        assert min(delays) < ceiling / 4
+
+
+def test_retry_after_takes_precedence_with_bounded_jitter():
+    policy = RetryPolicy(base_delay=0.5, max_delay=1.0, max_retry_after=10)
+    for _ in range(200):
+        assert 7.0 <= policy.backoff(0, retry_after=7.0) <= 7.5
+    assert policy.backoff(0, retry_after=11.0) is None
+
+
+def test_retry_limits():
+    policy = RetryPolicy(max_retries=2)
+    assert policy.should_retry_status(429, 0)
+    assert policy.should_retry_status(503, 1)
+    assert not policy.should_retry_status(503, 2)
+    assert not policy.should_retry_status(400, 0)
+    assert policy.should_retry_error(1)
+    assert not policy.should_retry_error(2)
+    assert not RetryPolicy(max_retries=0).should_retry_error(0)
+
+
+def test_bucket_starts_full_then_makes_callers_wait(clock):
+    bucket = TokenBucket(rate_per_minute=60)  # One token per second, capacity 60
+    assert all(bucket.reserve() == 0 for _ in range(60))
+    assert bucket.reserve() == pytest.approx(1.0)
+    # Reservations queue: the next caller waits behind the previous one
+    assert bucket.reserve() == pytest.approx(2.0)
+
+
+def test_bucket_refills_over_time_up_to_capacity(clock):
+    bucket = TokenBucket(rate_per_minute=60, capacity=10)
+    assert bucket.reserve(10) == 0
+    clock[0] += 5
+    assert bucket.reserve(5) == 0
+    assert bucket.reserve(1) == pytest.approx(1.0)
+
+    clock[0] += 3600
+    assert bucket.reserve(10) == 0  # Refill stopped at capacity
+    assert bucket.reserve(1) > 0
+
+
+def test_oversized_request_is_capped_to_capacity(clock):
+    bucket = TokenBucket(rate_per_minute=60, capacity=10)
+    assert bucket.reserve(1000) == 0
+
+
+def test_refund_and_drain(clock):
+    bucket = TokenBucket(rate_per_minute=60, capacity=10)
+    bucket.reserve(10)
+    bucket.refund(4)
+    assert bucket.reserve(4) == 0
+
+    bucket.drain(5)
+    assert bucket.reserve(1) == pytest.approx(6.0)
+
+
+def test_provider_limiter_waits_for_the_slower_bucket(clock):
+    limiter = ProviderRateLimiter(requests_per_minute=600, tokens_per_minute=6000)
+    assert limiter.reserve(6000) == 0
+    # Requests are plentiful, tokens are exhausted: 100 tokens/s refill
+    assert limiter.reserve(500) == pytest.approx(5.0)
+
+    limiter.settle(estimated_tokens=500, actual_tokens=100)
+    assert limiter.tokens.reserve(1) == pytest.approx(1.01)
+
+
+def test_pause_holds_back_every_bucket(clock):
+    limiter = ProviderRateLimiter(requests_per_minute=60, tokens_per_minute=6000)
+    limiter.pause(3)
+    assert limiter.reserve(1) == pytest.approx(4.0)
+
+
+def test_wait_past_max_wait_raises_and_returns_the_reservation(clock):
+    limiter = ProviderRateLimiter(requests_per_minute=60, tokens_per_minute=6000)
+    limiter.pause(2)
+    with pytest.raises(DeadlineExceeded):
+        limiter.acquire(100, max_wait=0.5)
+    # The rejected caller did not push later callers further back
+    assert limiter.reserve(100) == pytest.approx(3.0)
+
+
+def test_429_retry_that_overruns_the_deadline_is_not_attempted():
+    pytest.importorskip("uvicorn")
+    from mock_provider import MockProviderConfig, MockProviderServer
+    from planner_llm.llm_client import OpenAICompatibleClient
+
+    config = MockProviderConfig(latency="fixed:0", tokens_per_second=0, rate_limit_rate=1.0, retry_after=5)
+    with MockProviderServer(config) as server:
+        client = OpenAICompatibleClient(
+            api_key="test", api_base_url=server.base_url, use_cache=False, coalesce=False, requests_per_minute=600
+        )
+        started = time.monotonic()
+        with deadline_scope(1):
+            result = client.chat_completion([{"role": "user", "content": "hi"}])
+        elapsed = time.monotonic() - started
+        client.close()
+
+    assert not result["success"]
+    assert elapsed < 1
@@ -0,0 +1,141 @@
+"""
+Tests for multi-provider routing: failover, hedging and provider health
+(planner_llm/router.py)
+"""
+
+import sys
+import time
+import asyncio
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent))
+
+import pytest
+
+from planner_llm.circuit_breaker import CircuitBreaker
+from planner_llm.llm_client import OpenAICompatibleClient
+from planner_llm.retry import RetryPolicy
+from planner_llm.router import RoutingLLMClient, create_routing_client
+
+MESSAGES = [{"role": "user", "content": "hi"}]
+
+
+def _client(base_url: str) -> OpenAICompatibleClient:
+    client = OpenAICompatibleClient(
+        api_key="test", api_base_url=base_url, use_cache=False, coalesce=False, retry_policy=RetryPolicy(max_retries=0)
+    )
+    # A private breaker, so one test's failures never leak into another's
+    client.circuit_breaker = CircuitBreaker(base_url, error_threshold=0.5, min_requests=1, reset_timeout=30)
+    return client
+
+
+def test_degraded_provider_goes_last_until_it_recovers(clock):
+    router = RoutingLLMClient([_client("http://127.0.0.1:9/a"), _client("http://127.0.0.1:9/b")], names=["a", "b"])
+    assert router._ordered() == [0, 1]
+
+    for _ in range(3):
+        router.health["a"].record_failure()
+    assert router.health_report()["a"]["degraded"]
+    assert router._ordered() == [1, 0]
+
+    clock[0] += 30
+    assert router._ordered() == [0, 1]
+    router.health["a"].record_success(0.1, 100)
+    assert router.health_report()["a"] == {
+        "degraded": False, "error_rate": 0.75, "consecutive_failures": 0, "requests": 4
+    }
+
+
+def test_duplicate_names_are_rejected():
+    with pytest.raises(ValueError):
+        RoutingLLMClient([_client("http://127.0.0.1:9/a"), _client("http://127.0.0.1:9/b")], names=["a", "a"])
+
+
+def test_create_routing_client_normalizes_names(monkeypatch):
+    monkeypatch.setenv("GROQ_API_KEY", "test")
+    monkeypatch.setenv("DEEPSEEK_API_KEY", "test")
+    router = create_routing_client("Groq, deepseek,groq,".split(","))
+    assert router.names == ["groq", "deepseek"]
+    assert set(router.health) == {"groq", "deepseek"}
+
+
+@pytest.fixture
+def servers():
+    pytest.importorskip("uvicorn")
+    from mock_provider import MockProviderConfig, MockProviderServer
+
+    def start(**options):
+        config = {"latency": "fixed:0", "tokens_per_second": 0, **options}
+        server = MockProviderServer(MockProviderConfig(**config))
+        started.append(server.start())
+        return server
+
+    started = []
+    yield start
+    for server in started:
+        server.stop()
+
+
+def test_failover_on_provider_error(servers):
+    failing, healthy = servers(error_rate=1.0), servers()
+    router = RoutingLLMClient([_client(failing.base_url), _client(healthy.base_url)], names=["a", "b"], hedge=False)
+
+    result = router.chat_completion(MESSAGES, max_tokens=50)
+    assert result["provider"] == "b"
+    assert failing.stats.counts["errors"] == 1
+    assert router.health_report()["a"]["consecutive_failures"] == 1
+    router.close()
+
+
+def test_failover_on_open_circuit_skips_the_provider(servers):
+    skipped, healthy = servers(), servers()
+    first = _client(skipped.base_url)
+    first.circuit_breaker.record_failure()
+    router = RoutingLLMClient([first, _client(healthy.base_url)], names=["a", "b"], hedge=False)
+
+    async def call():
+        result = await router.achat_completion(MESSAGES, max_tokens=50)
+        await router.aclose()
+        return result
+
+    assert asyncio.run(call())["provider"] == "b"
+    assert skipped.stats.counts["requests"] == 0
+
+
+def test_hedge_winner_cancels_the_slow_attempt(servers):
+    slow, fast = servers(latency="fixed:2"), servers()
+    router = RoutingLLMClient(
+        [_client(slow.base_url), _client(fast.base_url)], names=["a", "b"], hedge_delay=0.1, min_hedge_delay=0.1
+    )
+
+    async def call():
+        started = time.monotonic()
+        result = await router.achat_completion(MESSAGES, max_tokens=50)
+        elapsed = time.monotonic() - started
+        await asyncio.sleep(0.05)  # Let the cancellation land
+        leftover = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        await router.aclose()
+        return result, elapsed, leftover
+
+    result, elapsed, leftover = asyncio.run(call())
+    assert result["provider"] == "b"
+    assert elapsed < 1
+    assert leftover == []
+    assert slow.stats.counts["requests"] == 1
+    # The cancelled attempt reported nothing: neither a success nor a failure
+    assert router.health_report()["a"]["requests"] == 0
+    assert router.health_report()["b"]["requests"] == 1
+
+
+def test_blocking_hedge_returns_the_first_success(servers):
+    slow, fast = servers(latency="fixed:2"), servers()
+    router = RoutingLLMClient(
+        [_client(slow.base_url), _client(fast.base_url)], names=["a", "b"], hedge_delay=0.1, min_hedge_delay=0.1
+    )
+
+    started = time.monotonic()
+    result = router.chat_completion(MESSAGES, max_tokens=50)
+    assert result["provider"] == "b"
+    assert time.monotonic() - started < 1
+    router.close()
@@ -29,14 +29,14 @@ def test_data_generation():
     return student_data
 
 
-def test_study_plan_generation(student_data):
+def test_study_plan_generation(student_data, output_dir):
     """Test 2: Generate study plan"""
     print("\n" + "="*60)
     print("TEST 2: Study Plan Generation")
     print("="*60)
     
     service = UpGradeAIService()
-    result = service.generate_study_plan(student_data, save_output=True)
+    result = service.generate_study_plan(student_data, save_output=True, output_dir=output_dir)
     
     if result.get("success"):
         print("✅ Study plan generated successfully!")
@@ -47,7 +47,7 @@ def test_study_plan_generation(student_data):
         return False
 
 
-def test_with_sample_data():
+def test_with_sample_data(output_dir):
     """Test 3: Use sample data file"""
     print("\n" + "="*60)
     print("TEST 3: Using Sample Data File")
@@ -59,7 +59,7 @@ def test_with_sample_data():
         student_data = service.load_student_data("data/sample_student.json")
         print(f"✅ Loaded: {student_data['student_profile']['name']}")
         
-        result = service.generate_study_plan(student_data)
+        result = service.generate_study_plan(student_data, output_dir=output_dir)
         
         if result.get("success"):
             print("✅ Study plan generated from sample data!")
@@ -92,10 +92,10 @@ def main():
     student_data = test_data_generation()
     
     # Test 2: Generate plan
-    test_study_plan_generation(student_data)
+    test_study_plan_generation(student_data, "output")
     
     # Test 3: Use sample data
-    test_with_sample_data()
+    test_with_sample_data("output")
     
     print("\n" + "="*60)
     print("✅ All tests completed!")
@@ -0,0 +1,117 @@
+"""
+Tests for indexed student data files (data/student_index.py)
+"""
+
+import sys
+import json
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent))
+
+import pytest
+
+from data import student_index
+from data.student_index import IndexedStudentFile, build_index, index_path
+
+
+def _student(student_id: str, name: str = "Student") -> dict:
+    return {"student_profile": {"student_id": student_id, "name": name}, "tasks": []}
+
+
+@pytest.fixture
+def cohort(tmp_path):
+    path = tmp_path / "students.jsonl"
+    lines = [json.dumps(_student(f"S-{i:03d}", f"Student {i}")) for i in range(50)]
+    # Blank lines are skipped by the index and by iteration
+    path.write_text("\n".join(lines[:10]) + "\n\n" + "\n".join(lines[10:]) + "\n", encoding="utf-8")
+    return path
+
+
+def test_lookup_by_student_id(cohort):
+    assert build_index(str(cohort)) == 50
+    with IndexedStudentFile(str(cohort)) as students:
+        assert len(students) == 50
+        assert students.get("S-007")["student_profile"]["name"] == "Student 7"
+        assert students["S-049"]["student_profile"]["student_id"] == "S-049"
+        assert "S-010" in students
+        assert "S-999" not in students
+        assert students.get("S-999") is None
+        with pytest.raises(KeyError):
+            students["S-999"]
+        assert [s["student_profile"]["student_id"] for s in students][:3] == ["S-000", "S-001", "S-002"]
+
+
+def test_colliding_hashes_still_return_the_right_student(cohort, monkeypatch):
+    # Every ID lands in the same probe chain, so each lookup must check the record's ID
+    monkeypatch.setattr(student_index, "_key_hash", lambda student_id: 42)
+    build_index(str(cohort))
+    with IndexedStudentFile(str(cohort)) as students:
+        for i in (0, 17, 49):
+            assert students[f"S-{i:03d}"]["student_profile"]["name"] == f"Student {i}"
+        assert students.get("S-999") is None
+
+
+def test_missing_index_is_rejected(cohort):
+    with pytest.raises(ValueError, match="no index"):
+        IndexedStudentFile(str(cohort))
+
+
+def test_stale_index_is_rejected(cohort):
+    build_index(str(cohort))
+    with open(cohort, "a", encoding="utf-8") as f:
+        f.write(json.dumps(_student("S-050")) + "\n")
+    with pytest.raises(ValueError, match="stale"):
+        IndexedStudentFile(str(cohort))
+
+    build_index(str(cohort))
+    with IndexedStudentFile(str(cohort)) as students:
+        assert "S-050" in students
+
+
+@pytest.mark.parametrize("content", [b"", b"NOTANIDX" + bytes(24)])
+def test_unreadable_index_is_rejected(cohort, content):
+    Path(index_path(str(cohort))).write_bytes(content)
+    with pytest.raises(ValueError, match="Unreadable"):
+        IndexedStudentFile(str(cohort))
+
+
+def test_empty_file(tmp_path):
+    path = tmp_path / "empty.jsonl"
+    path.write_bytes(b"")
+    assert build_index(str(path)) == 0
+    with IndexedStudentFile(str(path)) as students:
+        assert len(students) == 0
+        assert students.get("S-000") is None
+        assert list(students) == []
+
+
+def test_service_loads_one_student_from_an_indexed_file(cohort):
+    from ai_service import UpGradeAIService
+
+    build_index(str(cohort))
+    service = UpGradeAIService(provider="deepseek")
+    assert service.load_student_data(str(cohort), "S-023")["student_profile"]["name"] == "Student 23"
+    with pytest.raises(KeyError):
+        service.load_student_data(str(cohort), "S-999")
+
+
+def test_service_reopens_a_regenerated_file(cohort):
+    from ai_service import UpGradeAIService
+
+    build_index(str(cohort))
+    service = UpGradeAIService(provider="deepseek")
+    assert service.load_student_data(str(cohort), "S-001")["student_profile"]["name"] == "Student 1"
+    old_handle = service._indexed_files[str(cohort)]
+
+    # Regenerate the file under the same name, as a new cohort run would
+    replacement = cohort.with_suffix(".new")
+    replacement.write_text(json.dumps(_student("S-001", "Renamed")) + "\n", encoding="utf-8")
+    replacement.replace(cohort)
+    build_index(str(cohort))
+
+    assert not old_handle.is_current()
+    assert service.load_student_data(str(cohort), "S-001")["student_profile"]["name"] == "Renamed"
+    assert old_handle._data_file.closed
+    with pytest.raises(KeyError):
+        service.load_student_data(str(cohort), "S-002")
@@ -0,0 +1,134 @@
+"""
+Tests for precomputed quick-suggestion answers (suggestion_cache.py)
+"""
+
+import sys
+import asyncio
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent))
+
+from planner_llm.deadline import deadline_scope, remaining
+from suggestion_cache import SuggestionPrecomputer, suggestion_cache_lookups
+
+PROMPTS = ["What should I study now?", "Help me prioritize my tasks"]
+CONTEXT = {"tasks": [{"title": "Lab report", "deadline": "2026-03-03", "current_progress_percentage": 0}]}
+
+
+class FakeGenerator:
+    """Chat answers for the precomputer, with scripted failures"""
+
+    def __init__(self, fail=(), skip=()):
+        self.fail = set(fail)
+        self.skip = set(skip)
+        self.calls = []
+        self.deadlines = []
+
+    async def __call__(self, prompt, context):
+        self.calls.append(prompt)
+        self.deadlines.append(remaining())
+        if prompt in self.fail:
+            raise RuntimeError("provider down")
+        if prompt in self.skip:
+            return None
+        return {"success": True, "message": f"Answer to {prompt}"}
+
+
+def _precomputer(generate) -> SuggestionPrecomputer:
+    return SuggestionPrecomputer(generate, lambda context: list(PROMPTS), ttl_seconds=3600)
+
+
+async def _schedule_and_wait(precomputer, context) -> bool:
+    scheduled = precomputer.schedule(context)
+    await asyncio.gather(*list(precomputer._tasks))
+    return scheduled
+
+
+def test_precomputed_answer_is_served_and_counted():
+    precomputer = _precomputer(FakeGenerator())
+    hits, misses = suggestion_cache_lookups.value(result="hit"), suggestion_cache_lookups.value(result="miss")
+
+    assert asyncio.run(_schedule_and_wait(precomputer, CONTEXT))
+    answer = precomputer.get("  what should I STUDY now? ", CONTEXT)
+    assert answer == {"success": True, "message": "Answer to What should I study now?"}
+    assert precomputer.get("Something else entirely", CONTEXT) is None
+
+    assert suggestion_cache_lookups.value(result="hit") == hits + 1
+    assert suggestion_cache_lookups.value(result="miss") == misses + 1
+    assert precomputer.stats() == {"answers": 2, "contexts": 1, "in_progress": 0}
+
+
+def test_completed_context_is_not_recomputed():
+    generate = FakeGenerator()
+    precomputer = _precomputer(generate)
+    assert asyncio.run(_schedule_and_wait(precomputer, CONTEXT))
+    assert not asyncio.run(_schedule_and_wait(precomputer, CONTEXT))
+    assert len(generate.calls) == 2
+
+
+def test_changed_context_invalidates_the_answers():
+    generate = FakeGenerator()
+    precomputer = _precomputer(generate)
+    asyncio.run(_schedule_and_wait(precomputer, CONTEXT))
+
+    changed = {"tasks": [{**CONTEXT["tasks"][0], "current_progress_percentage": 60}]}
+    assert precomputer.get(PROMPTS[0], changed) is None
+    assert asyncio.run(_schedule_and_wait(precomputer, changed))
+    assert precomputer.get(PROMPTS[0], changed) is not None
+    assert len(generate.calls) == 4
+
+
+def test_failed_precompute_is_retried_on_the_next_schedule():
+    generate = FakeGenerator(fail={PROMPTS[1]})
+    precomputer = _precomputer(generate)
+    assert asyncio.run(_schedule_and_wait(precomputer, CONTEXT))
+    # The prompt that worked is served; the context is not marked done
+    assert precomputer.get(PROMPTS[0], CONTEXT) is not None
+    assert precomputer.get(PROMPTS[1], CONTEXT) is None
+    assert precomputer.stats()["contexts"] == 0
+
+    generate.fail.clear()
+    assert asyncio.run(_schedule_and_wait(precomputer, CONTEXT))
+    assert precomputer.get(PROMPTS[1], CONTEXT) is not None
+    assert not asyncio.run(_schedule_and_wait(precomputer, CONTEXT))
+
+
+def test_unsuccessful_result_is_not_cached_and_retried():
+    class Unsuccessful(FakeGenerator):
+        async def __call__(self, prompt, context):
+            await super().__call__(prompt, context)
+            return {"success": False, "error": "rate limited"}
+
+    precomputer = _precomputer(Unsuccessful())
+    asyncio.run(_schedule_and_wait(precomputer, CONTEXT))
+    assert precomputer.get(PROMPTS[0], CONTEXT) is None
+    assert asyncio.run(_schedule_and_wait(precomputer, CONTEXT))
+
+
+def test_skipped_prompts_still_complete_the_context():
+    precomputer = _precomputer(FakeGenerator(skip=set(PROMPTS)))
+    assert asyncio.run(_schedule_and_wait(precomputer, CONTEXT))
+    assert precomputer.get(PROMPTS[0], CONTEXT) is None
+    assert not asyncio.run(_schedule_and_wait(precomputer, CONTEXT))
+
+
+def test_background_run_does_not_inherit_the_request_deadline():
+    generate = FakeGenerator()
+    precomputer = _precomputer(generate)
+
+    async def request():
+        with deadline_scope(5):
+            return await _schedule_and_wait(precomputer, CONTEXT)
+
+    assert asyncio.run(request())
+    assert generate.deadlines == [None, None]
+
+
+def test_disabled_precompute_does_nothing(monkeypatch):
+    monkeypatch.setenv("CHAT_PRECOMPUTE", "off")
+    generate = FakeGenerator()
+    precomputer = _precomputer(generate)
+    assert not asyncio.run(_schedule_and_wait(precomputer, CONTEXT))
+    assert precomputer.get(PROMPTS[0], CONTEXT) is None
+    assert generate.calls == []
@@ -0,0 +1,93 @@
+"""
+Tests for the shared LLM connection pools (planner_llm/transport.py)
+"""
+
+import sys
+import asyncio
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent))
+
+import pytest
+
+from planner_llm import transport as transport_module
+from planner_llm.transport import LLMTransport, get_transport
+
+
+def test_clients_of_one_endpoint_share_a_pool():
+    first = get_transport("https://pool-test.example/v1/")
+    assert get_transport("https://pool-test.example/v1") is first
+    assert get_transport("https://pool-test.example/v1", max_connections=5) is not first
+    assert get_transport("https://other-pool-test.example/v1") is not first
+
+
+def test_pool_limits_are_applied():
+    transport = LLMTransport("http://127.0.0.1:9/v1", max_connections=7, max_keepalive_connections=3, keepalive_expiry=5)
+    assert (transport.limits.max_connections, transport.limits.max_keepalive_connections) == (7, 3)
+    assert transport.limits.keepalive_expiry == 5
+
+
+@pytest.mark.parametrize("setting, url, h2_installed, expected", [
+    ("auto", "https://api.example/v1", True, True),
+    ("auto", "http://localhost/v1", True, False),
+    ("auto", "https://api.example/v1", False, False),
+    ("off", "https://api.example/v1", True, False),
+    ("on", "http://localhost/v1", True, True),
+    ("on", "https://api.example/v1", False, False),
+])
+def test_http2_negotiation(monkeypatch, setting, url, h2_installed, expected):
+    monkeypatch.setenv("LLM_HTTP2", setting)
+    monkeypatch.setattr(transport_module, "HTTP2_AVAILABLE", h2_installed)
+    assert LLMTransport(url).http2 is expected
+
+
+def test_sync_client_is_reused_until_closed():
+    transport = LLMTransport("http://127.0.0.1:9/v1")
+    client = transport.client
+    assert transport.client is client
+    transport.close()
+    assert client.is_closed
+    assert transport.client is not client
+    transport.close()
+
+
+def test_async_clients_are_per_event_loop():
+    transport = LLMTransport("http://127.0.0.1:9/v1")
+
+    async def same_loop_twice():
+        return transport.async_client, transport.async_client
+
+    first, again = asyncio.run(same_loop_twice())
+    assert first is again
+
+    async def client_on_new_loop():
+        return transport.async_client
+
+    second = asyncio.run(client_on_new_loop())
+    assert second is not first
+    # The first loop is closed, so its client was dropped from the pool map
+    assert list(transport._async_clients.values()) == [second]
+
+
+def test_requests_reuse_pooled_connections():
+    pytest.importorskip("uvicorn")
+    from mock_provider import MockProviderConfig, MockProviderServer
+    from planner_llm.llm_client import OpenAICompatibleClient
+
+    with MockProviderServer(MockProviderConfig(latency="fixed:0", tokens_per_second=0)) as server:
+        client = OpenAICompatibleClient(api_key="test", api_base_url=server.base_url, use_cache=False, coalesce=False)
+        other = OpenAICompatibleClient(api_key="test", api_base_url=server.base_url, use_cache=False, coalesce=False)
+        assert other.transport is client.transport
+
+        async def calls():
+            results = [await client.achat_completion([{"role": "user", "content": f"hi {i}"}]) for i in range(3)]
+            results.append(await other.achat_completion([{"role": "user", "content": "hi again"}]))
+            connections = len(client.transport.async_client._transport._pool.connections)
+            await client.aclose()
+            return results, connections
+
+        results, connections = asyncio.run(calls())
+
+    assert all(result["choices"] for result in results)
+    assert connections == 1
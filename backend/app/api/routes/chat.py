@@ -9,6 +9,8 @@ from typing import List, Optional, Dict, Any
 import sys
 import os
 
+from app.utils.sse import sse_response
+
 # Add AI service to path
 current_dir = os.path.dirname(os.path.abspath(__file__))
 backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(current_dir))))
@@ -27,6 +29,13 @@ except Exception as e:
 router = APIRouter(prefix="/chat", tags=["chat"])
 
 
+async def close_chat_service() -> None:
+    """Release pooled LLM connections on shutdown"""
+    if chat_service:
+        await chat_service.suggestion_answers.aclose()
+        await chat_service.client.aclose()
+
+
 class ChatMessage(BaseModel):
     """Chat message model"""
     role: str  # 'user' or 'assistant'
@@ -34,21 +43,52 @@ class ChatMessage(BaseModel):
 
 
 class ChatRequest(BaseModel):
-    """Chat request payload"""
+    """
+    Chat request payload
+    
+    Send the `conversation_id` returned by the previous response and the
+    server supplies the history. `conversation_history` is still accepted
+    from older clients that do not send an ID.
+    """
     message: str
+    conversation_id: Optional[str] = None
     conversation_history: Optional[List[ChatMessage]] = None
     student_context: Optional[Dict[str, Any]] = None
 
 
+class StudentContextUpdate(BaseModel):
+    """The student's current context, sent whenever their tasks change"""
+    student_context: Dict[str, Any]
+
+
 class ChatResponse(BaseModel):
     """Chat response model"""
     success: bool
     message: str
     model: Optional[str] = None
+    conversation_id: Optional[str] = None
     suggestions: Optional[List[str]] = None
     error: Optional[str] = None
 
 
+def _conversation_args(request: ChatRequest) -> Dict[str, Any]:
+    """History source for a request: a server-side conversation or the legacy transcript"""
+    if request.conversation_history is not None and not request.conversation_id:
+        return {
+            "conversation_id": None,
+            "conversation_history": [
+                {"role": msg.role, "content": msg.content}
+                for msg in request.conversation_history
+            ]
+        }
+    
+    # New conversations get an ID the client echoes back on the next message
+    return {
+        "conversation_id": request.conversation_id or chat_service.conversations.new_id(),
+        "conversation_history": None
+    }
+
+
 @router.post("/message", response_model=ChatResponse)
 async def send_message(request: ChatRequest):
     """
@@ -63,28 +103,24 @@ async def send_message(request: ChatRequest):
         )
     
     try:
-        # Convert conversation history to dict format
-        history = None
-        if request.conversation_history:
-            history = [
-                {"role": msg.role, "content": msg.content}
-                for msg in request.conversation_history
-            ]
+        conversation = _conversation_args(request)
         
-        # Get AI response
-        result = chat_service.chat(
+        # Get AI response (awaited so the worker keeps serving other requests)
+        result = await chat_service.achat(
             user_message=request.message,
-            conversation_history=history,
-            student_context=request.student_context
+            student_context=request.student_context,
+            **conversation
         )
         
-        # Get suggestions
+        # Get suggestions, and start answering them before the student taps one
         suggestions = chat_service.get_quick_suggestions(request.student_context)
+        chat_service.suggestion_answers.schedule(request.student_context)
         
         return ChatResponse(
             success=result.get("success", False),
             message=result.get("message", ""),
             model=result.get("model"),
+            conversation_id=conversation["conversation_id"],
             suggestions=suggestions,
             error=result.get("error")
         )
@@ -96,6 +132,67 @@ async def send_message(request: ChatRequest):
         )
 
 
+@router.post("/stream")
+async def stream_message(request: ChatRequest):
+    """
+    Send a message and stream the AI response as server-sent events
+    
+    Each event carries a `delta` with the next tokens; the stream ends
+    with an `event: done` frame (or `event: error` if the provider fails).
+    The conversation ID is returned in the `X-Conversation-Id` header.
+    """
+    if not chat_service:
+        raise HTTPException(
+            status_code=503,
+            detail="Chat service is not available"
+        )
+    
+    conversation = _conversation_args(request)
+    headers = {}
+    if conversation["conversation_id"]:
+        headers["X-Conversation-Id"] = conversation["conversation_id"]
+    
+    return sse_response(chat_service.astream_chat(
+        user_message=request.message,
+        student_context=request.student_context,
+        **conversation
+    ), headers=headers)
+
+
+@router.delete("/conversations/{conversation_id}")
+async def delete_conversation(conversation_id: str):
+    """Forget a server-side conversation"""
+    if not chat_service:
+        raise HTTPException(
+            status_code=503,
+            detail="Chat service is not available"
+        )
+    
+    chat_service.conversations.delete(conversation_id)
+    return {"deleted": conversation_id}
+
+
+@router.post("/context")
+async def update_context(update: StudentContextUpdate):
+    """
+    Register a changed student context
+    
+    Returns the suggestion prompts for the new context and precomputes
+    their answers in the background, so tapping a suggestion is instant.
+    """
+    if not chat_service:
+        raise HTTPException(
+            status_code=503,
+            detail="Chat service is not available"
+        )
+    
+    scheduled = chat_service.suggestion_answers.schedule(update.student_context)
+    return {
+        "suggestions": chat_service.get_quick_suggestions(update.student_context),
+        "precomputing": scheduled
+    }
+
+
 @router.get("/suggestions")
 async def get_suggestions(
     has_urgent_tasks: bool = False,
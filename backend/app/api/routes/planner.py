@@ -0,0 +1,93 @@
+"""
+Planner API Routes
+Generates personalized study plans from student data
+"""
+
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel
+from typing import Dict, Any
+import sys
+import os
+
+from app.utils.sse import sse_event_response, sse_response
+
+# Add AI service to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(current_dir))))
+ai_path = os.path.join(backend_dir, 'ai')
+sys.path.insert(0, ai_path)
+
+try:
+    from ai_service import UpGradeAIService
+    planner_service = UpGradeAIService()
+    print("✅ Planner service initialized successfully")
+except Exception as e:
+    print(f"⚠️  Warning: Could not initialize planner service: {e}")
+    print(f"   AI path attempted: {ai_path}")
+    planner_service = None
+
+router = APIRouter(prefix="/planner", tags=["planner"])
+
+
+async def close_planner_service() -> None:
+    """Release pooled LLM connections on shutdown"""
+    if planner_service:
+        await planner_service.llm_client.aclose()
+
+
+class StudyPlanRequest(BaseModel):
+    """Study plan request payload"""
+    student_data: Dict[str, Any]
+
+
+@router.post("/stream")
+async def stream_study_plan(request: StudyPlanRequest):
+    """
+    Generate a study plan and stream the Markdown as server-sent events
+
+    The first section reaches the client as soon as the model emits it
+    instead of after the whole (up to 4000-token) plan is finished.
+    """
+    if not planner_service:
+        raise HTTPException(
+            status_code=503,
+            detail="Planner service is not available"
+        )
+
+    try:
+        deltas = planner_service.astream_study_plan(request.student_data)
+    except KeyError as e:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Missing student data field: {str(e)}"
+        )
+
+    return sse_response(deltas)
+
+
+@router.post("/days/stream")
+async def stream_study_plan_days(request: StudyPlanRequest):
+    """
+    Generate a structured study plan and stream it day by day
+
+    Emits an `event: day` frame ({"day": {date, day, focus, slots: [{start,
+    end, task_ids, activity, notes}]}}) as soon as each day is complete, so
+    the daily planner can show today before the rest of the week is
+    written, then an `event: plan` frame with the validated plan and its
+    Markdown rendering.
+    """
+    if not planner_service:
+        raise HTTPException(
+            status_code=503,
+            detail="Planner service is not available"
+        )
+
+    try:
+        events = planner_service.astream_study_plan_days(request.student_data)
+    except KeyError as e:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Missing student data field: {str(e)}"
+        )
+
+    return sse_event_response(events)
@@ -1,6 +1,14 @@
-from fastapi import FastAPI
+import os
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.routes import chat
+from app.api.routes import chat, planner
+
+# Importable once the routes have put the ai/ directory on sys.path
+from planner_llm.deadline import deadline_scope
+from planner_llm.metrics import PROMETHEUS_CONTENT_TYPE, render_metrics
+
+# End-to-end budget for a request; clients may lower it with X-Request-Timeout
+REQUEST_TIMEOUT_SECONDS = float(os.getenv("REQUEST_TIMEOUT_SECONDS", "30"))
 
 app = FastAPI(
     title="UpGrade API",
@@ -15,10 +23,32 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Browsers only let scripts read response headers listed here
+    expose_headers=["X-Conversation-Id"],
 )
 
+@app.middleware("http")
+async def request_deadline(request: Request, call_next):
+    """Propagate the request's time budget down to LLM calls"""
+    budget = REQUEST_TIMEOUT_SECONDS
+    header = request.headers.get("x-request-timeout")
+    if header:
+        try:
+            budget = min(budget, max(0.0, float(header)))
+        except ValueError:
+            pass
+
+    with deadline_scope(budget):
+        return await call_next(request)
+
 # Include routers
 app.include_router(chat.router, prefix="/api")
+app.include_router(planner.router, prefix="/api")
+
+@app.on_event("shutdown")
+async def shutdown():
+    await chat.close_chat_service()
+    await planner.close_planner_service()
 
 @app.get("/")
 def root():
@@ -32,6 +62,11 @@ def root():
 def health_check():
     return {"status": "ok"}
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """LLM latency, token, cache and error metrics in Prometheus text format"""
+    return Response(render_metrics(), media_type=PROMETHEUS_CONTENT_TYPE)
+
 @app.get("/api/health")
 def api_health():
     return {
@@ -0,0 +1,63 @@
+"""
+Server-Sent Events helpers
+Turn async text-delta generators into text/event-stream responses
+"""
+
+import json
+from typing import Any, AsyncIterator, Dict, Optional
+
+from fastapi.responses import StreamingResponse
+
+
+async def sse_events(deltas: AsyncIterator[str]) -> AsyncIterator[str]:
+    """
+    Encode text deltas as SSE frames
+
+    Emits one `data: {"delta": ...}` frame per delta, then `event: done`.
+    Failures after the response has started are reported as `event: error`
+    because the HTTP status can no longer change.
+    """
+    try:
+        async for delta in deltas:
+            yield f"data: {json.dumps({'delta': delta}, ensure_ascii=False)}\n\n"
+        yield "event: done\ndata: {}\n\n"
+    except Exception as e:
+        yield f"event: error\ndata: {json.dumps({'error': str(e)})}\n\n"
+
+
+async def sse_typed_events(events: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[str]:
+    """
+    Encode {"type": ..., ...} events as named SSE frames
+
+    Each event becomes `event: <type>` with the rest of the dict as JSON
+    data, followed by `event: done`; failures are reported like sse_events.
+    """
+    try:
+        async for event in events:
+            payload = {key: value for key, value in event.items() if key != "type"}
+            yield f"event: {event['type']}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+        yield "event: done\ndata: {}\n\n"
+    except Exception as e:
+        yield f"event: error\ndata: {json.dumps({'error': str(e)})}\n\n"
+
+
+def _event_stream(frames: AsyncIterator[str], headers: Optional[Dict[str, str]]) -> StreamingResponse:
+    return StreamingResponse(
+        frames,
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # Disable proxy buffering (nginx)
+            **(headers or {})
+        }
+    )
+
+
+def sse_response(deltas: AsyncIterator[str], headers: Optional[Dict[str, str]] = None) -> StreamingResponse:
+    """Wrap a delta generator in an unbuffered event-stream response"""
+    return _event_stream(sse_events(deltas), headers)
+
+
+def sse_event_response(events: AsyncIterator[Dict[str, Any]], headers: Optional[Dict[str, str]] = None) -> StreamingResponse:
+    """Wrap a typed event generator in an unbuffered event-stream response"""
+    return _event_stream(sse_typed_events(events), headers)
@@ -0,0 +1,101 @@
+"""
+Chat Load Benchmark
+Fires concurrent POST /api/chat/message requests at a running backend and
+checks that throughput scales with concurrency instead of being serialized.
+
+Usage (backend running on port 8001):
+    python benchmarks/chat_load.py --requests 40 --concurrency 1 4 16
+
+For reproducible numbers, back the service with the local mock provider:
+    python ../ai/mock_provider.py --port 9000 --latency lognormal:0.8:0.5
+    GROQ_API_KEY=mock GROQ_API_BASE=http://127.0.0.1:9000/v1 uvicorn app.main:app --port 8001
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Dict, List
+
+import httpx
+
+
+async def _timed_post(client: httpx.AsyncClient, url: str, payload: Dict) -> float:
+    start = time.perf_counter()
+    response = await client.post(url, json=payload)
+    response.raise_for_status()
+    return time.perf_counter() - start
+
+
+async def _probe_health(client: httpx.AsyncClient, url: str, stop: asyncio.Event) -> List[float]:
+    """Measure /health latency while chat requests are in flight"""
+    latencies = []
+    while not stop.is_set():
+        start = time.perf_counter()
+        await client.get(url)
+        latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(0.05)
+    return latencies
+
+
+async def run_level(base_url: str, total: int, concurrency: int, timeout: float) -> Dict[str, float]:
+    """Run `total` chat requests with at most `concurrency` in flight"""
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency + 1)
+
+    async with httpx.AsyncClient(timeout=timeout, limits=limits) as client:
+        async def one(i: int) -> float:
+            async with semaphore:
+                return await _timed_post(
+                    client,
+                    f"{base_url}/api/chat/message",
+                    {"message": f"Benchmark question {i}: what should I study now?"}
+                )
+
+        stop = asyncio.Event()
+        probe = asyncio.create_task(_probe_health(client, f"{base_url}/health", stop))
+
+        start = time.perf_counter()
+        latencies = await asyncio.gather(*(one(i) for i in range(total)))
+        elapsed = time.perf_counter() - start
+
+        stop.set()
+        health = await probe
+
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "elapsed_s": elapsed,
+        "throughput_rps": total / elapsed,
+        "p50_s": statistics.median(latencies),
+        "p95_s": latencies[int(0.95 * (len(latencies) - 1))],
+        "health_max_s": max(health) if health else 0.0,
+    }
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    print(f"🚀 Chat load benchmark against {args.url} ({args.requests} requests per level)\n")
+    print(f"{'conc':>5} {'elapsed':>9} {'req/s':>8} {'p50':>8} {'p95':>8} {'health max':>11}")
+
+    baseline = None
+    for level in args.concurrency:
+        result = await run_level(args.url, args.requests, level, args.timeout)
+        baseline = baseline or result["throughput_rps"]
+        print(
+            f"{result['concurrency']:>5} {result['elapsed_s']:>8.2f}s {result['throughput_rps']:>8.2f} "
+            f"{result['p50_s']:>7.3f}s {result['p95_s']:>7.3f}s {result['health_max_s']:>10.3f}s"
+            f"   (x{result['throughput_rps'] / baseline:.1f})"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent chat load benchmark")
+    parser.add_argument("--url", default="http://127.0.0.1:8001", help="Backend base URL")
+    parser.add_argument("--requests", type=int, default=40, help="Requests per concurrency level")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16], help="Concurrency levels")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Per-request timeout in seconds")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
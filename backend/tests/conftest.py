@@ -0,0 +1,45 @@
+"""
+Shared fixtures for the backend tests
+"""
+
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+# Make the app package importable when run from the repository root
+sys.path.append(str(Path(__file__).parent.parent))
+
+import pytest
+
+from app.api.routes import chat, planner
+
+
+@pytest.fixture(autouse=True)
+def offline_llm(monkeypatch):
+    """Serve mock completions even when provider keys are set in the environment"""
+    services = [
+        (chat.chat_service, "client"),
+        (planner.planner_service, "llm_client"),
+    ]
+    for service, attribute in services:
+        if service is None:
+            continue
+        client = getattr(service, attribute)
+        for provider in getattr(client, "providers", [client]):
+            monkeypatch.setattr(provider, "api_key", None)
+
+
+@pytest.fixture
+def read_events():
+    """Split a text/event-stream body into (event, data) pairs"""
+    def read(body: str) -> List[Tuple[str, Dict[str, Any]]]:
+        events = []
+        for frame in body.split("\n\n"):
+            if not frame.strip():
+                continue
+            fields = dict(line.split(": ", 1) for line in frame.splitlines())
+            events.append((fields.get("event", "message"), json.loads(fields["data"])))
+        return events
+
+    return read
@@ -0,0 +1,90 @@
+"""
+Tests for the chat API
+"""
+
+import sys
+import time
+import asyncio
+from pathlib import Path
+
+# Make the app package importable when run from the repository root
+sys.path.append(str(Path(__file__).parent.parent))
+
+import httpx
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.api.routes import chat
+
+client = TestClient(app)
+
+
+def test_browsers_can_read_the_conversation_id_header():
+    response = client.get("/api/health", headers={"Origin": "http://localhost:5173"})
+    assert response.status_code == 200
+    exposed = [header.strip().lower() for header in response.headers["access-control-expose-headers"].split(",")]
+    assert "x-conversation-id" in exposed
+
+
+def test_message_returns_a_reply_and_a_conversation_id():
+    response = client.post("/api/chat/message", json={"message": "Hello there"})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["success"] and body["message"]
+    assert body["conversation_id"]
+    assert body["suggestions"]
+
+    follow_up = client.post(
+        "/api/chat/message", json={"message": "And after that?", "conversation_id": body["conversation_id"]}
+    )
+    assert follow_up.json()["conversation_id"] == body["conversation_id"]
+
+
+def test_concurrent_messages_do_not_block_each_other(monkeypatch):
+    async def slow_reply(**kwargs):
+        await asyncio.sleep(0.3)
+        return {"success": True, "message": "Done"}
+
+    monkeypatch.setattr(chat.chat_service, "achat", slow_reply)
+
+    async def send_many():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as http:
+            return await asyncio.gather(*[
+                http.post("/api/chat/message", json={"message": f"Question {i}"}) for i in range(5)
+            ])
+
+    started = time.monotonic()
+    responses = asyncio.run(send_many())
+    # Five 0.3s replies served together, not one after another
+    assert time.monotonic() - started < 1
+    assert [response.status_code for response in responses] == [200] * 5
+    assert len({response.json()["conversation_id"] for response in responses}) == 5
+
+
+def test_stream_sends_deltas_then_done(read_events):
+    response = client.post("/api/chat/stream", json={"message": "What should I study now?"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.headers["cache-control"] == "no-cache"
+    assert response.headers["x-conversation-id"]
+
+    events = read_events(response.text)
+    assert events[-1] == ("done", {})
+    deltas = [data["delta"] for name, data in events[:-1] if name == "message"]
+    assert len(deltas) == len(events) - 1
+    assert "".join(deltas).strip()
+
+
+def test_stream_reports_provider_failures_as_an_error_event(monkeypatch, read_events):
+    async def failing_stream(**kwargs):
+        yield "Partial"
+        raise RuntimeError("provider went away")
+
+    monkeypatch.setattr(chat.chat_service, "astream_chat", failing_stream)
+    response = client.post("/api/chat/stream", json={"message": "Hi"})
+    assert response.status_code == 200
+    assert read_events(response.text) == [
+        ("message", {"delta": "Partial"}),
+        ("error", {"error": "provider went away"}),
+    ]
@@ -0,0 +1,98 @@
+"""
+Tests for the app-wide endpoints and middleware
+"""
+
+import sys
+import asyncio
+from pathlib import Path
+
+# Make the app package importable when run from the repository root
+sys.path.append(str(Path(__file__).parent.parent))
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main
+from app.main import app
+from app.api.routes import chat
+from planner_llm.deadline import remaining
+
+client = TestClient(app)
+
+CONTEXT = {"tasks": [{"title": "Lab report", "deadline": "2026-03-03", "current_progress_percentage": 0}]}
+
+
+def _samples(name: str) -> float:
+    """Sum of every sample of one metric in a fresh /metrics scrape"""
+    response = client.get("/metrics")
+    total = 0.0
+    for line in response.text.splitlines():
+        if line.startswith(name + "{") or line.startswith(name + " "):
+            total += float(line.rsplit(" ", 1)[1])
+    return total
+
+
+def test_metrics_use_the_prometheus_text_format():
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "text/plain; version=0.0.4; charset=utf-8"
+    for name in ("llm_requests_total", "llm_time_to_first_token_seconds", "chat_suggestion_cache_lookups_total"):
+        assert f"# HELP {name} " in response.text
+    assert "# TYPE llm_requests_total counter" in response.text
+    assert "# TYPE llm_request_duration_seconds histogram" in response.text
+
+
+def test_chat_messages_count_suggestion_cache_lookups():
+    before = _samples("chat_suggestion_cache_lookups_total")
+    response = client.post("/api/chat/message", json={"message": "Something unusual", "student_context": CONTEXT})
+    assert response.status_code == 200
+    assert _samples("chat_suggestion_cache_lookups_total") == before + 1
+
+
+def test_provider_calls_are_counted():
+    pytest.importorskip("uvicorn")
+    from mock_provider import MockProviderConfig, MockProviderServer
+    from planner_llm.llm_client import OpenAICompatibleClient
+
+    before = _samples("llm_requests_total")
+    with MockProviderServer(MockProviderConfig(latency="fixed:0", tokens_per_second=0)) as server:
+        llm = OpenAICompatibleClient(api_key="test", api_base_url=server.base_url, use_cache=False, coalesce=False)
+
+        async def call():
+            result = await llm.achat_completion([{"role": "user", "content": "hi"}])
+            await llm.aclose()
+            return result
+
+        asyncio.run(call())
+
+    assert _samples("llm_requests_total") == before + 1
+    assert 'outcome="ok"' in client.get("/metrics").text
+
+
+@pytest.fixture
+def seen_budget(monkeypatch):
+    """Record the deadline budget a chat request reaches the service with"""
+    budgets = []
+
+    async def reply(**kwargs):
+        budgets.append(remaining())
+        return {"success": True, "message": "Done"}
+
+    monkeypatch.setattr(main, "REQUEST_TIMEOUT_SECONDS", 30.0)
+    monkeypatch.setattr(chat.chat_service, "achat", reply)
+    return budgets
+
+
+@pytest.mark.parametrize("header, budget", [
+    (None, 30),
+    ("2.5", 2.5),
+    ("1000", 30),  # Callers can only shorten the server's budget
+    ("soon", 30),
+    ("-5", 0),
+])
+def test_request_timeout_header_is_clamped(seen_budget, header, budget):
+    headers = {"X-Request-Timeout": header} if header is not None else {}
+    response = client.post("/api/chat/message", json={"message": "Hello"}, headers=headers)
+    assert response.status_code == 200
+    assert len(seen_budget) == 1
+    assert budget - 1 < seen_budget[0] <= budget
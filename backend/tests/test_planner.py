@@ -0,0 +1,63 @@
+"""
+Tests for the planner API
+"""
+
+import sys
+import json
+from pathlib import Path
+
+# Make the app package importable when run from the repository root
+sys.path.append(str(Path(__file__).parent.parent))
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+client = TestClient(app)
+
+SAMPLE_STUDENT = Path(__file__).resolve().parents[2] / "ai" / "data" / "sample_student.json"
+
+
+@pytest.fixture
+def student_data():
+    return json.loads(SAMPLE_STUDENT.read_text(encoding="utf-8"))
+
+
+def test_plan_stream_sends_markdown_deltas_then_done(student_data, read_events):
+    response = client.post("/api/planner/stream", json={"student_data": student_data})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+
+    events = read_events(response.text)
+    assert events[-1] == ("done", {})
+    assert {name for name, _ in events[:-1]} == {"message"}
+    assert "".join(data["delta"] for _, data in events[:-1]).strip()
+
+
+def test_plan_stream_rejects_a_request_without_student_data():
+    response = client.post("/api/planner/stream", json={})
+    assert response.status_code == 422
+
+
+def test_day_stream_sends_each_day_then_the_plan(student_data, read_events):
+    response = client.post("/api/planner/days/stream", json={"student_data": student_data})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+
+    events = read_events(response.text)
+    names = [name for name, _ in events]
+    days = [data["day"] for name, data in events if name == "day"]
+    assert days
+    assert names == ["day"] * len(days) + ["plan", "done"]
+
+    for day in days:
+        assert {"date", "slots"} <= set(day)
+        for slot in day["slots"]:
+            assert {"start", "end", "task_ids", "activity"} <= set(slot)
+
+    plan = events[-2][1]
+    assert set(plan) >= {"plan", "study_plan"}
+    # Days already streamed are the same days the final plan holds
+    assert [day["date"] for day in plan["plan"]["days"]] == [day["date"] for day in days]
+    assert plan["study_plan"].strip()
@@ -20,6 +20,7 @@ class _AIChatbotScreenState extends State<AIChatbotScreen> with TickerProviderSt
   final ScrollController _scrollController = ScrollController();
   final List<ChatMessage> _messages = [];
   bool _isTyping = false;
+  String? _conversationId;  // Server-side history handle returned by the backend
   late AnimationController _typingAnimationController;
   
   // Mock data - in real app, this would come from a service
@@ -113,14 +114,6 @@ class _AIChatbotScreenState extends State<AIChatbotScreen> with TickerProviderSt
     
     // Get AI response from backend (Llama 3.3)
     try {
-      // Prepare conversation history
-      final history = _messages.take(_messages.length - 1).map((msg) {
-        return {
-          'role': msg.isAI ? 'assistant' : 'user',
-          'content': msg.text,
-        };
-      }).toList();
-      
       // Prepare student context
       final studentContext = {
         'name': 'Student',  // In real app, get from user profile
@@ -136,7 +129,7 @@ class _AIChatbotScreenState extends State<AIChatbotScreen> with TickerProviderSt
       final apiService = ApiService();
       final response = await apiService.sendChatMessage(
         message: text,
-        conversationHistory: history,
+        conversationId: _conversationId,
         studentContext: studentContext,
       );
       
@@ -144,6 +137,10 @@ class _AIChatbotScreenState extends State<AIChatbotScreen> with TickerProviderSt
         setState(() {
           _isTyping = false;
           
+          if (response != null && response['conversation_id'] != null) {
+            _conversationId = response['conversation_id'];
+          }
+          
           if (response != null && response['success'] == true) {
             // Add AI response
             _messages.add(ChatMessage(
@@ -56,8 +56,12 @@ class ApiService {
   }
 
   /// Send a message to the AI chatbot
+  ///
+  /// Pass the `conversation_id` from the previous response so the backend
+  /// supplies the history; `conversationHistory` is only for old backends.
   Future<Map<String, dynamic>?> sendChatMessage({
     required String message,
+    String? conversationId,
     List<Map<String, String>>? conversationHistory,
     Map<String, dynamic>? studentContext,
   }) async {
@@ -67,7 +71,8 @@ class ApiService {
         headers: {'Content-Type': 'application/json'},
         body: json.encode({
           'message': message,
-          'conversation_history': conversationHistory,
+          if (conversationId != null) 'conversation_id': conversationId,
+          if (conversationHistory != null) 'conversation_history': conversationHistory,
           'student_context': studentContext,
         }),
       ).timeout(const Duration(seconds: 30));